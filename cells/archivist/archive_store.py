@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Archive Store - Hyper-Swarm Phase-1
+Durable, indexed storage for the archivist cell backed by SQLite in WAL mode.
+"""
+
+import base64
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Content lives in refcounted, content-addressed blobs; entries point at them
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    blob_key TEXT PRIMARY KEY,
+    refcount INTEGER NOT NULL,
+    encoding TEXT NOT NULL,
+    logical_size INTEGER NOT NULL,
+    physical_size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id TEXT PRIMARY KEY,
+    blob_key TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    archived_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    checksum TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_archived_at ON entries (archived_at, id);
+CREATE TABLE IF NOT EXISTS stats (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO stats (key, value) VALUES
+    ('total_items', 0), ('total_size', 0), ('physical_size', 0), ('unique_blobs', 0),
+    ('last_data_id', 0);
+"""
+
+# Payloads smaller than this are never worth compressing
+COMPRESS_MIN_BYTES = 256
+
+# Full-text index over entry content; rows share the rowid of their entry.
+# Contentless: only the index is kept, the text is not stored a second time
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE entries_fts USING fts5(
+    body,
+    content = '',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def content_digest(content: Any) -> str:
+    """Stable SHA-256 checksum of content, independent of key order"""
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def searchable_text(content: Any) -> str:
+    """Flatten the keys and scalar values of a JSON document into text"""
+    parts = []
+    stack = [content]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                parts.append(str(key))
+                stack.append(value)
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+        elif node is not None:
+            parts.append(str(node))
+    return " ".join(parts)
+
+
+def build_match_query(query: str) -> str:
+    """
+    Translate a user query into an FTS5 MATCH expression.
+
+    Bare words are terms, "quoted words" are phrases and a trailing * makes
+    a prefix query; all parts must match. FTS5 operators typed by the user
+    are treated as plain words.
+    """
+    parts = []
+    for phrase, word in _QUERY_TOKEN.findall(query):
+        if phrase.strip():
+            parts.append('"' + phrase + '"')
+        elif word:
+            prefix = word.endswith("*")
+            word = word.rstrip("*").replace('"', "")
+            if word:
+                parts.append('"' + word + '"' + ("*" if prefix else ""))
+    return " ".join(parts)
+
+
+def metadata_path(key: str) -> str:
+    """
+    SQLite JSON path of a dotted metadata key ("a.b" -> '$."a"."b"').
+
+    Raises:
+        ValueError: for empty segments or segments containing a double quote
+    """
+    segments = key.split(".")
+    if not all(segments) or any('"' in segment for segment in segments):
+        raise ValueError(f"Invalid metadata filter key: {key}")
+    return "$" + "".join(f'."{segment}"' for segment in segments)
+
+
+def encode_cursor(archived_at: float, id: str) -> str:
+    """Opaque export cursor pointing just past the given entry"""
+    raw = json.dumps([archived_at, id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        archived_at, id = json.loads(raw)
+        return float(archived_at), str(id)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+class ArchiveStore:
+    """
+    Archive entries stored in a SQLite database.
+
+    Lookups by ID use the primary key and time-ordered scans use the
+    (archived_at, id) index, so both are O(log n) and nothing is held on the
+    process heap beyond SQLite's page cache, which is capped by cache_kib to
+    stay well inside the cell's memory limit.
+
+    Content is also indexed in a contentless FTS5 inverted index, updated in
+    the same transaction as each write, which serves ranked term, phrase and
+    prefix search without storing the text again.
+
+    Content is stored in blobs keyed by its SHA-256 digest. With deduplicate,
+    identical content archived under several IDs is stored once and
+    refcounted; with compress, blobs are zlib-compressed when that saves
+    space. Stats track logical (as archived) and physical (as stored) bytes.
+    """
+
+    def __init__(self, db_path: str = "./data/archive.db", cache_kib: int = 16384,
+                 compress: bool = True, deduplicate: bool = True):
+        self.compress = compress
+        self.deduplicate = deduplicate
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA cache_size=-{cache_kib}")
+        self._migrate_inline_content()
+        self._conn.executescript(SCHEMA)
+        self._init_fts()
+        self._conn.commit()
+        print(f"[ArchiveStore] Using SQLite archive at {self.db_path}")
+
+    def _init_fts(self):
+        """Create the full-text index, backfilling it for existing archives"""
+        existing = self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'entries_fts'"
+        ).fetchone()
+        if existing is not None:
+            if "content = ''" in existing["sql"]:
+                return
+            # Rebuild indexes of older archives, which kept a copy of the text
+            self._conn.execute("DROP TABLE entries_fts")
+
+        self._conn.executescript(FTS_SCHEMA)
+        indexed = 0
+        for row in self._conn.execute("SELECT rowid, blob_key FROM entries").fetchall():
+            self._conn.execute(
+                "INSERT INTO entries_fts (rowid, body) VALUES (?, ?)",
+                (row["rowid"], searchable_text(self._load_content(row["blob_key"])))
+            )
+            indexed += 1
+        if indexed:
+            print(f"[ArchiveStore] Indexed {indexed} existing entries for search")
+
+    def _migrate_inline_content(self):
+        """Move content stored inline in entries (older archives) into blobs"""
+        columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(entries)")]
+        if "content" not in columns:
+            return
+
+        print("[ArchiveStore] Migrating inline content to content-addressed blobs")
+        # Creates blobs and the new stats rows; the existing entries table is kept
+        self._conn.executescript(SCHEMA)
+        self._conn.execute("ALTER TABLE entries ADD COLUMN blob_key TEXT NOT NULL DEFAULT ''")
+        for row in self._conn.execute("SELECT id, content FROM entries").fetchall():
+            content = json.loads(row["content"])
+            blob_key, checksum, size, _ = self._acquire_blob(row["id"], content)
+            self._conn.execute(
+                "UPDATE entries SET blob_key = ?, checksum = ?, size = ? WHERE id = ?",
+                (blob_key, checksum, size, row["id"])
+            )
+        self._conn.execute("ALTER TABLE entries DROP COLUMN content")
+        self._conn.execute(
+            "UPDATE stats SET value = (SELECT COALESCE(SUM(size), 0) FROM entries) WHERE key = 'total_size'"
+        )
+        self._conn.commit()
+
+    def _acquire_blob(self, data_id: str, content: Any) -> Tuple[str, str, int, bool]:
+        """
+        Store content (or take another reference to an identical blob).
+
+        Returns:
+            Tuple of (blob key, checksum, logical size, whether it was deduplicated)
+        """
+        checksum = content_digest(content)
+        blob_key = checksum if self.deduplicate else f"{checksum}/{data_id}"
+        payload = json.dumps(content, ensure_ascii=False).encode("utf-8")
+
+        existing = self._conn.execute(
+            "SELECT logical_size FROM blobs WHERE blob_key = ?", (blob_key,)
+        ).fetchone()
+        if existing is not None:
+            self._conn.execute(
+                "UPDATE blobs SET refcount = refcount + 1 WHERE blob_key = ?", (blob_key,)
+            )
+            return blob_key, checksum, existing["logical_size"], True
+
+        encoding, data = "none", payload
+        if self.compress and len(payload) >= COMPRESS_MIN_BYTES:
+            compressed = zlib.compress(payload, 6)
+            if len(compressed) < len(payload):
+                encoding, data = "zlib", compressed
+
+        self._conn.execute(
+            "INSERT INTO blobs (blob_key, refcount, encoding, logical_size, physical_size, data) "
+            "VALUES (?, 1, ?, ?, ?, ?)",
+            (blob_key, encoding, len(payload), len(data), data)
+        )
+        self._add_stat("physical_size", len(data))
+        self._add_stat("unique_blobs", 1)
+        return blob_key, checksum, len(payload), False
+
+    def _release_blob(self, blob_key: str):
+        """Drop one reference to a blob, deleting it when none remain"""
+        self._conn.execute(
+            "UPDATE blobs SET refcount = refcount - 1 WHERE blob_key = ?", (blob_key,)
+        )
+        row = self._conn.execute(
+            "SELECT refcount, physical_size FROM blobs WHERE blob_key = ?", (blob_key,)
+        ).fetchone()
+        if row is not None and row["refcount"] <= 0:
+            self._conn.execute("DELETE FROM blobs WHERE blob_key = ?", (blob_key,))
+            self._add_stat("physical_size", -row["physical_size"])
+            self._add_stat("unique_blobs", -1)
+
+    def _load_content(self, blob_key: str) -> Any:
+        row = self._conn.execute(
+            "SELECT encoding, data FROM blobs WHERE blob_key = ?", (blob_key,)
+        ).fetchone()
+        if row is None:
+            return None
+        data = row["data"]
+        if row["encoding"] == "zlib":
+            data = zlib.decompress(data)
+        return json.loads(data)
+
+    def _row_to_entry(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "content": self._load_content(row["blob_key"]),
+            "metadata": json.loads(row["metadata"]),
+            "archived_at": row["archived_at"],
+            "size": row["size"],
+            "checksum": row["checksum"]
+        }
+
+    def put(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert or replace an archive entry and update the storage stats
+
+        Args:
+            entry: Dict with id, content, metadata and archived_at; an id of
+                None gets the next free "data_<n>" ID
+
+        Returns:
+            Dict with the entry's id, size, checksum and whether it was
+            deduplicated
+        """
+        with self._lock, self._conn:
+            return self._put(entry)
+
+    def put_many(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert or replace several entries in a single transaction"""
+        with self._lock, self._conn:
+            return [self._put(entry) for entry in entries]
+
+    def _next_data_id(self) -> str:
+        """Allocate an ID in the current transaction, so concurrent writers never share one"""
+        while True:
+            self._add_stat("last_data_id", 1)
+            n = self._conn.execute("SELECT value FROM stats WHERE key = 'last_data_id'").fetchone()[0]
+            data_id = f"data_{n}"
+            # Archives from before the counter may already use low numbers
+            if self._conn.execute("SELECT 1 FROM entries WHERE id = ?", (data_id,)).fetchone() is None:
+                return data_id
+
+    def _put(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        if entry.get("id") is None:
+            entry = {**entry, "id": self._next_data_id()}
+        previous = self._conn.execute(
+            "SELECT rowid, size, blob_key FROM entries WHERE id = ?", (entry["id"],)
+        ).fetchone()
+        if previous is not None:
+            # A contentless index can only drop a row given the text it indexed
+            self._conn.execute(
+                "INSERT INTO entries_fts (entries_fts, rowid, body) VALUES ('delete', ?, ?)",
+                (previous["rowid"], searchable_text(self._load_content(previous["blob_key"])))
+            )
+
+        # Take the new reference before releasing the old one, so re-archiving
+        # identical content never deletes and re-inserts its blob
+        blob_key, checksum, size, deduplicated = self._acquire_blob(entry["id"], entry["content"])
+        if previous is not None:
+            self._release_blob(previous["blob_key"])
+
+        cursor = self._conn.execute(
+            "INSERT OR REPLACE INTO entries (id, blob_key, metadata, archived_at, size, checksum) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                entry["id"],
+                blob_key,
+                json.dumps(entry["metadata"]),
+                entry["archived_at"],
+                size,
+                checksum
+            )
+        )
+        self._conn.execute(
+            "INSERT INTO entries_fts (rowid, body) VALUES (?, ?)",
+            (cursor.lastrowid, searchable_text(entry["content"]))
+        )
+
+        if previous is None:
+            self._add_stat("total_items", 1)
+            self._add_stat("total_size", size)
+        else:
+            self._add_stat("total_size", size - previous["size"])
+
+        return {"id": entry["id"], "size": size, "checksum": checksum, "deduplicated": deduplicated}
+
+    def _add_stat(self, key: str, delta: int):
+        self._conn.execute("UPDATE stats SET value = value + ? WHERE key = ?", (delta, key))
+
+    def get(self, data_id: str) -> Optional[Dict[str, Any]]:
+        """Return the entry with the given ID, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM entries WHERE id = ?", (data_id,)).fetchone()
+            return self._row_to_entry(row) if row is not None else None
+
+    def count(self) -> int:
+        """Return the number of archived entries"""
+        return self.stats()["total_items"]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return storage statistics, including logical vs physical bytes"""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM stats").fetchall()
+        stats = {row["key"]: row["value"] for row in rows}
+        stats.pop("last_data_id", None)
+        stats["logical_size"] = stats["total_size"]
+        stats["saved_bytes"] = stats["total_size"] - stats["physical_size"]
+        stats["savings_ratio"] = (
+            round(stats["saved_bytes"] / stats["total_size"], 4) if stats["total_size"] else 0.0
+        )
+        return stats
+
+    def iter_entries(self, batch_size: int = 500, after: Optional[Tuple[float, str]] = None,
+                     start: Optional[float] = None, end: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield entries in (archived_at, id) order, one batch in memory at a time.
+
+        Args:
+            batch_size: Number of entries read per query
+            after: Resume strictly after this (archived_at, id) position
+            start: Only entries archived at or after this time
+            end: Only entries archived before this time
+
+        Returns:
+            Iterator of entries; each query seeks the (archived_at, id) index,
+            so resuming deep into the archive costs the same as starting
+        """
+        last = after or (float("-inf"), "")
+        start = float("-inf") if start is None else start
+        end = float("inf") if end is None else end
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT * FROM entries WHERE (archived_at, id) > (?, ?) "
+                    "AND archived_at >= ? AND archived_at < ? "
+                    "ORDER BY archived_at, id LIMIT ?",
+                    (last[0], last[1], start, end, batch_size)
+                ).fetchall()
+                entries = [self._row_to_entry(row) for row in rows]
+            if not entries:
+                return
+            yield from entries
+            last = (rows[-1]["archived_at"], rows[-1]["id"])
+
+    def search(self, query: str = "", limit: int = 100, offset: int = 0,
+               filters: Optional[Dict[str, str]] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Search archived entries.
+
+        Args:
+            query: Terms, "phrases" and prefix* terms; empty lists everything
+            limit: Maximum number of results
+            offset: Number of results to skip
+            filters: Metadata key (dotted paths allowed) to required value
+
+        Raises:
+            ValueError: for a filter key that is not a valid path
+
+        Returns:
+            Tuple of (results ranked by relevance, or oldest first when there
+            is no query, and whether more results exist)
+        """
+        clauses = []
+        params: List[Any] = []
+        for key, value in (filters or {}).items():
+            clauses.append("CAST(json_extract(e.metadata, ?) AS TEXT) = ?")
+            params.extend([metadata_path(key), value])
+
+        match = build_match_query(query)
+        if match:
+            sql = (
+                "SELECT e.id, e.metadata, e.archived_at, e.size, bm25(entries_fts) AS rank "
+                "FROM entries_fts JOIN entries e ON e.rowid = entries_fts.rowid "
+                "WHERE entries_fts MATCH ?"
+            )
+            params.insert(0, match)
+            order = "rank"
+        else:
+            sql = "SELECT e.id, e.metadata, e.archived_at, e.size, 0.0 AS rank FROM entries e WHERE 1"
+            order = "e.archived_at, e.id"
+
+        for clause in clauses:
+            sql += " AND " + clause
+        sql += f" ORDER BY {order} LIMIT ? OFFSET ?"
+        params.extend([limit + 1, offset])
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        results = [
+            {
+                "id": row["id"],
+                "metadata": json.loads(row["metadata"]),
+                "archived_at": row["archived_at"],
+                "size": row["size"],
+                "score": round(-row["rank"], 6) if match else None
+            }
+            for row in rows[:limit]
+        ]
+        return results, len(rows) > limit
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -5,22 +5,40 @@ Data archival and storage role for the swarm system.
 """
 
 import os
+import sys
+import json
+import time
 import asyncio
-from typing import Dict, Any, List
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from typing import Dict, Any, List, Optional, Tuple
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 
+# Add parent directory to path to import common modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from common.workqueue import WorkQueue, QueueWorker
+
+from archive_store import ArchiveStore, decode_cursor, encode_cursor
+
 app = FastAPI(title="Archivist Cell", version="0.1.0")
 
 # Global state for the archivist
 archivist_state = {
     "status": "active",
-    "archived_data": {},
-    "storage_stats": {"total_items": 0, "total_size": 0},
     "archive_policies": ["compress", "deduplicate", "encrypt"]
 }
 
+# Bulk ingest limits
+BULK_MAX_LINE_BYTES = 16 * 1024 * 1024
+BULK_MAX_REPORTED_REJECTS = 1000
+
+# Durable archive (SQLite/WAL), shared across restarts of the cell
+archive_store = ArchiveStore(
+    os.getenv("ARCHIVE_DB_PATH", "./data/archive.db"),
+    compress="compress" in archivist_state["archive_policies"],
+    deduplicate="deduplicate" in archivist_state["archive_policies"]
+)
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -36,73 +54,257 @@ async def get_status():
     """Get current archivist status"""
     return {
         "status": archivist_state["status"],
-        "storage_stats": archivist_state["storage_stats"],
-        "policies": archivist_state["archive_policies"]
+        "storage_stats": await asyncio.to_thread(archive_store.stats),
+        "policies": archivist_state["archive_policies"],
+        "work_queue": queue_worker.stats()
     }
 
-@app.post("/archive")
-async def archive_data(request: Dict[str, Any]):
-    """Archive data with metadata"""
-    data_id = request.get("id", f"data_{len(archivist_state['archived_data'])}")
+async def store_entry(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Archive one entry given as {"id"?, "content", "metadata"}; returns its stored info"""
+    # Without an id the store allocates one in the insert's transaction
+    data_id = request.get("id") or None
     content = request.get("content", {})
     metadata = request.get("metadata", {})
     
-    # Simulate archival process
     archive_entry = {
         "id": data_id,
         "content": content,
         "metadata": metadata,
-        "archived_at": asyncio.get_event_loop().time(),
-        "size": len(str(content)),
-        "checksum": hash(str(content)) % 10000
+        "archived_at": time.time()
+    }
+    
+    stored = await asyncio.to_thread(archive_store.put, archive_entry)
+    return {
+        "data_id": stored["id"],
+        "size": stored["size"],
+        "checksum": stored["checksum"],
+        "deduplicated": stored["deduplicated"]
     }
+
+@app.post("/archive")
+async def archive_data(request: Dict[str, Any]):
+    """Archive data with metadata"""
+    return JSONResponse({"status": "archived", **await store_entry(request)})
+
+# Archive tasks dispatched by the planner, with the same payload as /archive
+work_queue = WorkQueue.from_env("archivist")
+queue_worker = QueueWorker(work_queue, "archivist", "archivist", {"archive": store_entry},
+                           batch_size=int(os.getenv("WORKQUEUE_BATCH", 16)))
+
+def ingest_bulk_batch(lines: List[Tuple[int, bytes]], source: Optional[str]) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Parse and store one batch of NDJSON lines in a single transaction.
     
-    archivist_state["archived_data"][data_id] = archive_entry
-    archivist_state["storage_stats"]["total_items"] += 1
-    archivist_state["storage_stats"]["total_size"] += archive_entry["size"]
+    Lines shaped like an /archive request ({"id", "content", "metadata"})
+    are stored as such; any other object (e.g. data/raw/*-github.ndjson
+    records) is archived whole as content under its "id".
+    
+    Returns:
+        Tuple of (accepted count, rejected records with line numbers)
+    """
+    archived_at = time.time()
+    entries = []
+    rejected = []
+    for line_number, line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            rejected.append({"line": line_number, "error": f"invalid JSON: {e}"})
+            continue
+        if not isinstance(record, dict):
+            rejected.append({"line": line_number, "error": "record is not a JSON object"})
+            continue
+        if not record.get("id"):
+            rejected.append({"line": line_number, "error": "missing id"})
+            continue
+        
+        if "content" in record:
+            content = record["content"]
+            metadata = record.get("metadata") or {}
+        else:
+            content = record
+            metadata = {}
+        if not isinstance(metadata, dict):
+            rejected.append({"line": line_number, "error": "metadata is not a JSON object"})
+            continue
+        if source and "source" not in metadata:
+            metadata = {**metadata, "source": source}
+        
+        entries.append({
+            "id": str(record["id"]),
+            "content": content,
+            "metadata": metadata,
+            "archived_at": archived_at
+        })
+    
+    archive_store.put_many(entries)
+    return len(entries), rejected
+
+@app.post("/archive/bulk")
+async def archive_bulk(request: Request, batch_size: int = Query(1000, ge=1, le=10000),
+                       source: Optional[str] = None):
+    """
+    Archive an NDJSON request body, one record per line
+    
+    The body is parsed as it streams in and committed every batch_size
+    records; reading pauses while a batch is being written, so a fast client
+    cannot buffer the whole body in the cell.
+    """
+    accepted = 0
+    rejected: List[Dict[str, Any]] = []
+    rejected_count = 0
+    batches = 0
+    pending: List[Tuple[int, bytes]] = []
+    partial: List[bytes] = []
+    partial_size = 0
+    line_number = 0
+    
+    async def flush():
+        nonlocal accepted, rejected_count, batches, pending
+        batch, pending = pending, []
+        batch_accepted, batch_rejected = await asyncio.to_thread(ingest_bulk_batch, batch, source)
+        accepted += batch_accepted
+        rejected_count += len(batch_rejected)
+        rejected.extend(batch_rejected[:BULK_MAX_REPORTED_REJECTS - len(rejected)])
+        batches += 1
+    
+    def take_line(line: bytes):
+        nonlocal line_number, rejected_count
+        line_number += 1
+        if not line.strip():
+            return
+        if len(line) > BULK_MAX_LINE_BYTES:
+            rejected_count += 1
+            if len(rejected) < BULK_MAX_REPORTED_REJECTS:
+                rejected.append({"line": line_number, "error": "line too long"})
+            return
+        pending.append((line_number, line))
+    
+    skipping = False
+    async for chunk in request.stream():
+        # Only the new chunk is split; the unterminated line before it is
+        # kept as a list of pieces and joined once its newline arrives
+        *lines, tail = chunk.split(b"\n")
+        if lines and partial:
+            lines[0] = b"".join(partial) + lines[0]
+            partial, partial_size = [], 0
+        for line in lines:
+            if skipping:
+                # Tail of an oversized line that was already rejected
+                skipping = False
+                continue
+            take_line(line)
+            if len(pending) >= batch_size:
+                await flush()
+        if skipping:
+            continue
+        partial.append(tail)
+        partial_size += len(tail)
+        if partial_size > BULK_MAX_LINE_BYTES:
+            # Reject the oversized line rather than buffering it
+            take_line(b"".join(partial))
+            skipping = True
+            partial, partial_size = [], 0
+    
+    if partial_size and not skipping:
+        take_line(b"".join(partial))
+    if pending:
+        await flush()
     
     return JSONResponse({
-        "status": "archived",
-        "data_id": data_id,
-        "size": archive_entry["size"],
-        "checksum": archive_entry["checksum"]
+        "status": "bulk_archived",
+        "lines": line_number,
+        "accepted": accepted,
+        "rejected": rejected_count,
+        "rejected_records": rejected,
+        "batches": batches
     })
 
 @app.get("/retrieve/{data_id}")
 async def retrieve_data(data_id: str):
     """Retrieve archived data by ID"""
-    if data_id not in archivist_state["archived_data"]:
+    entry = await asyncio.to_thread(archive_store.get, data_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Data not found in archive")
     
-    return archivist_state["archived_data"][data_id]
+    return entry
 
 @app.get("/search")
-async def search_archive(query: str = "", limit: int = 100):
-    """Search archived data"""
-    results = []
-    
-    for data_id, entry in archivist_state["archived_data"].items():
-        if not query or query.lower() in str(entry["content"]).lower():
-            results.append({
-                "id": data_id,
-                "metadata": entry["metadata"],
-                "archived_at": entry["archived_at"],
-                "size": entry["size"]
-            })
-            
-            if len(results) >= limit:
+async def search_archive(query: str = "", limit: int = Query(100, ge=1, le=1000),
+                         offset: int = Query(0, ge=0),
+                         filter: List[str] = Query([])):
+    """
+    Search archived data
+    
+    Supports terms, "quoted phrases" and prefix* terms, ranked by relevance.
+    Metadata filters are given as repeated filter=key:value parameters.
+    """
+    filters = {}
+    for item in filter:
+        key, sep, value = item.partition(":")
+        if not sep:
+            raise HTTPException(status_code=400, detail=f"Invalid filter (expected key:value): {item}")
+        filters[key] = value
+    
+    try:
+        results, has_more = await asyncio.to_thread(
+            archive_store.search, query, limit, offset, filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "results": results,
+        "total_found": len(results),
+        "offset": offset,
+        "has_more": has_more
+    }
+
+@app.get("/export")
+async def export_archive(cursor: Optional[str] = None, start: Optional[float] = None,
+                         end: Optional[float] = None, limit: Optional[int] = Query(None, ge=1),
+                         batch_size: int = Query(500, ge=1, le=5000)):
+    """
+    Stream archived entries as NDJSON in archived_at order
+    
+    Entries are read from SQLite batch_size at a time while the response is
+    being sent, so memory stays flat whatever the archive size. Every line
+    carries a "cursor"; pass the last one received to resume the export.
+    start/end bound archived_at (start inclusive, end exclusive).
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def ndjson_lines():
+        # Sync generator: Starlette iterates it in a worker thread, one
+        # chunk per batch so the transfer stays chunked but not chatty
+        entries = archive_store.iter_entries(batch_size, after, start, end)
+        chunk = []
+        for count, entry in enumerate(entries, 1):
+            entry["cursor"] = encode_cursor(entry["archived_at"], entry["id"])
+            chunk.append(json.dumps(entry, ensure_ascii=False) + "\n")
+            if limit is not None and count >= limit:
                 break
+            if len(chunk) >= batch_size:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
     
-    return {"results": results, "total_found": len(results)}
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 async def archivist_loop():
     """Main async loop for archivist operations"""
     while True:
-        print(f"[Archivist] Managing {archivist_state['storage_stats']['total_items']} archived items")
+        storage_stats = await asyncio.to_thread(archive_store.stats)
+        print(f"[Archivist] Managing {storage_stats['total_items']} archived items")
         
         # Simulate periodic maintenance
-        if archivist_state["storage_stats"]["total_items"] > 0:
-            print(f"[Archivist] Total storage: {archivist_state['storage_stats']['total_size']} bytes")
+        if storage_stats["total_items"] > 0:
+            print(f"[Archivist] Total storage: {storage_stats['total_size']} bytes "
+                  f"({storage_stats['physical_size']} bytes stored)")
         
         await asyncio.sleep(6)
 
@@ -110,7 +312,14 @@ async def archivist_loop():
 async def startup_event():
     """Initialize archivist on startup"""
     print("[Archivist] Starting archivist cell...")
+    await work_queue.connect()
     asyncio.create_task(archivist_loop())
+    asyncio.create_task(queue_worker.run())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release queue connections on shutdown"""
+    await work_queue.close()
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
@@ -3,5 +3,10 @@ Common utilities and classes for VPM Swarm cells.
 """
 
 from .memory import Memory
+from .logstore import LogStore, LogStoreLocked
+from .async_memory import AsyncMemory
+from .executor import CellExecutor, ExecutorSaturated, ClientDisconnected
+from .workqueue import WorkQueue, QueueWorker, Task
 
-__all__ = ['Memory']
\ No newline at end of file
+__all__ = ['Memory', 'LogStore', 'LogStoreLocked', 'AsyncMemory', 'CellExecutor',
+           'ExecutorSaturated', 'ClientDisconnected', 'WorkQueue', 'QueueWorker', 'Task']
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Async Memory API - Phase-1
+Non-blocking counterpart of Memory for use inside FastAPI handlers.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from .codec import Codec, CodecSelector, decode
+from .memory import (
+    INVALIDATION_CHANNEL, LIST_PAGE_SIZE, Memory, ReadCache, RedisWrites,
+    cache_fetched, cached_values, encode_items, index_key, index_page,
+    index_page_bounds, namespace_of, scan_page, scan_pattern
+)
+
+
+class AsyncMemory:
+    """
+    Asynchronous memory storage with Redis/log file fallback.
+    Uses redis.asyncio with a shared connection pool if Redis is reachable;
+    otherwise delegates to a log-backed Memory whose file I/O runs in a
+    worker thread, so no call ever blocks the event loop.
+    Keys, codecs, the optional namespace index, the read cache and
+    cross-replica invalidation use Memory's helpers, so only the I/O differs.
+    """
+
+    def __init__(self, redis_host: str = "redis", redis_port: int = 6379,
+                 json_path: str = "./data/memory.json",
+                 log_path: Optional[str] = None,
+                 index_namespaces: bool = False,
+                 cache_size: int = 1024,
+                 cache_ttl: float = 30.0,
+                 cache_invalidation: bool = True,
+                 codec: Optional[Codec] = None,
+                 prefix_codecs: Optional[Dict[str, Codec]] = None,
+                 max_connections: int = 32,
+                 socket_timeout: float = 5.0):
+        self.redis_host = redis_host
+        self.redis_port = redis_port
+        self.index_namespaces = index_namespaces
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache = ReadCache(cache_size, cache_ttl)
+        self.cache_invalidation = cache_invalidation
+        self.codec = codec
+        self.prefix_codecs = prefix_codecs
+        self.codecs = CodecSelector(codec, prefix_codecs)
+        self.writes = RedisWrites(index_namespaces, cache_invalidation)
+        self._pubsub = None
+        self._invalidation_task: Optional[asyncio.Task] = None
+        self.json_path = json_path
+        self.log_path = log_path
+        self.max_connections = max_connections
+        self.socket_timeout = socket_timeout
+        self.redis_pool = None
+        self.redis_client = None
+        self.fallback: Optional[Memory] = None
+        self.use_redis = False
+        self._connect_lock = asyncio.Lock()
+        self._connected = False
+
+    async def connect(self):
+        """Connect to Redis, or open the log fallback if it is unreachable"""
+        async with self._connect_lock:
+            if self._connected:
+                return
+
+            try:
+                import redis.asyncio as aioredis
+                self.redis_pool = aioredis.ConnectionPool(
+                    host=self.redis_host,
+                    port=self.redis_port,
+                    decode_responses=False,
+                    max_connections=self.max_connections,
+                    socket_timeout=self.socket_timeout,
+                    socket_connect_timeout=self.socket_timeout
+                )
+                self.redis_client = aioredis.Redis(connection_pool=self.redis_pool)
+                await self.redis_client.ping()
+                self.use_redis = True
+                print(f"[AsyncMemory] Connected to Redis at {self.redis_host}:{self.redis_port}")
+                if self.cache_invalidation and self.cache_size > 0:
+                    await self._init_cache_invalidation()
+            except (ImportError, Exception) as e:
+                print(f"[AsyncMemory] Redis not available, falling back to log storage: {e}")
+                await self._close_redis()
+                self.use_redis = False
+                self.fallback = await asyncio.to_thread(
+                    Memory, redis_host=None, json_path=self.json_path, log_path=self.log_path,
+                    cache_size=self.cache_size, cache_ttl=self.cache_ttl,
+                    codec=self.codec, prefix_codecs=self.prefix_codecs
+                )
+
+            self._connected = True
+
+    async def close(self):
+        """Release the Redis connection pool"""
+        await self._close_redis()
+        self._connected = False
+
+    async def _close_redis(self):
+        if self._invalidation_task is not None:
+            self._invalidation_task.cancel()
+            self._invalidation_task = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+        if self.redis_pool is not None:
+            await self.redis_pool.disconnect()
+        self.redis_client = None
+        self.redis_pool = None
+
+    async def _init_cache_invalidation(self):
+        """Subscribe to invalidations published by other replicas"""
+        try:
+            self._pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(INVALIDATION_CHANNEL)
+            self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
+        except Exception as e:
+            print(f"[AsyncMemory] Cache invalidation unavailable, relying on TTL: {e}")
+
+    async def _listen_for_invalidations(self):
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") == "message":
+                        self.cache.apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[AsyncMemory] Invalidation listener error, retrying: {e}")
+                await asyncio.sleep(1.0)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return read cache counters of the active backend"""
+        if self.fallback is not None:
+            return self.fallback.cache_stats()
+        return self.cache.stats()
+
+    async def _ensure_connected(self):
+        if not self._connected:
+            await self.connect()
+
+    async def put(self, id: str, data: Any) -> bool:
+        """Store data with given ID; returns True if successful"""
+        await self._ensure_connected()
+        if not self.use_redis:
+            return await asyncio.to_thread(self.fallback.put, id, data)
+
+        try:
+            encoded = encode_items(self.codecs, {id: data}, "AsyncMemory")
+            if not encoded:
+                return False
+            pipe = self.redis_client.pipeline()
+            self.writes.put(pipe, encoded)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            print(f"[AsyncMemory] Error storing data for ID {id}: {e}")
+            return False
+        finally:
+            self.cache.invalidate([id])
+
+    async def get(self, id: str) -> Optional[Any]:
+        """Retrieve data by ID; returns None if not found"""
+        await self._ensure_connected()
+        if not self.use_redis:
+            return await asyncio.to_thread(self.fallback.get, id)
+
+        try:
+            raw_values, missing, token = cached_values(self.cache, [id])
+            if missing:
+                cache_fetched(self.cache, token, missing, [await self.redis_client.get(id)], raw_values)
+            return decode(raw_values[id]) if id in raw_values else None
+        except Exception as e:
+            print(f"[AsyncMemory] Error retrieving data for ID {id}: {e}")
+            return None
+
+    async def list_ids(self, prefix: str = "") -> List[str]:
+        """List all stored IDs starting with prefix, page by page"""
+        ids = []
+        cursor = None
+        while True:
+            page, cursor = await self.list_ids_page(prefix, cursor, LIST_PAGE_SIZE)
+            ids.extend(page)
+            if cursor is None:
+                return ids
+
+    async def list_ids_page(self, prefix: str = "", cursor: Optional[str] = None,
+                            limit: int = 100) -> Tuple[List[str], Optional[str]]:
+        """List one page of IDs; returns (IDs, next cursor or None)"""
+        await self._ensure_connected()
+        if not self.use_redis:
+            return await asyncio.to_thread(self.fallback.list_ids_page, prefix, cursor, limit)
+
+        try:
+            namespace = namespace_of(prefix) if self.index_namespaces else None
+            if namespace is not None:
+                members = await self.redis_client.zrangebylex(
+                    index_key(namespace), *index_page_bounds(prefix, cursor), start=0, num=limit + 1
+                )
+                return index_page(members, prefix, limit)
+
+            return await self._list_scan_page(prefix, cursor, limit)
+        except Exception as e:
+            print(f"[AsyncMemory] Error listing IDs: {e}")
+            return [], None
+
+    async def _list_scan_page(self, prefix: str, cursor: Optional[str],
+                              limit: int) -> Tuple[List[str], Optional[str]]:
+        """Page through the keyspace with SCAN"""
+        scan_cursor = int(cursor) if cursor else 0
+        pattern = scan_pattern(prefix)
+        ids = []
+        while True:
+            scan_cursor, keys = await self.redis_client.scan(scan_cursor, match=pattern, count=limit)
+            page = scan_page(ids, keys, scan_cursor, limit)
+            if page is not None:
+                return page
+
+    async def delete(self, id: str) -> bool:
+        """Delete data by ID; returns True if it existed"""
+        await self._ensure_connected()
+        if not self.use_redis:
+            return await asyncio.to_thread(self.fallback.delete, id)
+
+        try:
+            pipe = self.redis_client.pipeline()
+            self.writes.delete(pipe, [id])
+            return (await pipe.execute())[0] > 0
+        except Exception as e:
+            print(f"[AsyncMemory] Error deleting data for ID {id}: {e}")
+            return False
+        finally:
+            self.cache.invalidate([id])
+
+    async def put_many(self, items: Dict[str, Any]) -> Dict[str, bool]:
+        """Store several entries; returns per-ID success"""
+        await self._ensure_connected()
+        if not self.use_redis:
+            return await asyncio.to_thread(self.fallback.put_many, items)
+
+        status = {id: False for id in items}
+        encoded = encode_items(self.codecs, items, "AsyncMemory")
+        if not encoded:
+            return status
+
+        try:
+            pipe = self.redis_client.pipeline()
+            self.writes.put(pipe, encoded)
+            await pipe.execute()
+            for id in encoded:
+                status[id] = True
+        except Exception as e:
+            print(f"[AsyncMemory] Error storing batch of {len(encoded)} entries: {e}")
+        finally:
+            self.cache.invalidate(encoded)
+
+        return status
+
+    async def get_many(self, ids: List[str]) -> Dict[str, Optional[Any]]:
+        """Retrieve several entries; missing IDs map to None"""
+        await self._ensure_connected()
+        if not self.use_redis:
+            return await asyncio.to_thread(self.fallback.get_many, ids)
+
+        results = {id: None for id in ids}
+        if not ids:
+            return results
+
+        try:
+            raw_values, missing, token = cached_values(self.cache, ids)
+            if missing:
+                cache_fetched(self.cache, token, missing, await self.redis_client.mget(missing), raw_values)
+
+            for id, raw in raw_values.items():
+                results[id] = decode(raw)
+        except Exception as e:
+            print(f"[AsyncMemory] Error retrieving batch of {len(ids)} entries: {e}")
+
+        return results
+
+    async def delete_many(self, ids: List[str]) -> Dict[str, bool]:
+        """Delete several entries; returns per-ID existence"""
+        await self._ensure_connected()
+        if not self.use_redis:
+            return await asyncio.to_thread(self.fallback.delete_many, ids)
+
+        if not ids:
+            return {}
+
+        try:
+            ids = list(dict.fromkeys(ids))
+            pipe = self.redis_client.pipeline(transaction=False)
+            self.writes.delete(pipe, ids)
+            return {id: count > 0 for id, count in zip(ids, await pipe.execute())}
+        except Exception as e:
+            print(f"[AsyncMemory] Error deleting batch of {len(ids)} entries: {e}")
+            return {id: False for id in ids}
+        finally:
+            self.cache.invalidate(ids)
+
+    async def clear_all(self) -> bool:
+        """Clear all stored data"""
+        await self._ensure_connected()
+        if not self.use_redis:
+            return await asyncio.to_thread(self.fallback.clear_all)
+
+        try:
+            pipe = self.redis_client.pipeline()
+            self.writes.clear(pipe)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            print(f"[AsyncMemory] Error clearing all data: {e}")
+            return False
+        finally:
+            self.cache.invalidate()
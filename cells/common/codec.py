@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Value Codecs - Phase-1
+Serialization and compression of Memory values.
+
+Encoded values carry a 3-byte header: a zero marker byte, a format tag and a
+compression tag. Plain JSON text never starts with a zero byte, so values
+written before codecs existed still decode as JSON.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, Optional
+
+
+MARKER = 0x00
+FORMAT_TAGS = {"json": b"j", "msgpack": b"m"}
+COMPRESSION_TAGS = {None: b"n", "zlib": b"z", "zstd": b"s"}
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def _dumps_json(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _loads_json(payload: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _dumps_msgpack(data: Any) -> bytes:
+    return msgpack.packb(data, use_bin_type=True)
+
+
+def _loads_msgpack(payload: bytes) -> Any:
+    if msgpack is None:
+        raise ValueError("Value is msgpack-encoded but msgpack is not installed")
+    return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+_DECODERS = {b"j": _loads_json, b"m": _loads_msgpack}
+
+
+def _decompress(tag: bytes, payload: bytes) -> bytes:
+    if tag == b"n":
+        return payload
+    if tag == b"z":
+        return zlib.decompress(payload)
+    if tag == b"s":
+        if zstandard is None:
+            raise ValueError("Value is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f"Unknown compression tag {tag!r}")
+
+
+def decode(raw: Any) -> Any:
+    """Decode a stored value, whether tagged or legacy plain JSON"""
+    if isinstance(raw, str):
+        return json.loads(raw)
+    if not raw or raw[0] != MARKER:
+        return json.loads(raw)
+
+    format_tag, compression_tag = raw[1:2], raw[2:3]
+    decoder = _DECODERS.get(format_tag)
+    if decoder is None:
+        raise ValueError(f"Unknown format tag {format_tag!r}")
+    return decoder(_decompress(compression_tag, raw[3:]))
+
+
+class Codec:
+    """
+    Serializes values in one format, compressing them above a size threshold.
+
+    Formats: "json" (orjson when installed, else the stdlib) and "msgpack".
+    Compression: None, "zlib" or "zstd". Optional libraries that are missing
+    fall back to json/zlib rather than failing, like Memory does for Redis.
+    """
+
+    def __init__(self, format: str = "json", compression: Optional[str] = "zlib",
+                 compress_threshold: int = 4096, level: Optional[int] = None):
+        if format not in FORMAT_TAGS:
+            raise ValueError(f"Unknown codec format: {format}")
+        if compression not in COMPRESSION_TAGS:
+            raise ValueError(f"Unknown codec compression: {compression}")
+
+        if format == "msgpack" and msgpack is None:
+            print("[Codec] msgpack not installed, falling back to json")
+            format = "json"
+        if compression == "zstd" and zstandard is None:
+            print("[Codec] zstandard not installed, falling back to zlib")
+            compression = "zlib"
+
+        self.format = format
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+        self.level = level
+        self._dumps = _dumps_msgpack if format == "msgpack" else _dumps_json
+        self._zstd = None
+        if compression == "zstd":
+            self._zstd = zstandard.ZstdCompressor(level=level if level is not None else 3)
+
+    def encode(self, data: Any) -> bytes:
+        """Serialize data into a tagged byte string"""
+        payload = self._dumps(data)
+        compression = None
+        if self.compression and len(payload) >= self.compress_threshold:
+            if self.compression == "zlib":
+                compressed = zlib.compress(payload, self.level if self.level is not None else 6)
+            else:
+                compressed = self._zstd.compress(payload)
+            # Keep the raw payload when compression does not pay off
+            if len(compressed) < len(payload):
+                payload = compressed
+                compression = self.compression
+
+        return bytes((MARKER,)) + FORMAT_TAGS[self.format] + COMPRESSION_TAGS[compression] + payload
+
+    def decode(self, raw: Any) -> Any:
+        """Decode any stored value, regardless of which codec wrote it"""
+        return decode(raw)
+
+
+class CodecSelector:
+    """Picks the codec for a key: the longest matching prefix rule, else the default"""
+
+    def __init__(self, default: Optional[Codec] = None,
+                 prefix_codecs: Optional[Dict[str, Codec]] = None):
+        self.default = default or Codec()
+        # Longest prefixes first so the most specific rule wins
+        self.prefix_codecs = sorted((prefix_codecs or {}).items(),
+                                    key=lambda item: len(item[0]), reverse=True)
+
+    def for_key(self, id: str) -> Codec:
+        for prefix, codec in self.prefix_codecs:
+            if id.startswith(prefix):
+                return codec
+        return self.default
+
+    def encode(self, id: str, data: Any) -> bytes:
+        return self.for_key(id).encode(data)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Cell Executor - Phase-1
+Process pool for CPU-bound cell work, kept off the event loop so health
+probes and light requests are answered while large batches run.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the executor's queue is full; retry_after is in seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Executor saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ClientDisconnected(Exception):
+    """Raised when the client that requested the work went away"""
+
+
+def _noop() -> None:
+    return None
+
+
+class CellExecutor:
+    """
+    Bounded process pool for CPU-bound batches.
+
+    At most workers + max_queue tasks are admitted at once; beyond that
+    submit raises ExecutorSaturated with a Retry-After estimate from the
+    recent task durations, so overload turns into fast 429s instead of an
+    ever-growing backlog. Workers are started with "spawn", so they never
+    inherit locks held by the cell's threads. Functions and arguments must
+    be picklable, which means module-level functions of an importable
+    module (not main.py).
+
+    With workers=0 tasks run on a thread instead, for environments where
+    processes cannot be started; the queue bound still applies.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, name: str = "cell",
+                 disconnect_poll: float = 0.25):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.name = name
+        self.disconnect_poll = disconnect_poll
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # Moving average of task durations, for Retry-After
+        self._avg_duration = 1.0
+        self.completed = 0
+        self.rejected = 0
+        self.cancelled = 0
+
+    @property
+    def capacity(self) -> int:
+        return max(self.workers, 1) + self.max_queue
+
+    def start(self):
+        """Create the pool and start every worker ahead of the first request"""
+        if self.workers <= 0 or self._pool is not None:
+            return
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        for _ in range(self.workers):
+            self._pool.submit(_noop)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _admit(self):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                waves = (self._in_flight - max(self.workers, 1)) / max(self.workers, 1) + 1
+                raise ExecutorSaturated(max(1, math.ceil(self._avg_duration * waves)))
+            self._in_flight += 1
+
+    def _release(self, started: float, future: Future):
+        with self._lock:
+            self._in_flight -= 1
+            if not future.cancelled():
+                self.completed += 1
+                duration = time.perf_counter() - started
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+
+    def _submit(self, fn: Callable[..., Any], args: tuple) -> Future:
+        if self.workers <= 0:
+            future: Future = Future()
+
+            def run():
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args))
+                    except BaseException as e:
+                        future.set_exception(e)
+            threading.Thread(target=run, name=f"{self.name}-task", daemon=True).start()
+            return future
+
+        if self._pool is None:
+            self.start()
+        try:
+            return self._pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); replace the pool
+            self._pool = None
+            self.start()
+            return self._pool.submit(fn, *args)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, request: Any = None) -> Any:
+        """
+        Run fn(*args) in the pool and wait for its result.
+
+        Args:
+            fn: Picklable callable
+            request: Optional Starlette request; if its client disconnects
+                the task is cancelled (queued) or its result discarded
+                (already running, since a worker cannot be interrupted)
+
+        Raises:
+            ExecutorSaturated: The queue is full
+            ClientDisconnected: The client went away before the result
+        """
+        self._admit()
+        started = time.perf_counter()
+        try:
+            future = self._submit(fn, args)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(lambda f: self._release(started, f))
+
+        result = asyncio.wrap_future(future)
+        if request is None:
+            return await result
+
+        while True:
+            done, _ = await asyncio.wait({result}, timeout=self.disconnect_poll)
+            if done:
+                return result.result()
+            if await request.is_disconnected():
+                future.cancel()
+                with self._lock:
+                    self.cancelled += 1
+                raise ClientDisconnected()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - max(self.workers, 1)),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "cancelled": self.cancelled,
+                "avg_duration": round(self._avg_duration, 4)
+            }
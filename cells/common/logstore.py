@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Log Store - Phase-1
+Append-only, log-structured key/value file used as the Memory fallback
+when Redis is not available.
+"""
+
+import fcntl
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Record layout: op (1 byte), key length, value length, crc32 of key+value,
+# followed by the raw key and value bytes.
+_HEADER = struct.Struct(">BIII")
+_OP_PUT = 1
+_OP_DELETE = 2
+
+
+class LogStoreLocked(RuntimeError):
+    """The log is already open in another process (or store)"""
+
+
+def open_log_store(path: str, **options) -> "LogStore":
+    """
+    Open the log at path, or a per-process log next to it if another process has it open
+
+    Several processes sharing a data directory (replicas, or workers of one
+    server) keep running this way, each with its own "<stem>.<pid><suffix>"
+    log, but they do not see each other's data: that needs Redis.
+    """
+    try:
+        return LogStore(path, **options)
+    except LogStoreLocked:
+        shared = Path(path)
+        own = shared.with_name(f"{shared.stem}.{os.getpid()}{shared.suffix}")
+        print(f"[LogStore] WARNING: {shared} is open in another process; this process "
+              f"uses {own}, and its data is not shared with other processes")
+        return LogStore(str(own), **options)
+
+
+class LogStore:
+    """
+    Append-only key/value store backed by a single log file.
+
+    Every put/delete appends one record, so a write costs O(record size)
+    instead of O(store size). An in-memory index maps each live key to the
+    offset of its latest value. Space held by overwritten or deleted records
+    is reclaimed by compaction, which runs on a background thread once the
+    dead bytes outweigh the live ones.
+
+    The index assumes a single writer, so the store holds an exclusive
+    flock on "<path>.lock" while open; opening a log that is already open
+    raises LogStoreLocked instead of letting two writers corrupt it.
+    open_log_store() falls back to a log of the calling process instead.
+    """
+
+    def __init__(self, path: str, compact_min_bytes: int = 1024 * 1024,
+                 compact_ratio: float = 0.5, fsync: bool = False):
+        self.path = Path(path)
+        self.compact_min_bytes = compact_min_bytes
+        self.compact_ratio = compact_ratio
+        self.fsync = fsync
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._end = 0
+        self._dead_bytes = 0
+        self._generation = 0
+        self._compacting = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_file = self._acquire_file_lock()
+        self._open()
+        self._recover()
+
+    def _acquire_file_lock(self):
+        """Take the single-writer lock; a separate file, as compaction replaces the log"""
+        lock_file = open(self.path.with_name(self.path.name + ".lock"), "a")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            raise LogStoreLocked(f"{self.path} is already open in another process; "
+                                 f"every process needs its own log path")
+        return lock_file
+
+    def _open(self):
+        """Open the append handle and the positional read descriptor"""
+        self._writer = open(self.path, "ab")
+        self._reader_fd = os.open(self.path, os.O_RDONLY)
+
+    def _close_handles(self):
+        self._writer.close()
+        os.close(self._reader_fd)
+
+    def _recover(self):
+        """Rebuild the index by replaying the log, dropping a torn tail"""
+        offset = 0
+        for op, key, value_offset, value_len, record_len in self._scan(self._reader_fd, 0):
+            self._apply(op, key, value_offset, value_len, record_len)
+            offset += record_len
+
+        size = os.fstat(self._reader_fd).st_size
+        if offset < size:
+            print(f"[LogStore] Truncating {size - offset} bytes of incomplete log tail")
+            self._writer.truncate(offset)
+        self._end = offset
+
+    @staticmethod
+    def _scan(fd: int, start: int) -> Iterable[Tuple[int, str, int, int, int]]:
+        """Yield (op, key, value_offset, value_len, record_len) from start"""
+        offset = start
+        while True:
+            header = os.pread(fd, _HEADER.size, offset)
+            if len(header) < _HEADER.size:
+                return
+            op, key_len, value_len, crc = _HEADER.unpack(header)
+            body = os.pread(fd, key_len + value_len, offset + _HEADER.size)
+            if len(body) < key_len + value_len or zlib.crc32(body) != crc:
+                return
+            record_len = _HEADER.size + key_len + value_len
+            key = body[:key_len].decode("utf-8")
+            yield op, key, offset + _HEADER.size + key_len, value_len, record_len
+            offset += record_len
+
+    def _apply(self, op: int, key: str, value_offset: int, value_len: int, record_len: int):
+        """Update the index and dead byte count for one replayed record"""
+        previous = self._index.pop(key, None)
+        if previous is not None:
+            self._dead_bytes += _HEADER.size + len(key.encode("utf-8")) + previous[1]
+        if op == _OP_PUT:
+            self._index[key] = (value_offset, value_len)
+        else:
+            self._dead_bytes += record_len
+
+    @staticmethod
+    def _encode(op: int, key: str, value: bytes = b"") -> Tuple[bytes, int]:
+        key_bytes = key.encode("utf-8")
+        header = _HEADER.pack(op, len(key_bytes), len(value), zlib.crc32(key_bytes + value))
+        return header + key_bytes + value, len(header) + len(key_bytes)
+
+    def _append(self, records: List[Tuple[int, str, bytes]]):
+        """Append records in a single write and update the index (lock held)"""
+        chunks = []
+        offset = self._end
+        for op, key, value in records:
+            record, value_start = self._encode(op, key, value)
+            chunks.append(record)
+            self._apply(op, key, offset + value_start, len(value), len(record))
+            offset += len(record)
+
+        self._writer.write(b"".join(chunks))
+        self._writer.flush()
+        if self.fsync:
+            os.fsync(self._writer.fileno())
+        self._end = offset
+
+    def put(self, key: str, value: bytes):
+        """Store value under key"""
+        self.put_many({key: value})
+
+    def put_many(self, items: Dict[str, bytes]):
+        """Store several values with a single append"""
+        if not items:
+            return
+        with self._lock:
+            self._append([(_OP_PUT, key, value) for key, value in items.items()])
+        self._maybe_compact()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under key, or None"""
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                return None
+            return os.pread(self._reader_fd, location[1], location[0])
+
+    def delete(self, key: str) -> bool:
+        """Delete key, returning True if it existed"""
+        return self.delete_many([key])[key]
+
+    def delete_many(self, keys: List[str]) -> Dict[str, bool]:
+        """Delete several keys with a single append"""
+        with self._lock:
+            existed = {key: key in self._index for key in keys}
+            self._append([(_OP_DELETE, key, b"") for key, found in existed.items() if found])
+        self._maybe_compact()
+        return existed
+
+    def keys(self) -> List[str]:
+        """Return all live keys"""
+        with self._lock:
+            return list(self._index.keys())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def clear(self):
+        """Remove every record and truncate the log"""
+        with self._lock:
+            self._writer.truncate(0)
+            self._index.clear()
+            self._end = 0
+            self._dead_bytes = 0
+            self._generation += 1
+
+    def close(self):
+        with self._lock:
+            self._close_handles()
+            # Closing the lock file releases the flock
+            self._lock_file.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Return size information about the log"""
+        with self._lock:
+            return {
+                "keys": len(self._index),
+                "log_bytes": self._end,
+                "dead_bytes": self._dead_bytes
+            }
+
+    def _maybe_compact(self):
+        """Start a background compaction if enough of the log is dead"""
+        with self._lock:
+            if self._compacting or self._dead_bytes < self.compact_min_bytes:
+                return
+            if self._dead_bytes < self._end * self.compact_ratio:
+                return
+            self._compacting = True
+        threading.Thread(target=self._compact_in_background, daemon=True).start()
+
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"[LogStore] Compaction failed: {e}")
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def compact(self):
+        """
+        Rewrite the log with only live records.
+
+        The bulk copy runs without holding the lock; records appended while
+        it runs are replayed into the new log before it replaces the old one.
+        """
+        with self._lock:
+            snapshot = dict(self._index)
+            snapshot_end = self._end
+            generation = self._generation
+            source_fd = os.open(self.path, os.O_RDONLY)
+
+        tmp_path = self.path.with_name(self.path.name + ".compact")
+        new_index: Dict[str, Tuple[int, int]] = {}
+        dead_bytes = 0
+        try:
+            with open(tmp_path, "wb") as out:
+                offset = 0
+                for key, (value_offset, value_len) in snapshot.items():
+                    record, value_start = self._encode(
+                        _OP_PUT, key, os.pread(source_fd, value_len, value_offset))
+                    out.write(record)
+                    new_index[key] = (offset + value_start, value_len)
+                    offset += len(record)
+
+                with self._lock:
+                    if generation != self._generation:
+                        return
+
+                    # Replay whatever was appended during the copy
+                    for op, key, value_offset, value_len, record_len in self._scan(source_fd, snapshot_end):
+                        value = os.pread(source_fd, value_len, value_offset) if op == _OP_PUT else b""
+                        record, value_start = self._encode(op, key, value)
+                        out.write(record)
+                        previous = new_index.pop(key, None)
+                        if previous is not None:
+                            dead_bytes += _HEADER.size + len(key.encode("utf-8")) + previous[1]
+                        if op == _OP_PUT:
+                            new_index[key] = (offset + value_start, value_len)
+                        else:
+                            dead_bytes += len(record)
+                        offset += len(record)
+
+                    out.flush()
+                    os.fsync(out.fileno())
+                    self._close_handles()
+                    os.replace(tmp_path, self.path)
+                    self._open()
+                    self._index = new_index
+                    self._end = offset
+                    self._dead_bytes = dead_bytes
+                    print(f"[LogStore] Compacted {self.path} to {offset} bytes")
+        finally:
+            os.close(source_fd)
+            if tmp_path.exists():
+                tmp_path.unlink()
@@ -1,44 +1,367 @@
 #!/usr/bin/env python3
 """
 Memory API - Phase-1
-Provides persistent storage with Redis fallback to JSON file.
+Provides persistent storage with Redis fallback to an append-only log file.
 """
 
+import heapq
 import json
 import os
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
 
+from .codec import Codec, CodecSelector, decode
+from .logstore import open_log_store
+
+
+# Keys starting with this prefix are internal bookkeeping and never listed
+RESERVED_PREFIX = "__"
+INDEX_KEY_PREFIX = "__memory__:idx:"
+INVALIDATION_CHANNEL = "__memory__:invalidate"
+NAMESPACE_SEPARATOR = ":"
+LIST_PAGE_SIZE = 1000
+
+
+def invalidation_message(ids: Optional[Iterable[str]]) -> str:
+    """Build a cache invalidation message; None invalidates everything"""
+    if ids is None:
+        return json.dumps({"all": True})
+    return json.dumps({"ids": list(ids)})
+
+
+class ReadCache:
+    """
+    Bounded, thread-safe LRU cache of raw (still encoded) values with a TTL.
+    
+    Raw values are cached rather than decoded objects so callers can never
+    mutate a cached entry. Every invalidation bumps an epoch; a read that
+    started before an invalidation is not allowed to fill the cache, so a
+    slow read cannot reinstate a value that was overwritten meanwhile.
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached raw value, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, raw = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return raw
+    
+    def begin_read(self) -> int:
+        """Return a token to pass to set() once the backing read completes"""
+        return self._epoch
+    
+    def set(self, key: str, raw: Any, token: int):
+        """Cache raw under key unless an invalidation happened since token"""
+        if self.max_entries <= 0:
+            return
+        
+        with self._lock:
+            if token != self._epoch:
+                return
+            
+            self._entries[key] = (time.monotonic() + self.ttl, raw)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, keys: Optional[Iterable[str]] = None):
+        """Drop keys from the cache, or every entry if keys is None"""
+        if keys is None:
+            self.clear()
+        else:
+            self.invalidate_many(keys)
+    
+    def invalidate_many(self, keys: Iterable[str]):
+        """Drop keys from the cache"""
+        with self._lock:
+            self._epoch += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+    
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+    
+    def apply_invalidation(self, message: Any):
+        """Apply an invalidation message published by another replica"""
+        payload = json.loads(message)
+        if payload.get("all"):
+            self.clear()
+        else:
+            self.invalidate_many(payload.get("ids", []))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+
+def namespace_of(id: str) -> Optional[str]:
+    """Return the namespace of an ID ("plan:42" -> "plan"), if it has one"""
+    if id.startswith(RESERVED_PREFIX) or NAMESPACE_SEPARATOR not in id:
+        return None
+    return id.split(NAMESPACE_SEPARATOR, 1)[0]
+
+
+def index_key(namespace: str) -> str:
+    """Return the sorted-set key indexing IDs of a namespace"""
+    return f"{INDEX_KEY_PREFIX}{namespace}"
+
+
+def group_by_namespace(ids: Iterable[str]) -> Dict[str, List[str]]:
+    """Group namespaced IDs by namespace, skipping the rest"""
+    groups: Dict[str, List[str]] = {}
+    for id in ids:
+        namespace = namespace_of(id)
+        if namespace is not None:
+            groups.setdefault(namespace, []).append(id)
+    return groups
+
+
+def scan_pattern(prefix: str) -> str:
+    """Build a SCAN MATCH pattern for IDs starting with prefix"""
+    escaped = "".join("\\" + c if c in "*?[]\\" else c for c in prefix)
+    return escaped + "*"
+
+
+def page_sorted_ids(ids: Iterable[str], prefix: str, cursor: Optional[str],
+                    limit: int) -> Tuple[List[str], Optional[str]]:
+    """
+    Return the next page of IDs in sorted order.
+    The cursor is the last ID of the previous page.
+    """
+    candidates = heapq.nsmallest(limit + 1, (
+        id for id in ids
+        if id.startswith(prefix)
+        and not id.startswith(RESERVED_PREFIX)
+        and (cursor is None or id > cursor)
+    ))
+    if len(candidates) > limit:
+        return candidates[:limit], candidates[limit - 1]
+    return candidates, None
+
+
+def index_page_bounds(prefix: str, cursor: Optional[str]) -> Tuple[str, str]:
+    """ZRANGEBYLEX bounds of the namespace index page after cursor"""
+    return (f"({cursor}" if cursor else f"[{prefix}"), "+"
+
+
+def index_page(members: Iterable[bytes], prefix: str, limit: int) -> Tuple[List[str], Optional[str]]:
+    """Turn up to limit + 1 ZRANGEBYLEX members into a page of IDs"""
+    return page_sorted_ids((m.decode("utf-8") for m in members), prefix, None, limit)
+
+
+def scan_page(ids: List[str], keys: Iterable[bytes], scan_cursor: int,
+              limit: int) -> Optional[Tuple[List[str], Optional[str]]]:
+    """
+    Add the listable keys of one SCAN batch to ids.
+    Returns the page once SCAN wrapped around or limit IDs were collected,
+    None while another batch is needed.
+    """
+    ids.extend(
+        key for key in (k.decode("utf-8") for k in keys)
+        if not key.startswith(RESERVED_PREFIX)
+    )
+    if scan_cursor == 0:
+        return ids, None
+    if len(ids) >= limit:
+        return ids, str(scan_cursor)
+    return None
+
+
+def encode_items(codecs: CodecSelector, items: Dict[str, Any], owner: str) -> Dict[str, Any]:
+    """Encode values for storage, leaving out (and reporting) those the codec rejects"""
+    encoded = {}
+    for id, data in items.items():
+        try:
+            encoded[id] = codecs.encode(id, data)
+        except (TypeError, ValueError, OverflowError) as e:
+            print(f"[{owner}] Error serializing data for ID {id}: {e}")
+    return encoded
+
+
+def cached_values(cache: ReadCache, ids: Iterable[str]) -> Tuple[Dict[str, Any], List[str], int]:
+    """
+    Look ids up in the read cache.
+    Returns (raw values found, IDs still to fetch, token for cache_fetched)
+    """
+    token = cache.begin_read()
+    raw_values = {}
+    missing = []
+    for id in ids:
+        raw = cache.get(id)
+        if raw is None:
+            missing.append(id)
+        else:
+            raw_values[id] = raw
+    return raw_values, missing, token
+
+
+def cache_fetched(cache: ReadCache, token: int, ids: List[str], fetched: Iterable[Any],
+                  raw_values: Dict[str, Any]):
+    """Add the raw values fetched for ids (None: not found) to raw_values and the cache"""
+    for id, raw in zip(ids, fetched):
+        if raw is not None:
+            raw_values[id] = raw
+            cache.set(id, raw, token)
+
+
+class RedisWrites:
+    """
+    Queues the Redis commands of a write on a pipeline: the values, their
+    namespace index entries and the cross-replica cache invalidation.
+    Memory and AsyncMemory only differ in how the pipeline is executed.
+    """
+    
+    def __init__(self, index_namespaces: bool = False, cache_invalidation: bool = False):
+        self.index_namespaces = index_namespaces
+        self.cache_invalidation = cache_invalidation
+    
+    def put(self, pipe, encoded: Dict[str, Any]):
+        """Queue storing encoded values"""
+        pipe.mset(encoded)
+        self.index(pipe, encoded)
+        self.invalidate(pipe, encoded)
+    
+    def delete(self, pipe, ids: List[str]):
+        """Queue one DEL per ID; their counts are the first results"""
+        for id in ids:
+            pipe.delete(id)
+        self.index(pipe, ids, remove=True)
+        self.invalidate(pipe, ids)
+    
+    def clear(self, pipe):
+        """Queue dropping the whole database"""
+        pipe.flushdb()
+        self.invalidate(pipe)
+    
+    def index(self, pipe, ids: Iterable[str], remove: bool = False):
+        """Queue namespace index updates for ids"""
+        if not self.index_namespaces:
+            return
+        
+        for namespace, members in group_by_namespace(ids).items():
+            if remove:
+                pipe.zrem(index_key(namespace), *members)
+            else:
+                pipe.zadd(index_key(namespace), {id: 0 for id in members})
+    
+    def invalidate(self, pipe, ids: Optional[Iterable[str]] = None):
+        """Queue announcing the write to other replicas' caches"""
+        if self.cache_invalidation:
+            pipe.publish(INVALIDATION_CHANNEL, invalidation_message(ids))
+
 
 class Memory:
     """
-    Memory storage class with Redis/JSON fallback.
-    Uses Redis (host redis:6379) if available, otherwise ./data/memory.json
+    Memory storage class with Redis/log file fallback.
+    Uses Redis (host redis:6379) if available, otherwise an append-only log
+    next to ./data/memory.json (./data/memory.log). An existing memory.json
+    is imported into the log the first time it is created.
+    
+    With index_namespaces enabled, IDs of the form "<namespace>:<rest>" are
+    also kept in a per-namespace Redis sorted set, so listing a prefix that
+    includes the namespace does not scan the whole keyspace.
+    
+    Reads go through a bounded LRU/TTL cache (cache_size=0 disables it) that
+    is invalidated on local writes. With Redis, writes are also announced
+    on a pub/sub channel so other replicas drop their copies (pass
+    cache_invalidation=False only when a single process uses the data);
+    the TTL bounds staleness if a notification is missed.
+    
+    Values are serialized by a Codec (see codec.py), chosen per instance or
+    per key prefix via prefix_codecs. Every value carries a codec tag, and
+    untagged values written as plain JSON still decode.
     """
     
-    def __init__(self, redis_host: str = "redis", redis_port: int = 6379, 
-                 json_path: str = "./data/memory.json"):
+    def __init__(self, redis_host: Optional[str] = "redis", redis_port: int = 6379, 
+                 json_path: str = "./data/memory.json",
+                 log_path: Optional[str] = None,
+                 index_namespaces: bool = False,
+                 cache_size: int = 1024,
+                 cache_ttl: float = 30.0,
+                 cache_invalidation: bool = True,
+                 codec: Optional[Codec] = None,
+                 prefix_codecs: Optional[Dict[str, Codec]] = None):
         self.redis_host = redis_host
         self.redis_port = redis_port
+        self.index_namespaces = index_namespaces
+        self.cache = ReadCache(cache_size, cache_ttl)
+        self.cache_invalidation = cache_invalidation
+        self.codecs = CodecSelector(codec, prefix_codecs)
+        self.writes = RedisWrites(index_namespaces, cache_invalidation)
+        self._pubsub = None
+        self._pubsub_thread = None
         self.json_path = Path(json_path)
+        self.log_path = Path(log_path) if log_path else self.json_path.with_suffix(".log")
         self.redis_client = None
+        self.log_store = None
         self.use_redis = False
         
-        # Try to connect to Redis first
+        # Try to connect to Redis first (pass redis_host=None to skip it)
         self._init_redis()
         
         # If Redis is not available, ensure JSON file directory exists
         if not self.use_redis:
             self._init_json_storage()
+        elif self.cache_invalidation and cache_size > 0:
+            self._init_cache_invalidation()
     
     def _init_redis(self):
         """Initialize Redis connection if available"""
+        if not self.redis_host:
+            print("[Memory] Redis disabled, using log storage")
+            return
+        
         try:
             import redis
             self.redis_client = redis.Redis(
                 host=self.redis_host, 
                 port=self.redis_port, 
-                decode_responses=True
+                decode_responses=False
             )
             # Test connection
             self.redis_client.ping()
@@ -48,56 +371,76 @@ class Memory:
             print(f"[Memory] Redis not available, falling back to JSON: {e}")
             self.use_redis = False
     
+    def _init_cache_invalidation(self):
+        """Subscribe to invalidations published by other replicas"""
+        try:
+            self._pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{
+                INVALIDATION_CHANNEL: lambda message: self.cache.apply_invalidation(message["data"])
+            })
+            self._pubsub_thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except Exception as e:
+            print(f"[Memory] Cache invalidation unavailable, relying on TTL: {e}")
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return read cache counters"""
+        return self.cache.stats()
+    
     def _init_json_storage(self):
-        """Initialize JSON file storage"""
-        # Create data directory if it doesn't exist
-        self.json_path.parent.mkdir(parents=True, exist_ok=True)
+        """Initialize log file storage, importing a legacy JSON file once"""
+        needs_import = not self.log_path.exists() and self.json_path.exists()
+        self.log_store = open_log_store(str(self.log_path))
+        # Another process has the log: it imports the legacy file, not this one
+        needs_import = needs_import and self.log_store.path == self.log_path
+        self.log_path = self.log_store.path
         
-        # Create empty JSON file if it doesn't exist
-        if not self.json_path.exists():
-            with open(self.json_path, 'w') as f:
-                json.dump({}, f)
+        if needs_import:
+            legacy_data = self._load_json_data()
+            self.log_store.put_many({
+                id: self.codecs.encode(id, data) for id, data in legacy_data.items()
+            })
+            print(f"[Memory] Imported {len(legacy_data)} entries from {self.json_path}")
         
-        print(f"[Memory] Using JSON storage at {self.json_path}")
+        print(f"[Memory] Using log storage at {self.log_path}")
     
     def _load_json_data(self) -> Dict[str, Any]:
-        """Load data from JSON file"""
+        """Load data from legacy JSON file"""
         try:
             with open(self.json_path, 'r') as f:
                 return json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
     
-    def _save_json_data(self, data: Dict[str, Any]):
-        """Save data to JSON file"""
-        with open(self.json_path, 'w') as f:
-            json.dump(data, f, indent=2)
-    
     def put(self, id: str, data: Any) -> bool:
         """
         Store data with given ID
         
         Args:
             id: Unique identifier for the data
-            data: Data to store (must be JSON serializable)
+            data: Data to store (must be serializable by the key's codec)
             
         Returns:
             True if successful, False otherwise
         """
         try:
+            encoded = encode_items(self.codecs, {id: data}, "Memory")
+            if not encoded:
+                return False
             if self.use_redis:
-                # Store as JSON string in Redis
-                self.redis_client.set(id, json.dumps(data))
+                # Store encoded value in Redis
+                pipe = self.redis_client.pipeline()
+                self.writes.put(pipe, encoded)
+                pipe.execute()
             else:
-                # Store in JSON file
-                json_data = self._load_json_data()
-                json_data[id] = data
-                self._save_json_data(json_data)
+                # Append to the log file
+                self.log_store.put(id, encoded[id])
             
             return True
         except Exception as e:
             print(f"[Memory] Error storing data for ID {id}: {e}")
             return False
+        finally:
+            self.cache.invalidate([id])
     
     def get(self, id: str) -> Optional[Any]:
         """
@@ -110,40 +453,113 @@ class Memory:
             Data if found, None otherwise
         """
         try:
-            if self.use_redis:
-                # Get JSON string from Redis and parse
-                data_str = self.redis_client.get(id)
-                if data_str is None:
-                    return None
-                return json.loads(data_str)
-            else:
-                # Get from JSON file
-                json_data = self._load_json_data()
-                return json_data.get(id)
+            raw_values, missing, token = cached_values(self.cache, [id])
+            if missing:
+                if self.use_redis:
+                    # Get encoded value from Redis
+                    raw = self.redis_client.get(id)
+                else:
+                    # Get from the log file
+                    raw = self.log_store.get(id)
+                cache_fetched(self.cache, token, missing, [raw], raw_values)
+            
+            return decode(raw_values[id]) if id in raw_values else None
         
         except Exception as e:
             print(f"[Memory] Error retrieving data for ID {id}: {e}")
             return None
     
-    def list_ids(self) -> List[str]:
+    def list_ids(self, prefix: str = "") -> List[str]:
+        """
+        List all stored IDs, optionally restricted to a prefix
+        
+        Iterates page by page with SCAN (or the namespace index), so Redis
+        is never blocked by a single KEYS call.
+        
+        Args:
+            prefix: Only return IDs starting with this prefix
+            
+        Returns:
+            List of matching IDs
+        """
+        ids = []
+        cursor = None
+        while True:
+            page, cursor = self.list_ids_page(prefix, cursor, LIST_PAGE_SIZE)
+            ids.extend(page)
+            if cursor is None:
+                return ids
+    
+    def list_ids_page(self, prefix: str = "", cursor: Optional[str] = None,
+                      limit: int = 100) -> Tuple[List[str], Optional[str]]:
         """
-        List all stored IDs
+        List one page of stored IDs
         
+        Args:
+            prefix: Only return IDs starting with this prefix
+            cursor: Opaque cursor returned by the previous page, None to start
+            limit: Maximum number of IDs to return (SCAN pages may be slightly
+                larger, since SCAN cannot resume in the middle of a batch)
+            
         Returns:
-            List of all stored IDs
+            Tuple of (IDs, next cursor or None when the listing is complete)
         """
         try:
-            if self.use_redis:
-                # Get all keys from Redis
-                return self.redis_client.keys("*")
-            else:
-                # Get all keys from JSON file
-                json_data = self._load_json_data()
-                return list(json_data.keys())
+            if not self.use_redis:
+                return page_sorted_ids(self.log_store.keys(), prefix, cursor, limit)
+            
+            namespace = namespace_of(prefix) if self.index_namespaces else None
+            if namespace is not None:
+                return self._list_index_page(namespace, prefix, cursor, limit)
+            
+            return self._list_scan_page(prefix, cursor, limit)
         
         except Exception as e:
             print(f"[Memory] Error listing IDs: {e}")
-            return []
+            return [], None
+    
+    def _list_index_page(self, namespace: str, prefix: str, cursor: Optional[str],
+                         limit: int) -> Tuple[List[str], Optional[str]]:
+        """Page through a namespace sorted set with ZRANGEBYLEX"""
+        members = self.redis_client.zrangebylex(
+            index_key(namespace), *index_page_bounds(prefix, cursor), start=0, num=limit + 1
+        )
+        return index_page(members, prefix, limit)
+    
+    def _list_scan_page(self, prefix: str, cursor: Optional[str],
+                        limit: int) -> Tuple[List[str], Optional[str]]:
+        """Page through the keyspace with SCAN"""
+        scan_cursor = int(cursor) if cursor else 0
+        pattern = scan_pattern(prefix)
+        ids = []
+        while True:
+            scan_cursor, keys = self.redis_client.scan(scan_cursor, match=pattern, count=limit)
+            page = scan_page(ids, keys, scan_cursor, limit)
+            if page is not None:
+                return page
+    
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the namespace index from the keyspace
+        
+        Needed once when index_namespaces is turned on for existing data.
+        
+        Returns:
+            Number of IDs indexed
+        """
+        if not (self.use_redis and self.index_namespaces):
+            return 0
+        
+        indexed = 0
+        cursor = None
+        while True:
+            page, cursor = self._list_scan_page("", cursor, LIST_PAGE_SIZE)
+            pipe = self.redis_client.pipeline(transaction=False)
+            self.writes.index(pipe, page)
+            pipe.execute()
+            indexed += sum(len(members) for members in group_by_namespace(page).values())
+            if cursor is None:
+                return indexed
     
     def delete(self, id: str) -> bool:
         """
@@ -157,19 +573,107 @@ class Memory:
         """
         try:
             if self.use_redis:
-                result = self.redis_client.delete(id)
-                return result > 0
+                pipe = self.redis_client.pipeline()
+                self.writes.delete(pipe, [id])
+                return pipe.execute()[0] > 0
             else:
-                json_data = self._load_json_data()
-                if id in json_data:
-                    del json_data[id]
-                    self._save_json_data(json_data)
-                    return True
-                return False
+                return self.log_store.delete(id)
         
         except Exception as e:
             print(f"[Memory] Error deleting data for ID {id}: {e}")
             return False
+        finally:
+            self.cache.invalidate([id])
+    
+    def put_many(self, items: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        Store several entries in one round trip
+        
+        Args:
+            items: Mapping of ID to data (each must be serializable)
+            
+        Returns:
+            Mapping of ID to True if stored, False otherwise
+        """
+        status = {id: False for id in items}
+        encoded = encode_items(self.codecs, items, "Memory")
+        if not encoded:
+            return status
+        
+        try:
+            if self.use_redis:
+                pipe = self.redis_client.pipeline()
+                self.writes.put(pipe, encoded)
+                pipe.execute()
+            else:
+                self.log_store.put_many(encoded)
+            
+            for id in encoded:
+                status[id] = True
+        except Exception as e:
+            print(f"[Memory] Error storing batch of {len(encoded)} entries: {e}")
+        finally:
+            self.cache.invalidate(encoded)
+        
+        return status
+    
+    def get_many(self, ids: List[str]) -> Dict[str, Optional[Any]]:
+        """
+        Retrieve several entries in one round trip
+        
+        Args:
+            ids: Identifiers to look up
+            
+        Returns:
+            Mapping of ID to data, or None for IDs that were not found
+        """
+        results = {id: None for id in ids}
+        if not ids:
+            return results
+        
+        try:
+            raw_values, missing, token = cached_values(self.cache, ids)
+            if missing:
+                if self.use_redis:
+                    fetched = self.redis_client.mget(missing)
+                else:
+                    fetched = [self.log_store.get(id) for id in missing]
+                cache_fetched(self.cache, token, missing, fetched, raw_values)
+            
+            for id, raw in raw_values.items():
+                results[id] = decode(raw)
+        except Exception as e:
+            print(f"[Memory] Error retrieving batch of {len(ids)} entries: {e}")
+        
+        return results
+    
+    def delete_many(self, ids: List[str]) -> Dict[str, bool]:
+        """
+        Delete several entries in one round trip
+        
+        Args:
+            ids: Identifiers of the data to delete
+            
+        Returns:
+            Mapping of ID to True if it existed and was deleted
+        """
+        if not ids:
+            return {}
+        
+        try:
+            if self.use_redis:
+                ids = list(dict.fromkeys(ids))
+                pipe = self.redis_client.pipeline(transaction=False)
+                self.writes.delete(pipe, ids)
+                return {id: count > 0 for id, count in zip(ids, pipe.execute())}
+            else:
+                return self.log_store.delete_many(ids)
+        
+        except Exception as e:
+            print(f"[Memory] Error deleting batch of {len(ids)} entries: {e}")
+            return {id: False for id in ids}
+        finally:
+            self.cache.invalidate(ids)
     
     def clear_all(self) -> bool:
         """
@@ -180,11 +684,15 @@ class Memory:
         """
         try:
             if self.use_redis:
-                self.redis_client.flushdb()
+                pipe = self.redis_client.pipeline()
+                self.writes.clear(pipe)
+                pipe.execute()
             else:
-                self._save_json_data({})
+                self.log_store.clear()
             
             return True
         except Exception as e:
             print(f"[Memory] Error clearing all data: {e}")
-            return False
\ No newline at end of file
+            return False
+        finally:
+            self.cache.invalidate()
\ No newline at end of file
@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Work Queue - Phase-1
+Durable task queues between cells: Redis Streams with consumer groups, or
+a log file stand-in when Redis is not available.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from .executor import ExecutorSaturated
+from .logstore import LogStore, open_log_store
+
+
+# Reserved prefix keeps the streams out of Memory ID listings
+STREAM_PREFIX = "__workqueue:"
+DEAD_SUFFIX = ":dead"
+
+
+class Task:
+    """One delivery of a queued task"""
+
+    __slots__ = ("id", "queue", "body", "attempts")
+
+    def __init__(self, id: str, queue: str, body: Dict[str, Any], attempts: int):
+        self.id = id
+        self.queue = queue
+        self.body = body
+        self.attempts = attempts
+
+
+def _encode(body: Dict[str, Any]) -> str:
+    return json.dumps(body, separators=(",", ":"), default=str)
+
+
+class _RedisBackend:
+    """
+    One stream per queue, one consumer group per consuming cell.
+
+    Unacknowledged deliveries stay in the group's pending list; once one
+    has been idle for the visibility timeout (its consumer died or gave up
+    on it) XAUTOCLAIM hands it to the next consumer that asks.
+    """
+
+    def __init__(self, client, visibility_timeout: float, max_attempts: int, maxlen: int):
+        self.client = client
+        self.visibility_ms = int(visibility_timeout * 1000)
+        self.max_attempts = max_attempts
+        self.maxlen = maxlen
+        self._groups = set()
+        self._claim_cursors: Dict[tuple, str] = {}
+
+    async def enqueue(self, queue: str, bodies: List[Dict[str, Any]]) -> List[str]:
+        pipe = self.client.pipeline(transaction=False)
+        for body in bodies:
+            pipe.xadd(STREAM_PREFIX + queue, {"task": _encode(body)},
+                      maxlen=self.maxlen, approximate=True)
+        return [id.decode() if isinstance(id, bytes) else id for id in await pipe.execute()]
+
+    async def _ensure_group(self, queue: str, group: str):
+        if (queue, group) in self._groups:
+            return
+        try:
+            await self.client.xgroup_create(STREAM_PREFIX + queue, group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._groups.add((queue, group))
+
+    def _tasks(self, queue: str, entries, attempts: Dict[str, int]) -> List[Task]:
+        tasks = []
+        for id, fields in entries:
+            if not fields:
+                continue  # deleted by stream trimming while pending
+            id = id.decode() if isinstance(id, bytes) else id
+            tasks.append(Task(id, queue, json.loads(fields[b"task"]), attempts.get(id, 1)))
+        return tasks
+
+    async def claim(self, queue: str, group: str, consumer: str, count: int,
+                    block: float) -> List[Task]:
+        await self._ensure_group(queue, group)
+        stream = STREAM_PREFIX + queue
+
+        # Expired deliveries first, so retries are not starved by new work
+        cursor_key = (queue, group)
+        reply = await self.client.xautoclaim(
+            stream, group, consumer, self.visibility_ms,
+            start_id=self._claim_cursors.get(cursor_key, "0-0"), count=count
+        )
+        next_cursor, entries = reply[0], reply[1]
+        self._claim_cursors[cursor_key] = next_cursor.decode() if isinstance(next_cursor, bytes) else next_cursor
+        attempts = {}
+        if entries:
+            pipe = self.client.pipeline(transaction=False)
+            for id, _ in entries:
+                pipe.xpending_range(stream, group, min=id, max=id, count=1)
+            for pending in await pipe.execute():
+                if pending:
+                    id = pending[0]["message_id"]
+                    attempts[id.decode() if isinstance(id, bytes) else id] = pending[0]["times_delivered"]
+        tasks = self._tasks(queue, entries, attempts)
+
+        if len(tasks) < count:
+            reply = await self.client.xreadgroup(
+                group, consumer, {stream: ">"}, count=count - len(tasks),
+                block=None if tasks else max(int(block * 1000), 1)
+            )
+            for _, entries in reply or []:
+                tasks.extend(self._tasks(queue, entries, {}))
+        return tasks
+
+    async def ack(self, queue: str, group: str, tasks: List[Task]):
+        if tasks:
+            await self.client.xack(STREAM_PREFIX + queue, group, *[task.id for task in tasks])
+
+    async def dead_letter(self, queue: str, group: str, task: Task, error: str):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.xadd(STREAM_PREFIX + queue + DEAD_SUFFIX, {
+            "task": _encode(task.body), "error": error, "attempts": task.attempts, "group": group
+        }, maxlen=self.maxlen, approximate=True)
+        pipe.xack(STREAM_PREFIX + queue, group, task.id)
+        await pipe.execute()
+
+    async def release(self, queue: str, group: str, task: Task):
+        """Leave the delivery pending: it is redelivered after the visibility timeout"""
+
+    async def extend(self, queue: str, group: str, consumer: str, tasks: List[Task]):
+        if tasks:
+            # Claiming to ourselves resets the idle time of the deliveries
+            await self.client.xclaim(STREAM_PREFIX + queue, group, consumer, 0,
+                                     [task.id for task in tasks], justid=True)
+
+    async def stats(self, queue: str, group: Optional[str]) -> Dict[str, Any]:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.xlen(STREAM_PREFIX + queue)
+        pipe.xlen(STREAM_PREFIX + queue + DEAD_SUFFIX)
+        length, dead = await pipe.execute()
+        stats = {"backend": "redis", "length": length, "dead": dead}
+        if group is not None:
+            await self._ensure_group(queue, group)
+            stats["pending"] = (await self.client.xpending(STREAM_PREFIX + queue, group))["pending"]
+        return stats
+
+
+class _LogQueue:
+    def __init__(self, store: LogStore):
+        self.store = store
+        self.ready: Deque[int] = deque()
+        self.in_flight: Dict[int, float] = {}
+        self.attempts: Dict[int, int] = {}
+        self.dead = 0
+        self.next_seq = 1
+        self.arrived = asyncio.Event()
+
+
+class _LogBackend:
+    """
+    Stand-in with the same semantics for a single process.
+
+    Each queue is a LogStore file holding its unacknowledged tasks, so
+    they survive a restart; deliveries not acknowledged within the
+    visibility timeout become ready again. Consumer groups collapse to
+    one, and other cells cannot see the queue: cross-cell dispatch needs
+    Redis.
+    """
+
+    def __init__(self, log_dir: str, visibility_timeout: float, max_attempts: int):
+        self.log_dir = log_dir
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self._queues: Dict[str, _LogQueue] = {}
+        self._open_lock = asyncio.Lock()
+
+    async def _queue(self, queue: str) -> _LogQueue:
+        state = self._queues.get(queue)
+        if state is not None:
+            return state
+        # A log may only be opened once (see LogStore)
+        async with self._open_lock:
+            state = self._queues.get(queue)
+            if state is not None:
+                return state
+            store = await asyncio.to_thread(open_log_store, os.path.join(self.log_dir, f"{queue}.log"))
+            state = self._queues[queue] = _LogQueue(store)
+            seqs = []
+            for key in store.keys():
+                kind, seq = key.split(":", 1)
+                if kind == "t":
+                    seqs.append(int(seq))
+                else:
+                    state.dead += 1
+                state.next_seq = max(state.next_seq, int(seq) + 1)
+            state.ready.extend(sorted(seqs))
+        return state
+
+    def close(self):
+        for state in self._queues.values():
+            state.store.close()
+        self._queues.clear()
+
+    @staticmethod
+    def _key(seq: int, kind: str = "t") -> str:
+        return f"{kind}:{seq:012d}"
+
+    async def enqueue(self, queue: str, bodies: List[Dict[str, Any]]) -> List[str]:
+        state = await self._queue(queue)
+        seqs = list(range(state.next_seq, state.next_seq + len(bodies)))
+        state.next_seq += len(bodies)
+        await asyncio.to_thread(state.store.put_many, {
+            self._key(seq): _encode({"body": body, "attempts": 0}).encode() for seq, body in zip(seqs, bodies)
+        })
+        state.ready.extend(seqs)
+        state.arrived.set()
+        return [str(seq) for seq in seqs]
+
+    async def claim(self, queue: str, group: str, consumer: str, count: int,
+                    block: float) -> List[Task]:
+        state = await self._queue(queue)
+        deadline = time.monotonic() + block
+        while True:
+            now = time.monotonic()
+            expired = sorted(seq for seq, visible_at in state.in_flight.items() if visible_at <= now)
+            for seq in reversed(expired):
+                del state.in_flight[seq]
+                state.ready.appendleft(seq)
+            if state.ready or now >= deadline:
+                break
+            state.arrived.clear()
+            try:
+                await asyncio.wait_for(state.arrived.wait(), min(deadline - now, self.visibility_timeout))
+            except asyncio.TimeoutError:
+                pass
+
+        seqs = [state.ready.popleft() for _ in range(min(count, len(state.ready)))]
+        raw = await asyncio.to_thread(lambda: [state.store.get(self._key(seq)) for seq in seqs])
+        tasks = []
+        updates = {}
+        for seq, value in zip(seqs, raw):
+            if value is None:
+                continue
+            record = json.loads(value)
+            record["attempts"] += 1
+            updates[self._key(seq)] = _encode(record).encode()
+            state.in_flight[seq] = time.monotonic() + self.visibility_timeout
+            tasks.append(Task(str(seq), queue, record["body"], record["attempts"]))
+        await asyncio.to_thread(state.store.put_many, updates)
+        return tasks
+
+    async def ack(self, queue: str, group: str, tasks: List[Task]):
+        state = await self._queue(queue)
+        for task in tasks:
+            state.in_flight.pop(int(task.id), None)
+        await asyncio.to_thread(state.store.delete_many, [self._key(int(task.id)) for task in tasks])
+
+    async def dead_letter(self, queue: str, group: str, task: Task, error: str):
+        state = await self._queue(queue)
+        seq = int(task.id)
+        state.in_flight.pop(seq, None)
+        record = {"body": task.body, "attempts": task.attempts, "error": error, "group": group}
+        await asyncio.to_thread(state.store.put, self._key(seq, "d"), _encode(record).encode())
+        await asyncio.to_thread(state.store.delete, self._key(seq))
+        state.dead += 1
+
+    async def release(self, queue: str, group: str, task: Task):
+        """Leave the delivery in flight: it becomes ready after the visibility timeout"""
+
+    async def extend(self, queue: str, group: str, consumer: str, tasks: List[Task]):
+        state = await self._queue(queue)
+        for task in tasks:
+            if int(task.id) in state.in_flight:
+                state.in_flight[int(task.id)] = time.monotonic() + self.visibility_timeout
+
+    async def stats(self, queue: str, group: Optional[str]) -> Dict[str, Any]:
+        state = await self._queue(queue)
+        return {
+            "backend": "log",
+            "length": len(state.ready) + len(state.in_flight),
+            "dead": state.dead,
+            "pending": len(state.in_flight)
+        }
+
+
+class WorkQueue:
+    """
+    Durable named task queues with at-least-once delivery.
+
+    Producers enqueue JSON task bodies onto a queue; consumers claim them in
+    batches as members of a consumer group, so replicas of a cell share
+    one queue's work. A claimed task is invisible to other consumers until
+    it is acknowledged, or until the visibility timeout passes without an
+    ack (or extend), after which it is delivered again. A task that fails
+    max_attempts times, or is claimed that often without an ack, moves to
+    the queue's dead-letter list.
+
+    Uses Redis Streams if Redis is reachable, otherwise a log file per
+    queue (see _LogBackend).
+    """
+
+    def __init__(self, redis_host: str = "redis", redis_port: int = 6379,
+                 log_dir: str = "./data/workqueue", visibility_timeout: float = 30.0,
+                 max_attempts: int = 5, maxlen: int = 100000):
+        self.redis_host = redis_host
+        self.redis_port = redis_port
+        self.log_dir = log_dir
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.maxlen = maxlen
+        self.redis_client = None
+        self.use_redis = False
+        self._backend = None
+        self._connect_lock = asyncio.Lock()
+
+    @classmethod
+    def from_env(cls, cell: str) -> "WorkQueue":
+        """Queue settings from WORKQUEUE_* variables; cell names its own log directory"""
+        return cls(
+            log_dir=os.path.join(os.getenv("WORKQUEUE_LOG_DIR", "./data/workqueue"), cell),
+            visibility_timeout=float(os.getenv("WORKQUEUE_VISIBILITY_TIMEOUT", 30)),
+            max_attempts=int(os.getenv("WORKQUEUE_MAX_ATTEMPTS", 5))
+        )
+
+    async def connect(self):
+        """Connect to Redis, or open the log stand-in if it is unreachable"""
+        async with self._connect_lock:
+            if self._backend is not None:
+                return
+            try:
+                import redis.asyncio as aioredis
+                self.redis_client = aioredis.Redis(host=self.redis_host, port=self.redis_port,
+                                                   decode_responses=False)
+                await self.redis_client.ping()
+                self.use_redis = True
+                self._backend = _RedisBackend(self.redis_client, self.visibility_timeout,
+                                              self.max_attempts, self.maxlen)
+                print(f"[WorkQueue] Using Redis streams at {self.redis_host}:{self.redis_port}")
+            except (ImportError, Exception) as e:
+                print(f"[WorkQueue] Redis not available, queues are local to this process: {e}")
+                if self.redis_client is not None:
+                    await self.redis_client.aclose()
+                    self.redis_client = None
+                self.use_redis = False
+                self._backend = _LogBackend(self.log_dir, self.visibility_timeout, self.max_attempts)
+
+    async def close(self):
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+            self.redis_client = None
+        if isinstance(self._backend, _LogBackend):
+            await asyncio.to_thread(self._backend.close)
+        self._backend = None
+
+    async def _ensure_connected(self):
+        if self._backend is None:
+            await self.connect()
+
+    async def enqueue(self, queue: str, bodies: List[Dict[str, Any]]) -> List[str]:
+        """Append task bodies to a queue; returns their IDs"""
+        if not bodies:
+            return []
+        await self._ensure_connected()
+        return await self._backend.enqueue(queue, bodies)
+
+    async def claim(self, queue: str, group: str, consumer: str, count: int = 16,
+                    block: float = 5.0) -> List[Task]:
+        """
+        Claim up to count tasks for consumer, waiting up to block seconds.
+
+        Expired deliveries are claimed before new tasks. Deliveries beyond
+        max_attempts are dead-lettered here instead of being returned.
+        """
+        await self._ensure_connected()
+        tasks = await self._backend.claim(queue, group, consumer, count, block)
+        live = []
+        for task in tasks:
+            if task.attempts > self.max_attempts:
+                await self._backend.dead_letter(queue, group, task, "not acknowledged within the visibility timeout")
+            else:
+                live.append(task)
+        return live
+
+    async def ack(self, queue: str, group: str, tasks: List[Task]):
+        """Acknowledge completed tasks"""
+        await self._ensure_connected()
+        await self._backend.ack(queue, group, tasks)
+
+    async def fail(self, queue: str, group: str, task: Task, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt.
+
+        The task is retried after the visibility timeout, unless retry is
+        False or it has used up max_attempts; then it is dead-lettered.
+
+        Returns:
+            True if the task was dead-lettered
+        """
+        await self._ensure_connected()
+        if retry and task.attempts < self.max_attempts:
+            await self._backend.release(queue, group, task)
+            return False
+        await self._backend.dead_letter(queue, group, task, error)
+        return True
+
+    async def extend(self, queue: str, group: str, consumer: str, tasks: List[Task]):
+        """Restart the visibility timeout of tasks still being worked on"""
+        await self._ensure_connected()
+        await self._backend.extend(queue, group, consumer, tasks)
+
+    async def stats(self, queue: str, group: Optional[str] = None) -> Dict[str, Any]:
+        await self._ensure_connected()
+        return await self._backend.stats(queue, group)
+
+
+def consumer_name() -> str:
+    """Unique consumer name of this replica"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+TaskHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class QueueWorker:
+    """
+    Consumes one queue on behalf of a cell.
+
+    Tasks are claimed in batches and run concurrently; each body names an
+    "action" that selects the handler, which gets the body's "payload".
+    While a batch runs, its visibility timeout is extended periodically,
+    so long tasks are not redelivered to another replica. A task whose body
+    has "reply_to" gets a completion ("task_completed" with its outcome)
+    enqueued there once it succeeds or is dead-lettered.
+    """
+
+    def __init__(self, work_queue: WorkQueue, queue: str, group: str,
+                 handlers: Dict[str, TaskHandler], batch_size: int = 16, block: float = 5.0):
+        self.work_queue = work_queue
+        self.queue = queue
+        self.group = group
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.block = block
+        self.consumer = consumer_name()
+        self.completed = 0
+        self.failed = 0
+        self.dead_lettered = 0
+
+    async def run(self):
+        """Claim and process batches until cancelled"""
+        while True:
+            try:
+                tasks = await self.work_queue.claim(self.queue, self.group, self.consumer,
+                                                    self.batch_size, self.block)
+                if tasks:
+                    await self.process(tasks)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[WorkQueue] Error consuming {self.queue}: {e}")
+                await asyncio.sleep(1)
+
+    async def process(self, tasks: List[Task]):
+        heartbeat = asyncio.create_task(self._heartbeat(tasks))
+        try:
+            outcomes = await asyncio.gather(*(self._run_task(task) for task in tasks))
+        finally:
+            heartbeat.cancel()
+        await self.work_queue.ack(self.queue, self.group,
+                                  [task for task, done in zip(tasks, outcomes) if done])
+
+    async def _heartbeat(self, tasks: List[Task]):
+        while True:
+            await asyncio.sleep(self.work_queue.visibility_timeout / 3)
+            await self.work_queue.extend(self.queue, self.group, self.consumer, tasks)
+
+    async def _run_task(self, task: Task) -> bool:
+        """Run one task; True if it succeeded and should be acknowledged"""
+        action = task.body.get("action")
+        handler = self.handlers.get(action)
+        if handler is None:
+            await self._failed(task, f"unknown action: {action}", retry=False)
+            return False
+
+        while True:
+            try:
+                result = await handler(task.body.get("payload") or {})
+                break
+            except ExecutorSaturated as e:
+                # Back-pressure from this cell's own workers, not a failure
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                await self._failed(task, str(e) or type(e).__name__)
+                return False
+
+        self.completed += 1
+        await self._reply(task, "completed", result=result)
+        return True
+
+    async def _failed(self, task: Task, error: str, retry: bool = True):
+        self.failed += 1
+        print(f"[WorkQueue] Task {task.body.get('task_id', task.id)} failed "
+              f"(attempt {task.attempts}): {error}")
+        if await self.work_queue.fail(self.queue, self.group, task, error, retry):
+            self.dead_lettered += 1
+            await self._reply(task, "failed", error=error)
+
+    async def _reply(self, task: Task, status: str, result: Any = None, error: Optional[str] = None):
+        reply_to = task.body.get("reply_to")
+        if not reply_to:
+            return
+        await self.work_queue.enqueue(reply_to, [{
+            "action": "task_completed",
+            "payload": {
+                "task_id": task.body.get("task_id"),
+                "plan_id": task.body.get("plan_id"),
+                "queue": self.queue,
+                "status": status,
+                "attempts": task.attempts,
+                "result": result,
+                "error": error,
+                "completed_at": time.time()
+            }
+        }])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue": self.queue,
+            # Only the Redis backend carries tasks between cells
+            "backend": "redis" if self.work_queue.use_redis else "log",
+            "group": self.group,
+            "consumer": self.consumer,
+            "completed": self.completed,
+            "failed": self.failed,
+            "dead_lettered": self.dead_lettered
+        }
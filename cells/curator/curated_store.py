@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Curated Store - Hyper-Swarm Phase-1
+Bounded retention of curated records for the curator cell, with overflow
+to Memory and cursor-paginated listing.
+"""
+
+import bisect
+import heapq
+import itertools
+import string
+from typing import Any, Dict, List, Optional, Tuple
+
+
+ID_PREFIX = "cur_"
+SPILL_BATCH = 1000
+SEQ_DIGITS = 12
+
+
+def record_id(instance_id: str, seq: int) -> str:
+    """ID of the seq-th record curated by a curator instance"""
+    return f"{ID_PREFIX}{instance_id}_{seq}"
+
+
+def parse_record_id(record_id: str) -> Tuple[str, int]:
+    """
+    Instance and sequence number of a record ("cur_<instance>_42" -> (<instance>, 42))
+
+    Raises:
+        ValueError: if the ID is malformed
+    """
+    instance, _, seq = record_id[len(ID_PREFIX):].rpartition("_")
+    if (not record_id.startswith(ID_PREFIX) or not instance
+            or not all(c in string.hexdigits for c in instance) or not seq.isdigit()):
+        raise ValueError(f"Invalid curated id: {record_id}")
+    return instance, int(seq)
+
+
+class _KeyList:
+    """Ascending keys with O(1) amortized removal from the front"""
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._head = 0
+
+    def __len__(self) -> int:
+        return len(self._keys) - self._head
+
+    def append_many(self, keys: List[str]):
+        if len(self) and keys and keys[0] < self._keys[-1]:
+            # Keys of an instance with a skewed clock: keep the order
+            for key in keys:
+                bisect.insort(self._keys, key, lo=self._head)
+        else:
+            self._keys.extend(keys)
+
+    def pop_front(self, count: int) -> List[str]:
+        popped = self._keys[self._head:self._head + count]
+        self._head += len(popped)
+        if self._head > len(self._keys) // 2:
+            del self._keys[:self._head]
+            self._head = 0
+        return popped
+
+    def after(self, key: Optional[str], count: int) -> List[str]:
+        """Up to count keys greater than key"""
+        start = self._head if key is None else bisect.bisect_right(self._keys, key, lo=self._head)
+        return self._keys[start:start + count]
+
+
+class CuratedStore:
+    """
+    Curated records in curation order, newest `capacity` of them in memory.
+
+    Records are numbered per curator instance (see record_id), so
+    restarts and replicas sharing Memory never reuse a key. Older records
+    are spilled to Memory in batches under "<prefix><instance>:<seq>"
+    keys instead of being dropped. Instance IDs start with their creation
+    time and sequence numbers are zero-padded, so keys sort in curation
+    order across instances.
+
+    The spilled keys are the index of the overflow tier: load() reads
+    them back from Memory at startup, including those spilled by earlier
+    runs and other replicas, and the oldest are deleted once more than
+    overflow_capacity are held there, so both tiers stay bounded whatever
+    instance wrote them. Listings page through both tiers in key order
+    without scanning the Memory keyspace, and accept cursors issued by
+    any instance.
+
+    Records must be added in increasing sequence order.
+    """
+
+    def __init__(self, memory: Any, instance_id: str, capacity: int = 1000,
+                 overflow_capacity: int = 100000, prefix: str = "curated:"):
+        self.memory = memory
+        self.instance_id = instance_id
+        self.capacity = capacity
+        self.overflow_capacity = overflow_capacity
+        self.prefix = prefix
+        self._hot: Dict[str, Dict[str, Any]] = {}
+        self._hot_keys = _KeyList()
+        self._spilled_keys = _KeyList()
+        self.spill_failures = 0
+
+    def _key(self, record_id: str) -> str:
+        """Memory key of a record, ordered like the records"""
+        instance, seq = parse_record_id(record_id)
+        return f"{self.prefix}{instance}:{seq:0{SEQ_DIGITS}d}"
+
+    def record_id(self, seq: int) -> str:
+        return record_id(self.instance_id, seq)
+
+    def _is_key(self, key: str) -> bool:
+        instance, _, seq = key[len(self.prefix):].rpartition(":")
+        return (bool(instance) and all(c in string.hexdigits for c in instance)
+                and len(seq) == SEQ_DIGITS and seq.isdigit())
+
+    def __len__(self) -> int:
+        return len(self._hot_keys) + len(self._spilled_keys)
+
+    async def load(self) -> int:
+        """
+        Index the records spilled to Memory by any instance, e.g. after a restart
+
+        Returns:
+            Number of spilled records found
+        """
+        keys = sorted(key for key in await self.memory.list_ids(self.prefix) if self._is_key(key))
+        self._spilled_keys = _KeyList()
+        self._spilled_keys.append_many(keys)
+        await self._expire()
+        return len(self._spilled_keys)
+
+    async def _expire(self):
+        """Delete the oldest spilled records beyond overflow_capacity"""
+        expired = len(self._spilled_keys) - self.overflow_capacity
+        if expired > 0:
+            await self.memory.delete_many(self._spilled_keys.pop_front(expired))
+
+    async def add(self, records: List[Dict[str, Any]]):
+        """Append records, spilling the oldest beyond capacity to Memory"""
+        keys = [self._key(record["id"]) for record in records]
+        self._hot.update(zip(keys, records))
+        self._hot_keys.append_many(keys)
+
+        # Spill in chunks: values are encoded on the event loop
+        while len(self._hot_keys) > self.capacity:
+            # Spilled records stay listed from memory until Memory has them
+            spill = self._hot_keys.after(None, min(len(self._hot_keys) - self.capacity, SPILL_BATCH))
+            status = await self.memory.put_many({key: self._hot[key] for key in spill})
+            self._hot_keys.pop_front(len(spill))
+            for key in spill:
+                del self._hot[key]
+            stored = [key for key in spill if status.get(key)]
+            self.spill_failures += len(spill) - len(stored)
+            self._spilled_keys.append_many(stored)
+
+        await self._expire()
+
+    async def page(self, cursor: Optional[str] = None, limit: int = 100,
+                   min_score: Optional[float] = None, tag: Optional[str] = None,
+                   include_original: bool = True,
+                   scan_limit: int = 5000) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of records after cursor, oldest first.
+
+        Args:
+            cursor: ID of the last record already seen; None starts at the
+                oldest retained record
+            limit: Maximum records returned
+            min_score: Only records scoring at least this
+            tag: Only records carrying this tag
+            include_original: False leaves each record's "original" out
+            scan_limit: Maximum records examined for one page; a selective
+                filter can return a short page with a cursor to continue
+
+        Returns:
+            Tuple of (records, next cursor or None at the end)
+        """
+        after = self._key(cursor) if cursor else None
+        matches: List[Dict[str, Any]] = []
+        scanned = 0
+        last_key = after
+
+        def matching(record: Dict[str, Any]) -> bool:
+            return ((min_score is None or record["score"] >= min_score)
+                    and (tag is None or tag in record["tags"]))
+
+        while len(matches) < limit and scanned < scan_limit:
+            batch = min(limit - len(matches), scan_limit - scanned)
+            # Both tiers in key order: records spilled by another instance
+            # can sort after some of the ones still held here
+            keys = list(itertools.islice(heapq.merge(
+                self._spilled_keys.after(last_key, batch), self._hot_keys.after(last_key, batch)
+            ), batch))
+            if not keys:
+                break
+            found = await self.memory.get_many([key for key in keys if key not in self._hot])
+            records = [self._hot[key] if key in self._hot else found.get(key) for key in keys]
+
+            for key, record in zip(keys, records):
+                scanned += 1
+                last_key = key
+                if record is not None and matching(record):
+                    if not include_original:
+                        record = {k: v for k, v in record.items() if k != "original"}
+                    matches.append(record)
+                    if len(matches) == limit:
+                        break
+
+        more = bool(self._hot_keys.after(last_key, 1)) or bool(self._spilled_keys.after(last_key, 1))
+        next_cursor = self._cursor(last_key) if more and last_key is not None else None
+        return matches, next_cursor
+
+    def _cursor(self, key: str) -> str:
+        """Record ID for a Memory key, as a cursor"""
+        instance, _, seq = key[len(self.prefix):].rpartition(":")
+        return record_id(instance, int(seq))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_memory": len(self._hot_keys),
+            "spilled": len(self._spilled_keys),
+            "capacity": self.capacity,
+            "overflow_capacity": self.overflow_capacity,
+            "spill_failures": self.spill_failures
+        }
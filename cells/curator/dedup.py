@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Index - Hyper-Swarm Phase-1
+MinHash signatures and a banded LSH index for the curator cell.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from scoring import BatchFeatures, ScoringPipeline
+
+
+SHINGLE_SIZE = 5
+NUM_BINS = 64
+# 32-bit shingle hashes: the top 6 bits pick the bin, the other 26 are the
+# value, which keeps accidental equal bins around 1 in 67 million
+_BIN_SHIFT = np.uint32(32 - 6)
+_VALUE_MASK = np.uint32((1 << 26) - 1)
+_EMPTY = np.iinfo(np.uint32).max
+_PRIME = np.uint32(16777619)
+_DENSIFY_STEP = np.uint32(0x9E3779B9)
+_BAND_MULTIPLIERS = (np.arange(NUM_BINS, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+                     + np.uint64(0xD6E8FEB86659FD93)) | np.uint64(1)
+
+
+def _mix32(x: np.ndarray) -> np.ndarray:
+    """murmur3 finalizer, in place: spreads rolling hashes over all 32 bits"""
+    x ^= x >> np.uint32(16)
+    x *= np.uint32(0x85EBCA6B)
+    x ^= x >> np.uint32(13)
+    x *= np.uint32(0xC2B2AE35)
+    x ^= x >> np.uint32(16)
+    return x
+
+
+def minhash_signatures(features: BatchFeatures) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One-permutation MinHash signatures of every item in a batch.
+
+    Each lowercase 5-character shingle is hashed once; the top bits of the
+    hash choose one of 64 bins and each bin keeps its minimum. Empty bins of
+    short items are filled from the next non-empty bin (rotation
+    densification), so the fraction of equal bins between two signatures
+    estimates the Jaccard similarity of their shingle sets.
+
+    Returns:
+        Tuple of (uint32 signatures of shape (items, 64), mask of items that
+        are long enough to have a signature)
+    """
+    count = features.count
+    signatures = np.full((count, NUM_BINS), _EMPTY, dtype=np.uint32)
+    if not count:
+        return signatures, np.zeros(0, dtype=bool)
+
+    # Lowercase unless lowering would shift offsets
+    text = features.lowered if features.lowered is not None else features.text
+    codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+    positions = len(codepoints) - SHINGLE_SIZE + 1
+    if positions > 0:
+        hashes = codepoints[:positions].copy()
+        for j in range(1, SHINGLE_SIZE):
+            hashes *= _PRIME
+            hashes += codepoints[j:j + positions]
+        _mix32(hashes)
+
+        # Drop shingles that reach an item's trailing separator
+        inside = np.ones(positions, dtype=bool)
+        separators = features.offsets + features.length
+        for back in range(SHINGLE_SIZE):
+            starts = separators - back
+            inside[starts[(starts >= 0) & (starts < positions)]] = False
+        owners = np.repeat(np.arange(count, dtype=np.int64), features.length + 1)[:positions]
+        hashes, owners = hashes[inside], owners[inside]
+
+        slots = owners * NUM_BINS
+        slots += hashes >> _BIN_SHIFT
+        hashes &= _VALUE_MASK
+        np.minimum.at(signatures.reshape(-1), slots, hashes)
+
+    empty = signatures == _EMPTY
+    has_signature = ~empty.all(axis=1)
+
+    # Rotation densification: nearest non-empty bin to the right, wrapping
+    columns = np.arange(2 * NUM_BINS)
+    source = np.where(np.tile(~empty, 2), columns, 4 * NUM_BINS)
+    nearest = np.minimum.accumulate(source[:, ::-1], axis=1)[:, ::-1][:, :NUM_BINS]
+    distance = (nearest - np.arange(NUM_BINS)).astype(np.uint32)
+    rows = np.arange(count)[:, None]
+    filled = signatures[rows, nearest % NUM_BINS] + distance * _DENSIFY_STEP
+    signatures = np.where(empty & has_signature[:, None], filled, signatures)
+    return signatures, has_signature
+
+
+def score_and_sign(pipeline: ScoringPipeline, items: List[Any], query: Any = None) -> Dict[str, Any]:
+    """
+    Score a batch and compute its MinHash signatures in one pass.
+
+    This is the CPU-bound half of curation and runs in a worker process;
+    it returns only arrays, which are cheap to send back.
+    """
+    scored = pipeline.score(items, query)
+    signatures, has_signature = minhash_signatures(scored.pop("features"))
+    return {**scored, "signatures": signatures, "has_signature": has_signature}
+
+
+def lsh_layout(threshold: float) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) for a similarity threshold.
+
+    Pairs with similarity s become candidates with probability
+    1 - (1 - s^rows)^bands, which rises steeply around (1/bands)^(1/rows);
+    the most selective layout whose knee is still at or below the
+    threshold keeps false negatives rare without flooding candidates.
+    """
+    layouts = [(NUM_BINS // rows, rows) for rows in (1, 2, 4, 8, 16, 32)]
+    best = layouts[0]
+    for bands, rows in layouts:
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    Banded LSH index over the MinHash signatures of recent curated items.
+
+    Each signature is cut into bands and every band is hashed into its own
+    table, so a lookup touches only the entries that share a band with the
+    query: sublinear in the corpus. Candidates are confirmed by comparing
+    full signatures against the threshold. The index holds at most
+    `capacity` entries in fixed arrays and forgets the oldest first.
+    """
+
+    def __init__(self, capacity: int = 10000, threshold: float = 0.8):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._signatures = np.zeros((capacity, NUM_BINS), dtype=np.uint32)
+        self._labels: List[Optional[str]] = [None] * capacity
+        self._added = 0
+        self._configure(threshold)
+
+    def _configure(self, threshold: float):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.bands, self.rows = lsh_layout(threshold)
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._band_keys = np.zeros((self.capacity, self.bands), dtype=np.uint64)
+
+    def set_threshold(self, threshold: float):
+        """Change the threshold, rebuilding the band tables for the new layout"""
+        with self._lock:
+            self._configure(threshold)
+            live = [slot for slot, label in enumerate(self._labels) if label is not None]
+            if live:
+                self._band_keys[live] = self._keys(self._signatures[live])
+                for slot in live:
+                    self._insert_bands(slot)
+
+    def _keys(self, signatures: np.ndarray) -> np.ndarray:
+        bands = signatures.reshape(len(signatures), self.bands, self.rows)
+        return (bands.astype(np.uint64) * _BAND_MULTIPLIERS[:self.rows]).sum(axis=2, dtype=np.uint64)
+
+    def _insert_bands(self, slot: int):
+        for table, key in zip(self._tables, self._band_keys[slot].tolist()):
+            table.setdefault(key, []).append(slot)
+
+    def _evict(self, slot: int):
+        for table, key in zip(self._tables, self._band_keys[slot].tolist()):
+            slots = table[key]
+            slots.remove(slot)
+            if not slots:
+                del table[key]
+        self._labels[slot] = None
+
+    def _verify(self, items: np.ndarray, references: np.ndarray, signatures: np.ndarray,
+                reference_signatures: np.ndarray) -> Dict[int, Tuple[int, float]]:
+        """Best reference at or above the threshold for each candidate item"""
+        if not len(items):
+            return {}
+        similarity = (signatures[items] == reference_signatures).mean(axis=1)
+        keep = similarity >= self.threshold
+        items, references, similarity = items[keep], references[keep], similarity[keep]
+        order = np.lexsort((-similarity, items))
+        items, references, similarity = items[order], references[order], similarity[order]
+        first = np.ones(len(items), dtype=bool)
+        first[1:] = items[1:] != items[:-1]
+        return dict(zip(items[first].tolist(),
+                        zip(references[first].tolist(), similarity[first].round(4).tolist())))
+
+    def _index_candidates(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(item, slot) pairs sharing at least one band with an indexed entry"""
+        items: List[int] = []
+        slots: List[int] = []
+        for band, table in enumerate(self._tables):
+            for item, found in enumerate(map(table.get, keys[:, band].tolist())):
+                if found:
+                    items.extend([item] * len(found))
+                    slots.extend(found)
+        return np.array(items, dtype=np.int64), np.array(slots, dtype=np.int64)
+
+    def _batch_candidates(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(item, earlier item) pairs within a batch sharing a band"""
+        count = len(keys)
+        pairs = []
+        for band in range(self.bands):
+            order = np.argsort(keys[:, band], kind="stable")
+            column = keys[order, band]
+            run_start = np.ones(count, dtype=bool)
+            run_start[1:] = column[1:] != column[:-1]
+            # Pair each item with the earliest item of its run
+            first = order[np.maximum.accumulate(np.where(run_start, np.arange(count), 0))]
+            pairs.append(order[~run_start] * count + first[~run_start])
+        pairs = np.unique(np.concatenate(pairs)) if pairs else np.zeros(0, dtype=np.int64)
+        return pairs // count, pairs % count
+
+    def _add_many(self, labels: List[str], signatures: np.ndarray, keys: np.ndarray):
+        """Store new entries in the next ring slots, evicting what they replace"""
+        # Only the last `capacity` entries of an oversized batch survive
+        skip = max(len(labels) - self.capacity, 0)
+        start = self._added + skip
+        slots = (start + np.arange(len(labels) - skip)) % self.capacity
+        for slot in slots.tolist():
+            if self._labels[slot] is not None:
+                self._evict(slot)
+
+        self._signatures[slots] = signatures[skip:]
+        self._band_keys[slots] = keys[skip:]
+        slot_list = slots.tolist()
+        for slot, label in zip(slot_list, labels[skip:]):
+            self._labels[slot] = label
+        for table, column in zip(self._tables, keys[skip:].T.tolist()):
+            for key, slot in zip(column, slot_list):
+                table.setdefault(key, []).append(slot)
+        self._added += len(labels)
+
+    def check_and_add(self, labels: List[str], signatures: np.ndarray) -> List[Optional[Tuple[str, float]]]:
+        """
+        Match a batch against the index and earlier items of the same batch.
+
+        Candidate pairs for the whole batch are found through the band
+        tables and confirmed in one vectorized comparison. Items without a
+        near-duplicate are then added under their label; items with one are
+        not, so the index holds one representative per cluster.
+
+        Returns:
+            Per item, None or (label of its representative, estimated similarity)
+        """
+        count = len(labels)
+        if not count:
+            return []
+        with self._lock:
+            keys = self._keys(signatures)
+            items, slots = self._index_candidates(keys)
+            indexed = self._verify(items, slots, signatures, self._signatures[slots])
+            indexed_labels = {slot: self._labels[slot] for slot, _ in indexed.values()}
+            items, earlier = self._batch_candidates(keys)
+            in_batch = self._verify(items, earlier, signatures, signatures[earlier])
+
+            matches: List[Optional[Tuple[str, float]]] = []
+            representatives: List[str] = []
+            new_items: List[int] = []
+            for item in range(count):
+                if item in indexed:
+                    slot, similarity = indexed[item]
+                    match = (indexed_labels[slot], similarity)
+                elif item in in_batch:
+                    other, similarity = in_batch[item]
+                    match = (representatives[other], similarity)
+                else:
+                    match = None
+                    new_items.append(item)
+                matches.append(match)
+                representatives.append(match[0] if match else labels[item])
+
+            if new_items:
+                self._add_many([labels[item] for item in new_items],
+                               signatures[new_items], keys[new_items])
+        return matches
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": min(self._added, self.capacity),
+            "capacity": self.capacity,
+            "threshold": self.threshold,
+            "bands": self.bands,
+            "rows": self.rows
+        }
@@ -5,22 +5,83 @@ Content curation and filtering role for the swarm system.
 """
 
 import os
+import sys
+import time
 import asyncio
-from typing import Dict, Any, List
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+import secrets
+import itertools
+from typing import Dict, Any, List, Optional, Tuple
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
 import uvicorn
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Add parent directory to path to import common modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from common.async_memory import AsyncMemory
+from common.executor import CellExecutor, ClientDisconnected, ExecutorSaturated
+from common.workqueue import WorkQueue, QueueWorker
+
+from curated_store import CuratedStore
+from dedup import NearDuplicateIndex, score_and_sign
+from scoring import ScoringPipeline
+
 app = FastAPI(title="Curator Cell", version="0.1.0")
 
 # Global state for the curator
 curator_state = {
     "status": "active",
-    "curated_items": [],
     "filter_rules": ["quality", "relevance", "safety"],
-    "processed_count": 0
+    "score_threshold": 30,
+    # "reject" drops near-duplicates of curated items, "cluster" keeps them
+    # tagged with the id of the item they duplicate
+    "dedup": {"mode": "reject", "threshold": 0.8},
+    "processed_count": 0,
+    "duplicate_count": 0
 }
 
+DEDUP_MODES = ("reject", "cluster")
+
+scoring_pipeline = ScoringPipeline(curator_state["filter_rules"], curator_state["score_threshold"])
+duplicate_index = NearDuplicateIndex(
+    capacity=int(os.getenv("CURATOR_DEDUP_CAPACITY", 10000)),
+    threshold=curator_state["dedup"]["threshold"]
+)
+# Distinguishes this process's record IDs (and spill keys) from those of
+# earlier runs and other replicas sharing Memory
+instance_id = f"{int(time.time() * 1000):x}{secrets.token_hex(2)}"
+curated_ids = itertools.count(1)
+# Curated records: the newest in memory, older ones spilled to Memory
+memory = AsyncMemory(cache_size=0, json_path="./data/curator_memory.json")
+curated_store = CuratedStore(
+    memory,
+    instance_id,
+    capacity=int(os.getenv("CURATOR_RETENTION_CAPACITY", 1000)),
+    overflow_capacity=int(os.getenv("CURATOR_OVERFLOW_CAPACITY", 100000))
+)
+# Keeps record ids in the order records reach the store
+curation_lock = asyncio.Lock()
+# Scoring and signatures run in worker processes, off the event loop
+executor = CellExecutor(
+    workers=int(os.getenv("CURATOR_WORKERS", 2)),
+    max_queue=int(os.getenv("CURATOR_MAX_QUEUE", 8)),
+    name="curator"
+)
+
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated(request: Request, exc: ExecutorSaturated):
+    return JSONResponse({"detail": str(exc)}, status_code=429,
+                        headers={"Retry-After": str(exc.retry_after)})
+
+@app.exception_handler(ClientDisconnected)
+async def client_disconnected(request: Request, exc: ClientDisconnected):
+    # Nobody is listening; 499 only shows up in logs
+    return Response(status_code=499)
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -34,69 +95,205 @@ async def health():
 @app.get("/status")
 async def get_status():
     """Get current curator status"""
-    return curator_state
+    return {
+        **curator_state,
+        "curated_store": curated_store.stats(),
+        "dedup_index": duplicate_index.stats(),
+        "executor": executor.stats(),
+        "work_queue": queue_worker.stats()
+    }
+
+def build_curated(scored: Dict[str, Any], index: NearDuplicateIndex, content_items: List[Any],
+                  mode: str, timestamp: float) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Build the curated records for the accepted items of a scored batch.
+
+    Accepted items are matched against the near-duplicate index; in
+    "reject" mode duplicates are left out of the curated records.
+
+    Returns:
+        Tuple of (curated records, near-duplicates found)
+    """
+    accepted = scored["accepted"]
+    signatures, has_signature = scored["signatures"], scored["has_signature"]
+    rules = list(scored["rules"])
+    rule_columns = [scored["rules"][rule][accepted].tolist() for rule in rules]
+    rule_rows = zip(*rule_columns) if rules else [()] * int(accepted.sum())
+
+    positions = accepted.nonzero()[0]
+    record_ids = [curated_store.record_id(next(curated_ids)) for _ in range(len(positions))]
+    # Items too short to shingle are never treated as duplicates
+    hashed = has_signature[positions]
+    matches: List[Optional[Tuple[str, float]]] = [None] * len(positions)
+    hashed_rows = hashed.nonzero()[0].tolist()
+    found = index.check_and_add([record_ids[row] for row in hashed_rows],
+                                signatures[positions[hashed]])
+    for row, match in zip(hashed_rows, found):
+        matches[row] = match
+
+    curated_results = []
+    duplicates = []
+    for item_index, record_id, score, rule_scores, match in zip(
+            positions.tolist(), record_ids, scored["score"][accepted].tolist(), rule_rows, matches):
+        if match is not None:
+            duplicates.append({
+                "index": item_index,
+                "duplicate_of": match[0],
+                "similarity": match[1],
+                "score": score
+            })
+            if mode == "reject":
+                continue
+        curated_results.append({
+            "id": record_id,
+            "original": content_items[item_index],
+            "score": score,
+            "scores": dict(zip(rules, rule_scores)),
+            "tags": ["curated", "approved", "near_duplicate"] if match else ["curated", "approved"],
+            "cluster_id": match[0] if match else record_id,
+            "curator_id": "curator-cell",
+            "timestamp": timestamp
+        })
+    return curated_results, duplicates
+
+def json_response(payload: Dict[str, Any]) -> Response:
+    """JSON response, serialized with orjson when installed (large batches)"""
+    if orjson is not None:
+        return Response(orjson.dumps(payload), media_type="application/json")
+    return JSONResponse(payload)
+
+async def curate_batch(content_items: List[Any], query: Any,
+                       http_request: Optional[Request] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Score, deduplicate and store a batch; returns (curated records, near-duplicates)"""
+    scored = await executor.run(score_and_sign, scoring_pipeline, content_items, query,
+                                request=http_request)
+    async with curation_lock:
+        curated_results, duplicates = await asyncio.to_thread(
+            build_curated, scored, duplicate_index, content_items,
+            curator_state["dedup"]["mode"], asyncio.get_event_loop().time()
+        )
+        await curated_store.add(curated_results)
+    curator_state["processed_count"] += len(content_items)
+    curator_state["duplicate_count"] += len(duplicates)
+    return curated_results, duplicates
 
 @app.post("/curate")
-async def curate_content(request: Dict[str, Any]):
-    """Process and curate incoming content"""
-    content_items = request.get("items", [])
+async def curate_content(request: Dict[str, Any], http_request: Request):
+    """
+    Process and curate incoming content
     
-    curated_results = []
-    for item in content_items:
-        # Simulate curation logic
-        score = hash(str(item)) % 100  # Simple scoring
-        
-        if score > 30:  # Basic quality threshold
-            curated_item = {
-                "original": item,
-                "score": score,
-                "tags": ["curated", "approved"],
-                "curator_id": "curator-cell",
-                "timestamp": asyncio.get_event_loop().time()
-            }
-            curated_results.append(curated_item)
-            curator_state["curated_items"].append(curated_item)
+    Items are scored as one batch by the configured filter rules; an
+    optional "query" (string or list of terms) enables relevance scoring.
+    Accepted items that nearly duplicate already curated content are
+    rejected or clustered according to the dedup settings. Returns 429
+    with Retry-After while the scoring workers are saturated.
+    """
+    content_items = request.get("items", [])
+    if not isinstance(content_items, list):
+        raise HTTPException(status_code=400, detail="items must be a list")
     
-    curator_state["processed_count"] += len(content_items)
+    curated_results, duplicates = await curate_batch(content_items, request.get("query"), http_request)
     
-    return JSONResponse({
+    return json_response({
         "status": "curation_complete",
         "processed": len(content_items),
         "curated": len(curated_results),
+        "duplicates": duplicates,
         "results": curated_results
     })
 
-@app.get("/curated")
-async def get_curated_items():
-    """Get all curated items"""
+async def curate_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Work queue "curate" task: same payload as /curate, returns the counts"""
+    content_items = payload.get("items", [])
+    if not isinstance(content_items, list):
+        raise ValueError("items must be a list")
+    curated_results, duplicates = await curate_batch(content_items, payload.get("query"))
     return {
-        "items": curator_state["curated_items"],
-        "total_count": len(curator_state["curated_items"])
+        "processed": len(content_items),
+        "curated": len(curated_results),
+        "duplicates": len(duplicates),
+        "ids": [record["id"] for record in curated_results]
     }
 
+# Curation tasks dispatched by the planner
+work_queue = WorkQueue.from_env("curator")
+queue_worker = QueueWorker(work_queue, "curator", "curator", {"curate": curate_task},
+                           batch_size=int(os.getenv("WORKQUEUE_BATCH", 16)))
+
+@app.get("/curated")
+async def get_curated_items(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    min_score: Optional[float] = None,
+    tag: Optional[str] = None,
+    include_original: bool = True
+):
+    """
+    Page through curated items, oldest first
+
+    Pass the returned next_cursor to continue; it is null on the last
+    page. include_original=false leaves out each item's original payload.
+    """
+    try:
+        items, next_cursor = await curated_store.page(cursor, limit, min_score, tag, include_original)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response({
+        "items": items,
+        "next_cursor": next_cursor,
+        "total_count": len(curated_store)
+    })
+
 @app.put("/filters")
 async def update_filters(filters: List[str]):
     """Update curation filter rules"""
+    global scoring_pipeline
+    try:
+        scoring_pipeline = ScoringPipeline(filters, curator_state["score_threshold"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     curator_state["filter_rules"] = filters
     return {"status": "filters_updated", "filters": filters}
 
+@app.put("/dedup")
+async def update_dedup(settings: Dict[str, Any]):
+    """Update near-duplicate detection: "threshold" (0-1] and/or "mode" """
+    dedup = dict(curator_state["dedup"])
+    dedup.update({key: settings[key] for key in ("threshold", "mode") if key in settings})
+    if dedup["mode"] not in DEDUP_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(DEDUP_MODES)}")
+    if not isinstance(dedup["threshold"], (int, float)) or not 0 < dedup["threshold"] <= 1:
+        raise HTTPException(status_code=400, detail="threshold must be a number in (0, 1]")
+
+    if dedup["threshold"] != duplicate_index.threshold:
+        await asyncio.to_thread(duplicate_index.set_threshold, float(dedup["threshold"]))
+    curator_state["dedup"] = dedup
+    return {"status": "dedup_updated", "dedup": dedup, "index": duplicate_index.stats()}
+
 async def curator_loop():
     """Main async loop for curator operations"""
     while True:
         print(f"[Curator] Processing... {curator_state['processed_count']} items processed")
-        
-        # Simulate periodic cleanup of old curated items
-        if len(curator_state["curated_items"]) > 1000:
-            curator_state["curated_items"] = curator_state["curated_items"][-500:]
-            print("[Curator] Cleaned up old curated items")
-        
         await asyncio.sleep(7)
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize curator on startup"""
     print("[Curator] Starting curator cell...")
+    await memory.connect()
+    spilled = await curated_store.load()
+    print(f"[Curator] Indexed {spilled} curated records spilled to Memory")
+    executor.start()
+    await work_queue.connect()
     asyncio.create_task(curator_loop())
+    asyncio.create_task(queue_worker.run())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the scoring workers and release memory and queue connections"""
+    executor.shutdown()
+    await memory.close()
+    await work_queue.close()
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
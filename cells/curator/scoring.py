@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Scoring Engine - Hyper-Swarm Phase-1
+Batch scoring of content items for the curator cell.
+
+Items are flattened to text once, the whole batch is joined into a single
+code point array, and every feature is computed for all items at once with
+NumPy segment reductions. Nothing depends on Python's per-process hash
+seed, so the same item always gets the same score.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+# Character classes for code points below 128; anything above is a letter
+_LETTER, _DIGIT, _UPPER, _CONTROL, _SPACE = 1, 2, 4, 8, 16
+_ASCII_CLASSES = np.zeros(128, dtype=np.uint8)
+for _cp in range(128):
+    _ch = chr(_cp)
+    if _ch.isalpha():
+        _ASCII_CLASSES[_cp] |= _LETTER
+    if _ch.isupper():
+        _ASCII_CLASSES[_cp] |= _UPPER
+    if _ch.isdigit():
+        _ASCII_CLASSES[_cp] |= _DIGIT
+    if _ch.isspace():
+        _ASCII_CLASSES[_cp] |= _SPACE
+    elif _cp < 32 or _cp == 127:
+        _ASCII_CLASSES[_cp] |= _CONTROL
+
+# Lowercase patterns that make an item unsafe to pass on: leaked
+# credentials and injected markup or commands. Each starts with a literal so
+# the regex engine can scan for it instead of trying every position.
+DEFAULT_UNSAFE_PATTERNS = (
+    r"-----begin [a-z ]*private key-----",
+    r"api[_-]?key\s*[:=]\s*\S",
+    r"secret\s*[:=]\s*\S",
+    r"password\s*[:=]\s*\S",
+    r"token\s*[:=]\s*\S",
+    r"<\s*script\b",
+    r"javascript:",
+    r"drop\s+table\b",
+    r"rm\s+-rf\s+/",
+)
+
+TEXT_FIELDS = ("text", "content", "body", "summary")
+SEPARATOR = "\n"
+
+
+def item_text(item: Any) -> str:
+    """Text to score for an item: a string, a known text field, or canonical JSON"""
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict):
+        for field in TEXT_FIELDS:
+            value = item.get(field)
+            if isinstance(value, str):
+                return value
+    return json.dumps(item, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class BatchFeatures:
+    """
+    Per-item text features of a batch, as parallel NumPy arrays.
+
+    Attributes (one entry per item):
+        length: Characters
+        words: Runs of letters/digits
+        letters: Letter characters
+        uppercase: Uppercase ASCII letters
+        control: Control characters other than whitespace
+        repeats: Characters equal to the one before them (spaces excluded)
+    """
+
+    def __init__(self, items: List[Any]):
+        self.count = len(items)
+        texts = [item_text(item) for item in items]
+        self.text = SEPARATOR.join(texts) + SEPARATOR
+        # Case-insensitive matching runs on a lowered copy when lowering keeps
+        # every offset; otherwise it falls back to re.IGNORECASE
+        lowered = self.text.lower()
+        self.lowered = lowered if len(lowered) == len(self.text) else None
+        self.length = np.fromiter((len(t) for t in texts), dtype=np.int64, count=self.count)
+        # Each segment is an item's text plus its trailing separator
+        self.offsets = np.zeros(self.count, dtype=np.int64)
+        if self.count:
+            np.cumsum(self.length[:-1] + 1, out=self.offsets[1:])
+
+        codepoints = np.frombuffer(self.text.encode("utf-32-le"), dtype=np.uint32)
+        classes = np.where(codepoints < 128, _ASCII_CLASSES[np.minimum(codepoints, 127)], _LETTER)
+
+        word = (classes & (_LETTER | _DIGIT)) != 0
+        word_start = word.copy()
+        word_start[1:] &= ~word[:-1]
+        repeat = np.zeros(len(codepoints), dtype=bool)
+        repeat[1:] = (codepoints[1:] == codepoints[:-1]) & ((classes[1:] & _SPACE) == 0)
+
+        self.word = word
+        self.words = self._per_item(word_start)
+        self.letters = self._per_item((classes & _LETTER) != 0)
+        self.uppercase = self._per_item((classes & _UPPER) != 0)
+        self.control = self._per_item((classes & _CONTROL) != 0)
+        self.repeats = self._per_item(repeat)
+
+    def _per_item(self, mask: np.ndarray) -> np.ndarray:
+        if not self.count:
+            return np.zeros(0, dtype=np.int64)
+        return np.add.reduceat(mask, self.offsets, dtype=np.int64)
+
+    def find(self, pattern: str) -> np.ndarray:
+        """Start offsets of case-insensitive matches of a lowercase pattern"""
+        if self.lowered is not None:
+            matches = re.finditer(pattern, self.lowered)
+        else:
+            matches = re.finditer(pattern, self.text, re.IGNORECASE)
+        return np.fromiter((m.start() for m in matches), dtype=np.int64)
+
+    def find_literal(self, literal: str) -> np.ndarray:
+        """Start offsets of case-insensitive occurrences of a lowercase literal"""
+        if self.lowered is None:
+            return self.find(re.escape(literal))
+        # Splitting and measuring the pieces stays in C, unlike one
+        # Match object per occurrence
+        pieces = np.fromiter(map(len, self.lowered.split(literal)), dtype=np.int64)
+        return np.cumsum(pieces[:-1]) + len(literal) * np.arange(len(pieces) - 1)
+
+    def find_word(self, word: str) -> np.ndarray:
+        """Start offsets of word where it is not part of a longer word"""
+        starts = self.find_literal(word)
+        ends = starts + len(word)
+        # The trailing separator guarantees ends < len(text)
+        before = np.zeros(len(starts), dtype=bool)
+        before[starts > 0] = self.word[starts[starts > 0] - 1]
+        return starts[~before & ~self.word[ends]]
+
+    def counts_at(self, starts: np.ndarray) -> np.ndarray:
+        """Number of the given text offsets falling in each item"""
+        owners = np.searchsorted(self.offsets, starts, side="right") - 1
+        return np.bincount(owners, minlength=self.count)[:self.count]
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return numerator / np.maximum(denominator, 1)
+
+
+def quality_score(features: BatchFeatures, context: Dict[str, Any]) -> np.ndarray:
+    """Rewards substantive text: enough words, mostly letters, little repetition"""
+    volume = np.minimum(np.log1p(features.words) / np.log1p(50), 1.0)
+    letter_ratio = _ratio(features.letters, features.length)
+    literacy = np.clip((letter_ratio - 0.2) / 0.5, 0.0, 1.0)
+    repetition = np.clip(_ratio(features.repeats, features.length) * 4, 0.0, 1.0)
+    return 100 * (0.5 * volume + 0.3 * literacy + 0.2 * (1 - repetition))
+
+
+def relevance_score(features: BatchFeatures, context: Dict[str, Any]) -> Optional[np.ndarray]:
+    """Share of the query terms present in each item; skipped without a query"""
+    terms = context.get("terms")
+    if not terms:
+        return None
+    present = np.zeros(features.count, dtype=np.int64)
+    for term in terms:
+        present += features.counts_at(features.find_word(term)) > 0
+    return 100 * present / len(terms)
+
+
+def safety_score(features: BatchFeatures, context: Dict[str, Any]) -> np.ndarray:
+    """Penalizes unsafe patterns, control characters and all-caps shouting"""
+    unsafe = np.zeros(features.count, dtype=bool)
+    for pattern in context["unsafe_patterns"]:
+        unsafe |= features.counts_at(features.find(pattern)) > 0
+    control = np.clip(_ratio(features.control, features.length) * 10, 0.0, 1.0)
+    shouting = np.clip((_ratio(features.uppercase, features.letters) - 0.5) * 2, 0.0, 1.0)
+    shouting[features.letters < 20] = 0.0
+    return np.clip(100 - 70 * unsafe - 40 * control - 20 * shouting, 0.0, 100.0)
+
+
+Scorer = Callable[[BatchFeatures, Dict[str, Any]], Optional[np.ndarray]]
+
+SCORERS: Dict[str, Scorer] = {
+    "quality": quality_score,
+    "relevance": relevance_score,
+    "safety": safety_score,
+}
+
+# A scorer below its gate rejects the item whatever the combined score
+DEFAULT_GATES = {"quality": 25.0, "safety": 50.0}
+
+
+def query_terms(query: Any) -> List[str]:
+    """Normalize a query given as a string or list of strings into terms"""
+    if not query:
+        return []
+    if isinstance(query, str):
+        query = query.split()
+    return sorted({str(term).lower() for term in query if str(term).strip()})
+
+
+class ScoringPipeline:
+    """
+    Runs a list of named scorers over a batch and combines them.
+
+    The combined score is the mean of the scorers that apply to the batch
+    (relevance only applies when there is a query). An item is accepted when
+    the combined score is above threshold and no scorer is below its gate.
+    """
+
+    def __init__(self, rules: Iterable[str], threshold: float = 30.0,
+                 gates: Optional[Dict[str, float]] = None,
+                 unsafe_patterns: Iterable[str] = DEFAULT_UNSAFE_PATTERNS):
+        self.rules = list(rules)
+        unknown = [rule for rule in self.rules if rule not in SCORERS]
+        if unknown:
+            raise ValueError(f"Unknown filter rules: {', '.join(unknown)}")
+        self.threshold = threshold
+        self.gates = DEFAULT_GATES if gates is None else gates
+        self.unsafe_patterns = [re.compile(pattern).pattern for pattern in unsafe_patterns]
+
+    def score(self, items: List[Any], query: Any = None) -> Dict[str, Any]:
+        """
+        Score a batch of items.
+
+        Returns:
+            Dict with "score" (combined, 0-100), "accepted" (bool mask),
+            "rules" mapping each applied rule to its per-item scores and the
+            batch "features" for further per-item analysis
+        """
+        features = BatchFeatures(items)
+        context = {"terms": query_terms(query), "unsafe_patterns": self.unsafe_patterns}
+
+        rule_scores = {}
+        for rule in self.rules:
+            scores = SCORERS[rule](features, context)
+            if scores is not None:
+                rule_scores[rule] = np.round(scores, 2)
+
+        if rule_scores:
+            combined = np.mean(np.vstack(list(rule_scores.values())), axis=0)
+        else:
+            combined = np.full(features.count, 100.0)
+        combined = np.round(combined, 2)
+
+        accepted = combined > self.threshold
+        for rule, gate in self.gates.items():
+            if rule in rule_scores:
+                accepted &= rule_scores[rule] >= gate
+
+        return {"score": combined, "accepted": accepted, "rules": rule_scores, "features": features}
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Plan History - Hyper-Swarm Phase-1
+Versioned plan history for the planner cell, stored in Memory as deltas
+between consecutive plans with periodic full snapshots.
+"""
+
+import asyncio
+import copy
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# A delta is a list of operations on JSON paths (dict keys and list indexes):
+#   ["set", path, value]    set or add the value at path ([] replaces all)
+#   ["del", path]           remove a dict key
+#   ["trunc", path, length] shorten a list
+Op = List[Any]
+
+
+def diff(old: Any, new: Any, path: Tuple = ()) -> List[Op]:
+    """Operations turning old into new; lists are compared index by index"""
+    if type(old) is not type(new):
+        return [["set", list(path), new]]
+    if isinstance(old, dict):
+        ops = [["del", list(path + (key,))] for key in old if key not in new]
+        for key, value in new.items():
+            if key in old:
+                ops.extend(diff(old[key], value, path + (key,)))
+            else:
+                ops.append(["set", list(path + (key,)), value])
+        return ops
+    if isinstance(old, list):
+        ops = []
+        for index in range(min(len(old), len(new))):
+            ops.extend(diff(old[index], new[index], path + (index,)))
+        if len(new) < len(old):
+            ops.append(["trunc", list(path), len(new)])
+        for index in range(len(old), len(new)):
+            ops.append(["set", list(path + (index,)), new[index]])
+        return ops
+    return [] if old == new else [["set", list(path), new]]
+
+
+def apply(doc: Any, ops: List[Op]) -> Any:
+    """Apply diff() operations to doc in place; returns the resulting document"""
+    for op in ops:
+        kind, path = op[0], op[1]
+        if kind == "set" and not path:
+            doc = copy.deepcopy(op[2])
+            continue
+        parent = doc
+        for key in path[:-1]:
+            parent = parent[key]
+        if kind == "set":
+            if isinstance(parent, list) and path[-1] == len(parent):
+                parent.append(copy.deepcopy(op[2]))
+            else:
+                parent[path[-1]] = copy.deepcopy(op[2])
+        elif kind == "del":
+            del parent[path[-1]]
+        elif kind == "trunc":
+            target = parent[path[-1]] if path else doc
+            del target[op[2]:]
+    return doc
+
+
+def _encoded_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+class PlanHistory:
+    """
+    Every plan the planner created, by version number and by plan_id.
+
+    Version records live in Memory. A record holds either a full snapshot
+    of its plan or the delta from the previous plan; a snapshot is written
+    every snapshot_interval versions, and whenever the delta would not be
+    smaller, so reading any version applies at most snapshot_interval - 1
+    deltas to a snapshot fetched in the same batch. Each record also
+    carries a summary of its plan, so listings need no reconstruction.
+
+    Keys use Memory's reserved prefix, so the records stay out of /memory
+    listings and cannot be overwritten through the /memory endpoints.
+
+    The newest plan is kept in-process as the base of the next delta.
+    """
+
+    def __init__(self, memory: Any, snapshot_interval: int = 16, prefix: str = "__plan_history:"):
+        self.memory = memory
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.prefix = prefix
+        self.latest = 0
+        self.cycle_count = 0
+        self._latest_plan: Optional[Dict[str, Any]] = None
+        self._snapshot_at = 0
+        self._lock = asyncio.Lock()
+        self.bytes_written_since_start = 0
+
+    def _version_key(self, version: int) -> str:
+        return f"{self.prefix}v:{version:012d}"
+
+    def _plan_key(self, plan_id: str) -> str:
+        return f"{self.prefix}plan:{plan_id}"
+
+    async def load(self):
+        """Resume from the history in Memory, e.g. after a restart"""
+        head = await self.memory.get(self.prefix + "head")
+        if not head:
+            return
+        self.latest = head["latest"]
+        self.cycle_count = head.get("cycle_count", 0)
+        record = await self.memory.get(self._version_key(self.latest))
+        self._snapshot_at = record["snapshot_at"] if record else 0
+        self._latest_plan = await self.get_version(self.latest)
+
+    async def record(self, plan: Dict[str, Any], cycle_count: int = 0) -> int:
+        """
+        Add a plan as the next version.
+
+        Returns:
+            The plan's version number
+        """
+        async with self._lock:
+            version = self.latest + 1
+            summary = {
+                "version": version,
+                "plan_id": plan.get("plan_id"),
+                "timestamp": plan.get("timestamp"),
+                "priority": plan.get("priority"),
+                "task_count": len(plan.get("tasks") or [])
+            }
+            record = {**summary, "snapshot_at": version, "snapshot": plan}
+            size = _encoded_size(plan)
+            if self._latest_plan is not None and version - self._snapshot_at < self.snapshot_interval:
+                delta = diff(self._latest_plan, plan)
+                if _encoded_size(delta) < size:
+                    record = {**summary, "snapshot_at": self._snapshot_at, "delta": delta}
+                    size = _encoded_size(delta)
+
+            status = await self.memory.put_many({
+                self._version_key(version): record,
+                self._plan_key(summary["plan_id"]): version,
+                self.prefix + "head": {"latest": version, "cycle_count": cycle_count}
+            })
+            if not all(status.values()):
+                raise RuntimeError(f"could not store plan version {version}")
+
+            self.latest = version
+            self.cycle_count = cycle_count
+            self._snapshot_at = record["snapshot_at"]
+            self._latest_plan = copy.deepcopy(plan)
+            self.bytes_written_since_start += size
+            return version
+
+    async def get_version(self, version: int) -> Optional[Dict[str, Any]]:
+        """The plan stored as version, or None"""
+        if not 1 <= version <= self.latest:
+            return None
+        if version == self.latest and self._latest_plan is not None:
+            return copy.deepcopy(self._latest_plan)
+        record = await self.memory.get(self._version_key(version))
+        if record is None:
+            return None
+        if "snapshot" in record:
+            return record["snapshot"]
+
+        keys = [self._version_key(v) for v in range(record["snapshot_at"], version)]
+        records = await self.memory.get_many(keys)
+        plan = None
+        for key in keys:
+            chained = records.get(key)
+            if chained is None:
+                return None  # Lost from Memory: the chain cannot be rebuilt
+            plan = chained["snapshot"] if "snapshot" in chained else apply(plan, chained["delta"])
+        return apply(plan, record["delta"])
+
+    async def version_of(self, plan_id: str) -> Optional[int]:
+        return await self.memory.get(self._plan_key(plan_id))
+
+    async def get(self, plan_id: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """(version, plan) of plan_id, or None"""
+        version = await self.version_of(plan_id)
+        if version is None:
+            return None
+        plan = await self.get_version(version)
+        return None if plan is None else (version, plan)
+
+    async def list_versions(self, start: int, limit: int,
+                            end: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Summaries of versions start..end (inclusive), oldest first.
+
+        Returns:
+            Tuple of (summaries, start of the next page or None)
+        """
+        end = self.latest if end is None else min(end, self.latest)
+        start = max(start, 1)
+        stop = min(end, start + limit - 1)
+        if stop < start:
+            return [], None
+        keys = [self._version_key(v) for v in range(start, stop + 1)]
+        records = await self.memory.get_many(keys)
+        summaries = []
+        for key in keys:
+            record = records.get(key)
+            if record is None:
+                continue
+            summaries.append({
+                "version": record["version"],
+                "plan_id": record["plan_id"],
+                "timestamp": record["timestamp"],
+                "priority": record["priority"],
+                "task_count": record["task_count"],
+                "stored_as": "snapshot" if "snapshot" in record else "delta"
+            })
+        return summaries, stop + 1 if stop < end else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "versions": self.latest,
+            "snapshot_interval": self.snapshot_interval,
+            "bytes_written_since_start": self.bytes_written_since_start
+        }
@@ -7,15 +7,21 @@ Planning and coordination role for the swarm system.
 import os
 import sys
 import asyncio
-from typing import Dict, Any
-from fastapi import FastAPI, HTTPException
+from typing import Dict, Any, List, Optional
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import uvicorn
 
 # Add parent directory to path to import common modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from common.memory import Memory
+from common.async_memory import AsyncMemory
+from common.codec import Codec
+from common.memory import RESERVED_PREFIX
+from common.workqueue import WorkQueue, QueueWorker
+
+from history import PlanHistory, diff
+from scheduler import PlanScheduler
 
 app = FastAPI(title="Planner Cell", version="0.1.0")
 
@@ -27,14 +33,55 @@ planner_state = {
     "connected_cells": []
 }
 
-# Initialize memory instance
-memory = Memory()
+# Initialize memory instance (connected on startup)
+memory_compression = os.getenv("MEMORY_COMPRESSION", "zlib").lower()
+memory = AsyncMemory(
+    index_namespaces=os.getenv("MEMORY_INDEX_NAMESPACES", "false").lower() == "true",
+    cache_size=int(os.getenv("MEMORY_CACHE_SIZE", "1024")),
+    cache_ttl=float(os.getenv("MEMORY_CACHE_TTL", "30")),
+    cache_invalidation=os.getenv("MEMORY_CACHE_INVALIDATION", "true").lower() == "true",
+    codec=Codec(
+        format=os.getenv("MEMORY_CODEC", "json"),
+        compression=None if memory_compression == "none" else memory_compression,
+        compress_threshold=int(os.getenv("MEMORY_COMPRESS_THRESHOLD", "4096"))
+    )
+)
+
+# Plan tasks for these cells are dispatched through their work queues
+WORKER_CELLS = ("curator", "archivist", "synthesizer")
+COMPLETIONS_QUEUE = "planner"
+
+def cell_limits() -> Dict[str, int]:
+    """Per-cell task concurrency from PLANNER_CELL_CONCURRENCY ("curator=4,archivist=8")"""
+    limits = {}
+    for entry in filter(None, os.getenv("PLANNER_CELL_CONCURRENCY", "").split(",")):
+        cell, _, limit = entry.partition("=")
+        limits[cell.strip()] = int(limit)
+    return limits
+
+work_queue = WorkQueue.from_env("planner")
+scheduler = PlanScheduler(
+    work_queue.enqueue,
+    WORKER_CELLS,
+    cell_limits(),
+    default_limit=int(os.getenv("PLANNER_DEFAULT_CONCURRENCY", 4)),
+    reply_to=COMPLETIONS_QUEUE,
+    max_plans=int(os.getenv("PLANNER_RECENT_PLANS", 100))
+)
+# Every plan created, as versions in Memory
+plan_history = PlanHistory(memory, snapshot_interval=int(os.getenv("PLANNER_HISTORY_SNAPSHOT_INTERVAL", 16)))
 
 # Pydantic models for memory API
 class MemoryRequest(BaseModel):
     id: str
     data: Any
 
+class MemoryBatchRequest(BaseModel):
+    items: List[MemoryRequest]
+
+class MemoryBatchGetRequest(BaseModel):
+    ids: List[str]
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -48,22 +95,58 @@ async def health():
 @app.get("/status")
 async def get_status():
     """Get current planner status"""
-    return planner_state
+    return {**planner_state, "memory_cache": memory.cache_stats(),
+            "scheduler": scheduler.stats(), "completions": completions.stats(),
+            "history": plan_history.stats()}
 
 @app.post("/plan")
 async def create_plan(request: Dict[str, Any]):
-    """Create a new plan for the swarm cycle"""
+    """
+    Create a new plan for the swarm cycle.
+
+    Tasks of the form {"cell", "action", "payload"} for a worker cell are
+    dispatched through that cell's work queue once every task listed in
+    their "depends_on" has completed, with independent tasks running in
+    parallel; see PlanGraph for the task format. Other tasks are recorded
+    only. Returns 400 if the dependencies do not form a DAG.
+    """
+    priority = request.get("priority", "normal")
+    try:
+        graph = scheduler.validate(request.get("tasks", []), priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Taken after validating, so rejected plans use no id, and before
+    # dispatching, so concurrent requests get their own id
+    planner_state["cycle_count"] += 1
+    plan_id = f"plan_{planner_state['cycle_count']}"
+    run = await scheduler.submit(plan_id, graph, priority)
     plan_data = {
-        "plan_id": f"plan_{planner_state['cycle_count'] + 1}",
+        "plan_id": plan_id,
         "timestamp": asyncio.get_event_loop().time(),
         "tasks": request.get("tasks", []),
-        "priority": request.get("priority", "normal")
+        "priority": run.priority
     }
     
     planner_state["last_plan"] = plan_data
-    planner_state["cycle_count"] += 1
+    try:
+        version = await plan_history.record(plan_data, planner_state["cycle_count"])
+    except Exception as e:
+        # The plan is already dispatched; it is only missing from the history
+        print(f"[Planner] Could not record {plan_id} in the plan history: {e}")
+        version = None
     
-    return JSONResponse({"status": "plan_created", "plan": plan_data})
+    return JSONResponse({"status": "plan_created", "plan": plan_view(plan_data), "version": version})
+
+def plan_view(plan_data: Dict[str, Any]) -> Dict[str, Any]:
+    """A plan with the progress of its tasks, while the scheduler still has it"""
+    run = scheduler.get(plan_data["plan_id"])
+    if run is None:
+        return plan_data
+    return {**plan_data, "progress": run.progress(), "dispatch": run.tasks()}
+
+completions = QueueWorker(work_queue, COMPLETIONS_QUEUE, "planner",
+                          {"task_completed": scheduler.task_completed},
+                          batch_size=int(os.getenv("WORKQUEUE_BATCH", 16)))
 
 @app.get("/current-plan")
 async def get_current_plan():
@@ -71,37 +154,125 @@ async def get_current_plan():
     if planner_state["last_plan"] is None:
         raise HTTPException(status_code=404, detail="No active plan")
     
-    return planner_state["last_plan"]
+    return plan_view(planner_state["last_plan"])
+
+@app.get("/plans")
+async def list_plans(start: int = Query(1, ge=1), end: Optional[int] = Query(None, ge=1),
+                     limit: int = Query(100, ge=1, le=1000)):
+    """
+    List plan versions start..end, oldest first
+
+    Pass the returned next_start as start to continue; it is null on the
+    last page.
+    """
+    plans, next_start = await plan_history.list_versions(start, limit, end)
+    return {"plans": plans, "next_start": next_start, "latest": plan_history.latest}
+
+async def history_or_404(plan_id: str):
+    found = await plan_history.get(plan_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"No plan found for ID: {plan_id}")
+    return found
+
+@app.get("/plans/{plan_id}")
+async def get_plan(plan_id: str):
+    """Get any plan from the history by its ID"""
+    version, plan = await history_or_404(plan_id)
+    return {"version": version, "plan": plan_view(plan)}
+
+@app.get("/plans/{plan_id}/diff")
+async def diff_plans(plan_id: str, against: Optional[str] = None):
+    """
+    Changes from plan "against" (default: the previous version) to plan_id
+
+    Returns the operations of a delta: ["set", path, value], ["del", path]
+    and ["trunc", path, length], with paths as lists of keys and indexes.
+    """
+    version, plan = await history_or_404(plan_id)
+    if against is not None:
+        base_version, base = await history_or_404(against)
+    else:
+        base_version = version - 1
+        base = await plan_history.get_version(base_version)
+        if base is None:
+            raise HTTPException(status_code=404, detail=f"No version before {plan_id}")
+    return {
+        "from": {"version": base_version, "plan_id": base.get("plan_id")},
+        "to": {"version": version, "plan_id": plan_id},
+        "ops": diff(base, plan)
+    }
 
 # Memory API endpoints
 @app.post("/memory")
 async def store_memory(request: MemoryRequest):
     """Store data in memory with given ID"""
-    success = memory.put(request.id, request.data)
+    if request.id.startswith(RESERVED_PREFIX):
+        raise HTTPException(status_code=400, detail=f"IDs starting with {RESERVED_PREFIX} are reserved")
+    success = await memory.put(request.id, request.data)
     if success:
         return JSONResponse({"status": "stored", "id": request.id})
     else:
         raise HTTPException(status_code=500, detail="Failed to store data")
 
+@app.post("/memory/batch")
+async def store_memory_batch(request: MemoryBatchRequest):
+    """Store multiple entries in memory with a single call"""
+    reserved = [item.id for item in request.items if item.id.startswith(RESERVED_PREFIX)]
+    if reserved:
+        raise HTTPException(status_code=400, detail=f"Reserved IDs: {reserved}")
+    status = await memory.put_many({item.id: item.data for item in request.items})
+    results = [
+        {"id": id, "status": "stored" if stored else "error"}
+        for id, stored in status.items()
+    ]
+    stored_count = sum(1 for stored in status.values() if stored)
+    
+    return JSONResponse({
+        "status": "batch_stored" if stored_count == len(status) else "batch_partial",
+        "stored": stored_count,
+        "failed": len(status) - stored_count,
+        "results": results
+    })
+
+@app.post("/memory/batch-get")
+async def get_memory_batch(request: MemoryBatchGetRequest):
+    """Retrieve multiple entries from memory with a single call"""
+    found = await memory.get_many(request.ids)
+    results = []
+    for id, data in found.items():
+        if data is None:
+            results.append({"id": id, "status": "not_found"})
+        else:
+            results.append({"id": id, "status": "found", "data": data})
+    
+    return {
+        "results": results,
+        "found": sum(1 for data in found.values() if data is not None),
+        "missing": sum(1 for data in found.values() if data is None)
+    }
+
 @app.get("/memory/{id}")
 async def get_memory(id: str):
     """Retrieve data from memory by ID"""
-    data = memory.get(id)
+    data = await memory.get(id)
     if data is None:
         raise HTTPException(status_code=404, detail=f"No data found for ID: {id}")
     
     return {"id": id, "data": data}
 
 @app.get("/memory")
-async def list_memory_ids():
-    """List all memory IDs"""
-    ids = memory.list_ids()
-    return {"ids": ids}
+async def list_memory_ids(prefix: str = "", cursor: Optional[str] = None,
+                          limit: int = Query(1000, ge=1, le=10000)):
+    """List memory IDs one page at a time; pass next_cursor to continue"""
+    ids, next_cursor = await memory.list_ids_page(prefix, cursor, limit)
+    return {"ids": ids, "next_cursor": next_cursor}
 
 async def planner_loop():
     """Main async loop for planner operations"""
     while True:
-        print(f"[Planner] Cycle {planner_state['cycle_count']} - Planning...")
+        stats = scheduler.stats()
+        print(f"[Planner] Cycle {planner_state['cycle_count']} - Planning... "
+              f"{stats['running_plans']} plans running, tasks in flight: {stats['in_flight']}")
         
         # Simulate planning work
         await asyncio.sleep(5)
@@ -113,7 +284,22 @@ async def planner_loop():
 async def startup_event():
     """Initialize planner on startup"""
     print("[Planner] Starting planner cell...")
+    await memory.connect()
+    await work_queue.connect()
+    await plan_history.load()
+    if plan_history.latest:
+        # Continue numbering after the plans of earlier runs
+        planner_state["cycle_count"] = max(planner_state["cycle_count"], plan_history.cycle_count)
+        planner_state["last_plan"] = await plan_history.get_version(plan_history.latest)
+        print(f"[Planner] Resumed plan history at version {plan_history.latest}")
     asyncio.create_task(planner_loop())
+    asyncio.create_task(completions.run())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release memory and queue connections on shutdown"""
+    await memory.close()
+    await work_queue.close()
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
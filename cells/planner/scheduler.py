@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Plan Scheduler - Hyper-Swarm Phase-1
+Dependency-aware dispatch of plan tasks to the worker cells.
+"""
+
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+PRIORITIES = {"low": 0, "normal": 1, "high": 2, "critical": 3}
+
+# Status of a task: waiting for dependencies, ready for a slot of its cell,
+# queued on the cell's work queue, or finished one way or another
+WAITING, READY, QUEUED = "waiting", "ready", "queued"
+COMPLETED, FAILED, SKIPPED, RECORDED = "completed", "failed", "skipped", "recorded"
+
+
+class TaskNode:
+    """A plan task and its scheduling state"""
+
+    __slots__ = ("id", "cell", "action", "payload", "depends_on", "dependents", "slots",
+                 "duration", "rank", "pending_deps", "status", "dispatched_at", "finished_at",
+                 "attempts", "result", "error")
+
+    def __init__(self, id: str, cell: Optional[str], action: Optional[str], payload: Any,
+                 depends_on: List[str], slots: int, duration: float):
+        self.id = id
+        self.cell = cell
+        self.action = action
+        self.payload = payload
+        self.depends_on = depends_on
+        self.dependents: List[str] = []
+        self.slots = slots
+        self.duration = duration
+        # Estimated duration of the longest chain starting at this task
+        self.rank = duration
+        self.pending_deps = len(depends_on)
+        self.status = WAITING
+        self.dispatched_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.attempts = 0
+        self.result: Any = None
+        self.error: Optional[str] = None
+
+    def view(self) -> Dict[str, Any]:
+        view = {"cell": self.cell, "action": self.action, "status": self.status,
+                "depends_on": self.depends_on}
+        if self.dispatched_at is not None:
+            view["dispatched_at"] = self.dispatched_at
+        if self.status in (COMPLETED, FAILED):
+            view.update(attempts=self.attempts, result=self.result, error=self.error,
+                        completed_at=self.finished_at)
+        elif self.error is not None:
+            view["error"] = self.error
+        return view
+
+
+class PlanGraph:
+    """
+    The tasks of a plan as a dependency DAG.
+
+    A task is a dict with an optional "id" (default: its index),
+    "depends_on" (list of task ids), "cell", "action", "payload" and
+    "resources" hints: "slots" of its cell's concurrency it occupies
+    (default 1) and estimated "duration" in seconds (default 1). Tasks
+    that do not name a dispatchable cell and action, including plain
+    strings, are recorded only and count as done at once.
+
+    Raises:
+        ValueError: for duplicate ids, unknown dependencies or a cycle
+    """
+
+    def __init__(self, tasks: List[Any], cells: Tuple[str, ...], cell_limit: Callable[[str], int]):
+        if not isinstance(tasks, list):
+            raise ValueError("tasks must be a list")
+        self.nodes: Dict[str, TaskNode] = {}
+        for index, task in enumerate(tasks):
+            node = self._node(index, task, cells, cell_limit)
+            if node.id in self.nodes:
+                raise ValueError(f"duplicate task id: {node.id}")
+            self.nodes[node.id] = node
+
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise ValueError(f"task {node.id} depends on unknown task {dep}")
+                self.nodes[dep].dependents.append(node.id)
+
+        self.order = self._topological_order()
+        # Ranks from the sinks back: a task's rank covers its longest chain
+        for id in reversed(self.order):
+            node = self.nodes[id]
+            node.rank = node.duration + max((self.nodes[d].rank for d in node.dependents), default=0.0)
+
+    @staticmethod
+    def _node(index: int, task: Any, cells: Tuple[str, ...], cell_limit: Callable[[str], int]) -> TaskNode:
+        if not isinstance(task, dict):
+            return TaskNode(str(index), None, None, task, [], 0, 0.0)
+        depends_on = task.get("depends_on", [])
+        if not isinstance(depends_on, list):
+            raise ValueError(f"depends_on of task {task.get('id', index)} must be a list")
+        resources = task.get("resources") or {}
+        if not isinstance(resources, dict):
+            raise ValueError(f"resources of task {task.get('id', index)} must be an object")
+        duration = resources.get("duration", 1.0)
+        slots = resources.get("slots", 1)
+        if not isinstance(duration, (int, float)) or duration < 0:
+            raise ValueError("resources.duration must be a non-negative number")
+        if not isinstance(slots, int) or slots < 1:
+            raise ValueError("resources.slots must be a positive integer")
+
+        cell = task.get("cell")
+        dispatched = cell in cells and bool(task.get("action"))
+        return TaskNode(
+            str(task.get("id", index)),
+            cell if dispatched else None,
+            task.get("action") if dispatched else None,
+            task.get("payload", {}),
+            [str(dep) for dep in depends_on],
+            # A task never needs more than all of its cell's slots
+            min(slots, cell_limit(cell)) if dispatched else 0,
+            float(duration) if dispatched else 0.0
+        )
+
+    def _topological_order(self) -> List[str]:
+        """Kahn's algorithm"""
+        in_degree = {id: len(node.depends_on) for id, node in self.nodes.items()}
+        frontier = [id for id, degree in in_degree.items() if degree == 0]
+        order = []
+        while frontier:
+            id = frontier.pop()
+            order.append(id)
+            for dependent in self.nodes[id].dependents:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    frontier.append(dependent)
+        if len(order) < len(self.nodes):
+            cycle = sorted(id for id, degree in in_degree.items() if degree > 0)
+            raise ValueError(f"task dependencies form a cycle among: {', '.join(cycle)}")
+        return order
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """The chain with the longest estimated duration, and that duration"""
+        roots = [node for node in self.nodes.values() if not node.depends_on]
+        if not roots:
+            return [], 0.0
+        node = max(roots, key=lambda n: n.rank)
+        estimate = node.rank
+        path = [node.id]
+        while node.dependents:
+            node = max((self.nodes[d] for d in node.dependents), key=lambda n: n.rank)
+            path.append(node.id)
+        return path, estimate
+
+
+class PlanRun:
+    """Progress of one plan through the scheduler"""
+
+    def __init__(self, plan_id: str, graph: PlanGraph, priority: str):
+        self.plan_id = plan_id
+        self.graph = graph
+        self.priority = priority
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.unfinished = len(graph.nodes)
+        self.estimated_path, self.estimated_time = graph.critical_path()
+
+    @property
+    def status(self) -> str:
+        if self.finished_at is None:
+            return "running"
+        failed = any(node.status in (FAILED, SKIPPED) for node in self.graph.nodes.values())
+        return "failed" if failed else "completed"
+
+    def task_id(self, node: TaskNode) -> str:
+        return f"{self.plan_id}:{node.id}"
+
+    def observed_critical_path(self) -> Tuple[List[str], float]:
+        """
+        The chain that determined when the plan finished.
+
+        Walks back from the last task to finish through the dependency that
+        finished last, i.e. the one it actually waited for.
+        """
+        finished = [node for node in self.graph.nodes.values() if node.finished_at is not None]
+        if not finished:
+            return [], 0.0
+        node = max(finished, key=lambda n: n.finished_at)
+        end = node.finished_at
+        path = [node.id]
+        while node.depends_on:
+            node = max((self.graph.nodes[d] for d in node.depends_on),
+                       key=lambda n: n.finished_at or 0.0)
+            path.append(node.id)
+        return path[::-1], end - self.started_at
+
+    def progress(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        serial_time = 0.0
+        for node in self.graph.nodes.values():
+            counts[node.status] = counts.get(node.status, 0) + 1
+            if node.dispatched_at is not None and node.finished_at is not None:
+                serial_time += node.finished_at - node.dispatched_at
+        total = len(self.graph.nodes)
+        path, latency = self.observed_critical_path()
+        return {
+            "status": self.status,
+            "total": total,
+            "finished": total - self.unfinished,
+            "tasks_by_status": counts,
+            "elapsed": (self.finished_at or time.time()) - self.started_at,
+            "critical_path": {
+                "estimated": self.estimated_path,
+                "estimated_time": self.estimated_time,
+                "observed": path,
+                "observed_time": latency
+            },
+            # Time the dispatched tasks would have taken one after another
+            "serial_time": serial_time
+        }
+
+    def tasks(self) -> Dict[str, Dict[str, Any]]:
+        """Scheduling state of each task, by task id, in topological order"""
+        return {self.task_id(self.graph.nodes[id]): self.graph.nodes[id].view() for id in self.graph.order}
+
+
+Enqueue = Callable[[str, List[Dict[str, Any]]], Awaitable[Any]]
+
+
+class PlanScheduler:
+    """
+    Dispatches the tasks of plans as their dependencies complete.
+
+    A task becomes ready once all of its dependencies completed; ready
+    tasks of a cell wait for free slots of that cell's concurrency limit,
+    which applies across all plans. Among ready tasks, higher plan priority
+    goes first, then the task with the longest estimated chain ahead of it,
+    so the critical path is never left waiting behind shorter work. A
+    failed task fails the tasks depending on it ("skipped").
+
+    Completions arrive through task_completed(), with the payload worker
+    cells send to the planner's completions queue.
+    """
+
+    def __init__(self, enqueue: Enqueue, cells: Tuple[str, ...], limits: Dict[str, int],
+                 default_limit: int = 4, reply_to: str = "planner", max_plans: int = 100):
+        self.enqueue = enqueue
+        self.cells = cells
+        self.limits = limits
+        self.default_limit = default_limit
+        self.reply_to = reply_to
+        self.max_plans = max_plans
+        self.runs: "OrderedDict[str, PlanRun]" = OrderedDict()
+        self.in_flight: Dict[str, int] = {cell: 0 for cell in cells}
+        self._ready: Dict[str, List[Tuple[int, float, int, str, str]]] = {cell: [] for cell in cells}
+        self._seq = itertools.count()
+
+    def cell_limit(self, cell: str) -> int:
+        return max(1, self.limits.get(cell, self.default_limit))
+
+    def get(self, plan_id: str) -> Optional[PlanRun]:
+        return self.runs.get(plan_id)
+
+    def validate(self, tasks: List[Any], priority: str = "normal") -> PlanGraph:
+        """
+        Check a plan before it is given an id, and build its graph.
+
+        Raises:
+            ValueError: for an unknown priority, or if the tasks do not form a valid DAG
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of: {', '.join(PRIORITIES)}")
+        return PlanGraph(tasks, self.cells, self.cell_limit)
+
+    async def submit(self, plan_id: str, graph: PlanGraph, priority: str = "normal") -> PlanRun:
+        """Schedule a plan checked by validate() and dispatch the tasks it can start with"""
+        run = PlanRun(plan_id, graph, priority)
+        self.runs[plan_id] = run
+        self._evict()
+        if run.unfinished == 0:
+            run.finished_at = run.started_at
+
+        for id in run.graph.order:
+            node = run.graph.nodes[id]
+            if node.pending_deps == 0 and node.status == WAITING:
+                self._release(run, node)
+        await self.dispatch()
+        return run
+
+    def _evict(self):
+        """Forget the oldest finished plans beyond max_plans"""
+        excess = len(self.runs) - self.max_plans
+        for plan_id in [p for p, run in self.runs.items() if run.finished_at is not None][:max(excess, 0)]:
+            del self.runs[plan_id]
+
+    def _release(self, run: PlanRun, node: TaskNode):
+        """Dependencies of node are done: record it, or queue it for a slot"""
+        if node.cell is None:
+            self._finish(run, node, RECORDED)
+            return
+        node.status = READY
+        heapq.heappush(self._ready[node.cell],
+                       (-PRIORITIES[run.priority], -node.rank, next(self._seq), run.plan_id, node.id))
+
+    def _finish(self, run: PlanRun, node: TaskNode, status: str):
+        """Mark node finished and release, record or skip its dependents"""
+        node.status = status
+        finished = [node]
+        while finished:
+            node = finished.pop()
+            node.finished_at = node.finished_at or time.time()
+            run.unfinished -= 1
+            for id in node.dependents:
+                dependent = run.graph.nodes[id]
+                if dependent.status != WAITING:
+                    continue
+                if node.status in (FAILED, SKIPPED):
+                    dependent.status = SKIPPED
+                    dependent.error = f"dependency {node.id} {node.status}"
+                    finished.append(dependent)
+                    continue
+                dependent.pending_deps -= 1
+                if dependent.pending_deps > 0:
+                    continue
+                if dependent.cell is None:
+                    dependent.status = RECORDED
+                    finished.append(dependent)
+                else:
+                    self._release(run, dependent)
+        if run.unfinished == 0 and run.finished_at is None:
+            run.finished_at = time.time()
+
+    def _take_ready(self, cell: str) -> List[Tuple[PlanRun, TaskNode]]:
+        """Claim slots for the ready tasks of cell that fit, best first"""
+        taken = []
+        ready = self._ready[cell]
+        limit = self.cell_limit(cell)
+        while ready:
+            _, _, _, plan_id, id = ready[0]
+            run = self.runs.get(plan_id)
+            if run is None:
+                heapq.heappop(ready)
+                continue
+            node = run.graph.nodes[id]
+            if self.in_flight[cell] + node.slots > limit:
+                break
+            heapq.heappop(ready)
+            self.in_flight[cell] += node.slots
+            node.status = QUEUED
+            node.dispatched_at = time.time()
+            taken.append((run, node))
+        return taken
+
+    async def dispatch(self):
+        """Enqueue every ready task that fits its cell's free slots"""
+        for cell in self.cells:
+            taken = self._take_ready(cell)
+            if not taken:
+                continue
+            bodies = [{
+                "task_id": run.task_id(node),
+                "plan_id": run.plan_id,
+                "action": node.action,
+                "payload": node.payload,
+                "reply_to": self.reply_to
+            } for run, node in taken]
+            try:
+                await self.enqueue(cell, bodies)
+            except Exception as e:
+                print(f"[Planner] Could not enqueue tasks for {cell}: {e}")
+                for run, node in taken:
+                    self.in_flight[cell] -= node.slots
+                    node.error = f"enqueue failed: {e}"
+                    self._finish(run, node, FAILED)
+
+    async def task_completed(self, payload: Dict[str, Any]):
+        """Record a worker cell's outcome for a task and dispatch what it unblocks"""
+        run = self.runs.get(payload.get("plan_id"))
+        task_id = payload.get("task_id") or ""
+        if run is None or not task_id.startswith(run.plan_id + ":"):
+            return  # Plan too old (or from before a restart)
+        node = run.graph.nodes.get(task_id[len(run.plan_id) + 1:])
+        if node is None or node.status != QUEUED:
+            return  # Duplicate delivery of a completion
+
+        self.in_flight[node.cell] -= node.slots
+        node.attempts = payload.get("attempts", 0)
+        node.result = payload.get("result")
+        node.error = payload.get("error")
+        self._finish(run, node, COMPLETED if payload.get("status") == COMPLETED else FAILED)
+        await self.dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "plans": len(self.runs),
+            "running_plans": sum(1 for run in self.runs.values() if run.finished_at is None),
+            "in_flight": dict(self.in_flight),
+            "ready": {cell: len(ready) for cell, ready in self._ready.items()},
+            "limits": {cell: self.cell_limit(cell) for cell in self.cells}
+        }
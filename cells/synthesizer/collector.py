@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Source Collector - Hyper-Swarm Phase-1
+Concurrent snapshot collection from sibling cells for the synthesizer cell.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+
+
+# What a snapshot of each cell is; other sources report their /status
+# (the planner's includes its last plan)
+SNAPSHOT_PATHS = {
+    "watcher": "/alerts"
+}
+
+
+def source_urls(sources: Iterable[str]) -> Dict[str, str]:
+    """Base URL of each cell: <SOURCE>_URL if set, else the compose service name"""
+    return {
+        source: os.getenv(f"{source.upper()}_URL", f"http://{source}:8000").rstrip("/")
+        for source in sources
+    }
+
+
+class Snapshot:
+    __slots__ = ("data", "fetched_at", "latency")
+
+    def __init__(self, data: Any, fetched_at: float, latency: float):
+        self.data = data
+        self.fetched_at = fetched_at
+        self.latency = latency
+
+
+class SourceCollector:
+    """
+    Pulls snapshots from sibling cells concurrently.
+
+    Only the cells in urls are ever contacted, at the URL given there; the
+    caller's source names are looked up, never turned into URLs.
+
+    All sources share one keep-alive connection pool. A collection waits
+    for each source only until its deadline, so it takes as long as the
+    slowest source within the deadline rather than the sum of all of them;
+    a source that misses it is reported and left out, or served from a
+    stale snapshot if one is recent enough. Fresh snapshots are reused for
+    ttl seconds, and concurrent collections share one in-flight request per
+    source. A request that outlives its deadline keeps running in the
+    background (up to request_timeout) and refreshes the cache.
+    """
+
+    def __init__(self, urls: Dict[str, str], ttl: float = 5.0, stale_ttl: float = 60.0, request_timeout: float = 10.0,
+                 max_connections: int = 20):
+        self.urls = urls
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.request_timeout = request_timeout
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._in_flight: Dict[str, "asyncio.Task[Snapshot]"] = {}
+
+    async def start(self):
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.request_timeout),
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections)
+        )
+
+    async def close(self):
+        for task in self._in_flight.values():
+            task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch(self, source: str) -> Snapshot:
+        started = time.perf_counter()
+        path = SNAPSHOT_PATHS.get(source, "/status")
+        response = await self._client.get(f"{self.urls[source]}{path}")
+        response.raise_for_status()
+        snapshot = Snapshot(response.json(), time.time(), time.perf_counter() - started)
+        self._snapshots[source] = snapshot
+        return snapshot
+
+    def _fetch_task(self, source: str) -> "asyncio.Task[Snapshot]":
+        task = self._in_flight.get(source)
+        if task is None:
+            task = asyncio.create_task(self._fetch(source))
+            self._in_flight[source] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(source, None))
+            # Consume the exception of fetches nobody waits for any more
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _collect_one(self, source: str, deadline: float, max_age: float) -> Dict[str, Any]:
+        cached = self._snapshots.get(source)
+        if cached is not None and time.time() - cached.fetched_at <= max_age:
+            return {"status": "cached", "data": cached.data, "age": time.time() - cached.fetched_at}
+
+        try:
+            snapshot = await asyncio.wait_for(asyncio.shield(self._fetch_task(source)), deadline)
+            return {"status": "ok", "data": snapshot.data, "latency": snapshot.latency}
+        except asyncio.TimeoutError:
+            error = f"no response within {deadline}s"
+            status = "timeout"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            status = "error"
+
+        # Fall back to the last snapshot while it is not too old
+        cached = self._snapshots.get(source)
+        if cached is not None and time.time() - cached.fetched_at <= self.stale_ttl:
+            return {"status": "stale", "data": cached.data, "age": time.time() - cached.fetched_at,
+                    "error": error}
+        return {"status": status, "error": error}
+
+    async def collect(self, sources: Iterable[str], deadline: float = 2.0,
+                      max_age: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect a snapshot from every source concurrently.
+
+        Args:
+            sources: Cell names, each one of urls
+            deadline: Seconds to wait for each source
+            max_age: Reuse cached snapshots up to this age; defaults to ttl
+
+        Returns:
+            Per source, a dict with "status" ("ok", "cached", "stale",
+            "timeout" or "error") and, unless it failed, its "data"
+
+        Raises:
+            ValueError: if a source is not one of urls
+        """
+        sources = list(dict.fromkeys(sources))
+        unknown = [source for source in sources if source not in self.urls]
+        if unknown:
+            raise ValueError(f"unknown sources: {', '.join(unknown)}")
+        if self._client is None:
+            await self.start()
+        max_age = self.ttl if max_age is None else max_age
+        results = await asyncio.gather(
+            *(self._collect_one(source, deadline, max_age) for source in sources)
+        )
+        return dict(zip(sources, results))
@@ -5,23 +5,81 @@ Data synthesis and output generation role for the swarm system.
 """
 
 import os
+import sys
+import time
 import asyncio
-from typing import Dict, Any, List
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+import secrets
+from typing import Dict, Any, List, Optional, Tuple
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 import uvicorn
 
+# Add parent directory to path to import common modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from common.async_memory import AsyncMemory
+from common.executor import CellExecutor, ClientDisconnected, ExecutorSaturated
+from common.workqueue import WorkQueue, QueueWorker
+
+from collector import SourceCollector, source_urls
+from result_store import AgeRetention, BytesRetention, CountRetention, ResultStore
+from sessions import SessionRegistry, SynthesisSession
+from synthesis import build_synthesis
+
 app = FastAPI(title="Synthesizer Cell", version="0.1.0")
 
 # Global state for the synthesizer
 synthesizer_state = {
     "status": "active",
-    "synthesis_results": [],
     "input_sources": ["planner", "curator", "archivist", "watcher"],
     "synthesis_count": 0,
     "current_synthesis": None
 }
 
+# Distinguishes this process's synthesis IDs from those of earlier runs and
+# other replicas, since results outlive the process in Memory
+instance_id = f"{int(time.time() * 1000):x}{secrets.token_hex(2)}"
+
+def retention_policies() -> list:
+    """In-memory retention from the environment; a limit of 0 disables it"""
+    policies = []
+    max_count = int(os.getenv("SYNTHESIZER_RETENTION_COUNT", 100))
+    max_age = float(os.getenv("SYNTHESIZER_RETENTION_AGE", 3600))
+    max_bytes = int(os.getenv("SYNTHESIZER_RETENTION_BYTES", 64 * 1024 * 1024))
+    if max_count > 0:
+        policies.append(CountRetention(max_count))
+    if max_age > 0:
+        policies.append(AgeRetention(max_age))
+    if max_bytes > 0:
+        policies.append(BytesRetention(max_bytes))
+    return policies
+
+memory = AsyncMemory(json_path="./data/synthesizer_memory.json")
+collector = SourceCollector(source_urls(synthesizer_state["input_sources"]),
+                            ttl=float(os.getenv("SYNTHESIZER_SNAPSHOT_TTL", 5)))
+SOURCE_DEADLINE = float(os.getenv("SYNTHESIZER_SOURCE_DEADLINE", 2))
+sessions = SessionRegistry(
+    max_sessions=int(os.getenv("SYNTHESIZER_MAX_SESSIONS", 100)),
+    idle_ttl=float(os.getenv("SYNTHESIZER_SESSION_TTL", 600))
+)
+result_store = ResultStore(memory, retention_policies())
+
+# Synthesis runs in worker processes, off the event loop
+executor = CellExecutor(
+    workers=int(os.getenv("SYNTHESIZER_WORKERS", 2)),
+    max_queue=int(os.getenv("SYNTHESIZER_MAX_QUEUE", 8)),
+    name="synthesizer"
+)
+
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated(request: Request, exc: ExecutorSaturated):
+    return JSONResponse({"detail": str(exc)}, status_code=429,
+                        headers={"Retry-After": str(exc.retry_after)})
+
+@app.exception_handler(ClientDisconnected)
+async def client_disconnected(request: Request, exc: ClientDisconnected):
+    # Nobody is listening; 499 only shows up in logs
+    return Response(status_code=499)
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -38,71 +96,164 @@ async def get_status():
     return {
         "status": synthesizer_state["status"],
         "synthesis_count": synthesizer_state["synthesis_count"],
-        "results_count": len(synthesizer_state["synthesis_results"]),
+        "results_count": len(result_store),
         "input_sources": synthesizer_state["input_sources"],
-        "current_synthesis": synthesizer_state["current_synthesis"]
+        "current_synthesis": synthesizer_state["current_synthesis"],
+        "result_store": result_store.stats(),
+        "open_sessions": len(sessions),
+        "executor": executor.stats(),
+        "work_queue": queue_worker.stats()
     }
 
-@app.post("/synthesize")
-async def create_synthesis(request: Dict[str, Any]):
-    """Create synthesis from multiple input sources"""
-    inputs = request.get("inputs", [])
-    synthesis_type = request.get("type", "standard")
-    
-    # Simulate synthesis process
+async def record_synthesis(synthesis: Dict[str, Any], synthesis_type: str,
+                           input_refs: List[str]) -> Dict[str, Any]:
+    """Record and store a computed synthesis; returns the stored result"""
     synthesis_result = {
-        "id": f"synthesis_{synthesizer_state['synthesis_count']}",
+        "id": f"synthesis_{instance_id}_{synthesizer_state['synthesis_count']}",
         "timestamp": asyncio.get_event_loop().time(),
         "type": synthesis_type,
-        "input_count": len(inputs),
-        "inputs": inputs,
-        "output": {
-            "summary": f"Synthesized from {len(inputs)} sources",
-            "key_points": [f"Point {i+1}" for i in range(min(3, len(inputs)))],
-            "confidence": min(0.9, len(inputs) * 0.2),
-            "recommendations": ["Action A", "Action B", "Action C"]
-        },
-        "metadata": {
-            "processing_time": 0.5,
-            "quality_score": hash(str(inputs)) % 100,
-            "source_diversity": len(set(inp.get("source", "") for inp in inputs))
-        }
+        "input_count": len(input_refs),
+        "input_refs": input_refs,
+        "output": synthesis["output"],
+        "metadata": synthesis["metadata"]
     }
     
-    synthesizer_state["synthesis_results"].append(synthesis_result)
     synthesizer_state["synthesis_count"] += 1
+    await result_store.add(synthesis_result)
     synthesizer_state["current_synthesis"] = synthesis_result["id"]
-    
+    return synthesis_result
+
+async def run_synthesis(inputs: List[Any], synthesis_type: str,
+                        http_request: Optional[Request] = None) -> Dict[str, Any]:
+    """Compute, record and store one synthesis; returns the stored result"""
+    synthesis = await executor.run(build_synthesis, inputs, request=http_request)
+    await result_store.put_inputs(synthesis["input_refs"], inputs)
+    return await record_synthesis(synthesis, synthesis_type, synthesis["input_refs"])
+
+def synthesis_response(synthesis_result: Dict[str, Any], **extra: Any) -> JSONResponse:
     return JSONResponse({
         "status": "synthesis_complete",
         "synthesis_id": synthesis_result["id"],
         "output": synthesis_result["output"],
-        "metadata": synthesis_result["metadata"]
+        "metadata": synthesis_result["metadata"],
+        **extra
     })
 
+@app.post("/synthesize")
+async def create_synthesis(request: Dict[str, Any], http_request: Request):
+    """
+    Create synthesis from multiple input sources
+
+    The synthesis is computed in a worker process; returns 429 with
+    Retry-After while the workers are saturated.
+    """
+    inputs = request.get("inputs", [])
+    synthesis_type = request.get("type", "standard")
+    return synthesis_response(await run_synthesis(inputs, synthesis_type, http_request))
+
 @app.get("/results")
 async def get_synthesis_results(limit: int = 20):
-    """Get recent synthesis results"""
-    results = synthesizer_state["synthesis_results"]
-    recent_results = results[-limit:] if len(results) > limit else results
-    
+    """Get recent synthesis results held in memory"""
     return {
-        "results": recent_results,
-        "total_count": len(synthesizer_state["synthesis_results"])
+        "results": result_store.recent(limit),
+        "total_count": len(result_store)
     }
 
 @app.get("/result/{synthesis_id}")
-async def get_synthesis_result(synthesis_id: str):
-    """Get specific synthesis result by ID"""
-    for result in synthesizer_state["synthesis_results"]:
-        if result["id"] == synthesis_id:
-            return result
+async def get_synthesis_result(synthesis_id: str, expand_inputs: bool = False):
+    """
+    Get specific synthesis result by ID, from memory or Memory storage
+
+    Results refer to their inputs by "input_refs"; expand_inputs=true also
+    returns the inputs themselves.
+    """
+    result = await result_store.get(synthesis_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Synthesis result not found")
+    if expand_inputs:
+        result = {**result, "inputs": await result_store.get_inputs(result["input_refs"])}
+    return result
+
+@app.post("/sessions")
+async def open_session(request: Dict[str, Any]):
+    """
+    Open an incremental synthesis session
+
+    Inputs are pushed to the session in chunks; its output is kept up to
+    date as they arrive and can be read at any time. Closing the session
+    stores the final synthesis like /synthesize. Sessions idle for longer
+    than SYNTHESIZER_SESSION_TTL seconds are dropped.
+    """
+    session = sessions.open(request.get("type", "incremental"))
+    if session is None:
+        raise HTTPException(status_code=503, detail="Too many open synthesis sessions")
+    return {"status": "session_open", "session_id": session.id}
+
+def session_view(session: SynthesisSession) -> Dict[str, Any]:
+    return {
+        "session_id": session.id,
+        "type": session.type,
+        "input_count": session.accumulator.input_count,
+        "updated_at": session.updated_at,
+        **session.accumulator.result()
+    }
+
+def open_session_or_404(session_id: str) -> SynthesisSession:
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Synthesis session not found")
+    return session
+
+@app.post("/sessions/{session_id}/inputs")
+async def push_session_inputs(session_id: str, request: Dict[str, Any]):
+    """Add a chunk of inputs to a session; returns the updated output"""
+    session = open_session_or_404(session_id)
+    inputs = request.get("inputs", [])
+    if not isinstance(inputs, list) or not all(isinstance(item, dict) for item in inputs):
+        raise HTTPException(status_code=400, detail="inputs must be a list of objects")
     
-    raise HTTPException(status_code=404, detail="Synthesis result not found")
+    async with session.lock:
+        refs = await asyncio.to_thread(session.accumulator.add_many, inputs)
+        session.input_refs.extend(refs)
+        session.updated_at = time.time()
+        await result_store.put_inputs(refs, inputs)
+    return session_view(session)
+
+@app.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    """Read the current output of a session"""
+    return session_view(open_session_or_404(session_id))
+
+@app.post("/sessions/{session_id}/close")
+async def close_session(session_id: str):
+    """Close a session and store its final synthesis"""
+    session = open_session_or_404(session_id)
+    async with session.lock:
+        if sessions.close(session_id) is None:
+            raise HTTPException(status_code=404, detail="Synthesis session not found")
+        synthesis_result = await record_synthesis(
+            session.accumulator.result(), session.type, session.input_refs
+        )
+    return synthesis_response(synthesis_result, session_id=session_id)
 
 @app.post("/aggregate")
-async def aggregate_data(request: Dict[str, Any]):
-    """Aggregate data from multiple cells for synthesis"""
+async def aggregate_data(request: Dict[str, Any], http_request: Request):
+    """
+    Aggregate data from multiple cells for synthesis
+
+    With "cell_data" the caller supplies each cell's data. Without it (or
+    with "mode": "pull") the synthesizer pulls a snapshot from every cell
+    in "sources" (a subset of input_sources, the default) concurrently, waiting at most
+    "deadline" seconds per source and reusing snapshots up to "max_age"
+    seconds old. Sources that miss the deadline are left out and reported
+    under "sources"; 502 if none of them answered.
+    """
+    mode = request.get("mode", "push" if "cell_data" in request else "pull")
+    if mode == "pull":
+        synthesis_result, report = await aggregate_pulled(request, http_request)
+        return synthesis_response(synthesis_result, **report)
+    if mode != "push":
+        raise HTTPException(status_code=400, detail="mode must be push or pull")
     cell_data = request.get("cell_data", {})
     
     # Simulate aggregation logic
@@ -121,17 +272,81 @@ async def aggregate_data(request: Dict[str, Any]):
         "type": "aggregated"
     }
     
-    return await create_synthesis(synthesis_request)
+    return await create_synthesis(synthesis_request, http_request)
+
+async def aggregate_pulled(request: Dict[str, Any],
+                           http_request: Optional[Request] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Pull-mode aggregation: collect from sibling cells, then synthesize
+
+    Returns:
+        Tuple of (stored result, report on the collection)
+    """
+    sources = request.get("sources") or synthesizer_state["input_sources"]
+    deadline = request.get("deadline", SOURCE_DEADLINE)
+    max_age = request.get("max_age")
+    if not isinstance(sources, list) or not all(isinstance(s, str) for s in sources):
+        raise HTTPException(status_code=400, detail="sources must be a list of cell names")
+    unknown = [source for source in sources if source not in synthesizer_state["input_sources"]]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sources (expected input_sources): {unknown}")
+    if not isinstance(deadline, (int, float)) or deadline <= 0:
+        raise HTTPException(status_code=400, detail="deadline must be a positive number")
+    if max_age is not None and (not isinstance(max_age, (int, float)) or max_age < 0):
+        raise HTTPException(status_code=400, detail="max_age must be a non-negative number")
+    
+    started = time.perf_counter()
+    collected = await collector.collect(sources, deadline, max_age)
+    report = {
+        source: {key: value for key, value in result.items() if key != "data"}
+        for source, result in collected.items()
+    }
+    aggregated_inputs = [
+        {
+            "source": source,
+            "data": result["data"],
+            "weight": 1.0,
+            "timestamp": asyncio.get_event_loop().time()
+        }
+        for source, result in collected.items() if "data" in result
+    ]
+    if not aggregated_inputs:
+        raise HTTPException(status_code=502, detail={"error": "No source responded", "sources": report})
+    collection_time = time.perf_counter() - started
+    
+    synthesis_result = await run_synthesis(aggregated_inputs, "aggregated", http_request)
+    return synthesis_result, {
+        "sources": report,
+        "partial": len(aggregated_inputs) < len(collected),
+        "collection_time": collection_time
+    }
+
+async def synthesize_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Work queue "synthesize" task: same payload as /synthesize"""
+    synthesis_result = await run_synthesis(payload.get("inputs", []), payload.get("type", "standard"))
+    return {"synthesis_id": synthesis_result["id"]}
+
+async def aggregate_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Work queue "aggregate" task: a pull-mode /aggregate"""
+    synthesis_result, report = await aggregate_pulled(payload)
+    return {"synthesis_id": synthesis_result["id"], "partial": report["partial"]}
+
+# Synthesis tasks dispatched by the planner
+work_queue = WorkQueue.from_env("synthesizer")
+queue_worker = QueueWorker(work_queue, "synthesizer", "synthesizer",
+                           {"synthesize": synthesize_task, "aggregate": aggregate_task},
+                           batch_size=int(os.getenv("WORKQUEUE_BATCH", 16)))
 
 async def synthesizer_loop():
     """Main async loop for synthesizer operations"""
     while True:
         print(f"[Synthesizer] Active... {synthesizer_state['synthesis_count']} syntheses completed")
         
-        # Simulate periodic cleanup
-        if len(synthesizer_state["synthesis_results"]) > 100:
-            synthesizer_state["synthesis_results"] = synthesizer_state["synthesis_results"][-50:]
-            print("[Synthesizer] Cleaned up old synthesis results")
+        # Age-based retention also applies while no results arrive
+        await result_store.enforce()
+        expired = sessions.expire()
+        if expired:
+            print(f"[Synthesizer] Dropped {expired} idle synthesis sessions")
         
         await asyncio.sleep(8)
 
@@ -139,7 +354,20 @@ async def synthesizer_loop():
 async def startup_event():
     """Initialize synthesizer on startup"""
     print("[Synthesizer] Starting synthesizer cell...")
+    await memory.connect()
+    await collector.start()
+    executor.start()
+    await work_queue.connect()
     asyncio.create_task(synthesizer_loop())
+    asyncio.create_task(queue_worker.run())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the synthesis workers and release memory and queue connections"""
+    executor.shutdown()
+    await collector.close()
+    await memory.close()
+    await work_queue.close()
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Result Store - Hyper-Swarm Phase-1
+Indexed synthesis results for the synthesizer cell, with pluggable
+in-memory retention and durable copies in Memory.
+"""
+
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class StoredResult:
+    """A result with the bookkeeping retention policies look at"""
+
+    __slots__ = ("result", "size", "stored_at", "persisted")
+
+    def __init__(self, result: Dict[str, Any], size: int, stored_at: float, persisted: bool):
+        self.result = result
+        self.size = size
+        self.stored_at = stored_at
+        self.persisted = persisted
+
+
+class RetentionPolicy(ABC):
+    """Decides whether the oldest in-memory result has to go"""
+
+    @abstractmethod
+    def over_limit(self, store: "ResultStore", now: float) -> bool:
+        ...
+
+
+class CountRetention(RetentionPolicy):
+    """Keep at most max_count results in memory"""
+
+    def __init__(self, max_count: int):
+        self.max_count = max_count
+
+    def over_limit(self, store: "ResultStore", now: float) -> bool:
+        return len(store) > self.max_count
+
+
+class AgeRetention(RetentionPolicy):
+    """Keep results in memory for at most max_age seconds"""
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+
+    def over_limit(self, store: "ResultStore", now: float) -> bool:
+        oldest = store.oldest()
+        return oldest is not None and now - oldest.stored_at > self.max_age
+
+
+class BytesRetention(RetentionPolicy):
+    """Keep at most max_bytes of serialized results in memory"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+
+    def over_limit(self, store: "ResultStore", now: float) -> bool:
+        return store.bytes > self.max_bytes
+
+
+class ResultStore:
+    """
+    Synthesis results by ID.
+
+    Recent results are held in an insertion-ordered dict, so lookups by ID
+    are O(1) and eviction pops the oldest. Every result is also written to
+    Memory when it is added, so a result evicted by any retention policy
+    (or lost with a restart) is still found there by the same ID.
+
+    Results refer to their inputs by content-addressed refs, and the inputs
+    themselves are stored once in Memory, so neither the store nor Memory
+    keeps a copy of the inputs per result.
+    """
+
+    def __init__(self, memory: Any, policies: List[RetentionPolicy], prefix: str = "synthesis:"):
+        self.memory = memory
+        self.policies = policies
+        self.prefix = prefix
+        self._results: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self.bytes = 0
+        self.evicted = 0
+        self.memory_hits = 0
+        self.persist_failures = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def oldest(self) -> Optional[StoredResult]:
+        return next(iter(self._results.values()), None)
+
+    async def add(self, result: Dict[str, Any]):
+        """Store a result under its "id", persisting it to Memory first"""
+        size = len(json.dumps(result, separators=(",", ":"), default=str))
+        persisted = await self.memory.put(self.prefix + result["id"], result)
+        if not persisted:
+            self.persist_failures += 1
+        self._results[result["id"]] = StoredResult(result, size, time.time(), persisted)
+        self.bytes += size
+        await self.enforce()
+
+    async def enforce(self):
+        """Evict the oldest results until every retention policy is satisfied"""
+        now = time.time()
+        while self._results and any(policy.over_limit(self, now) for policy in self.policies):
+            id, stored = self._results.popitem(last=False)
+            self.bytes -= stored.size
+            self.evicted += 1
+            if not stored.persisted and not await self.memory.put(self.prefix + id, stored.result):
+                print(f"[Synthesizer] Dropped result {id}: could not persist it")
+
+    async def get(self, id: str) -> Optional[Dict[str, Any]]:
+        stored = self._results.get(id)
+        if stored is not None:
+            return stored.result
+        result = await self.memory.get(self.prefix + id)
+        if result is not None:
+            self.memory_hits += 1
+        return result
+
+    async def put_inputs(self, refs: List[str], inputs: List[Any]) -> bool:
+        """Store inputs under their refs; an input shared by results is stored once"""
+        if not refs:
+            return True
+        status = await self.memory.put_many(dict(zip(refs, inputs)))
+        return all(status.values())
+
+    async def get_inputs(self, refs: List[str]) -> List[Any]:
+        """Inputs by ref, in order; None for any that cannot be found"""
+        found = await self.memory.get_many(list(dict.fromkeys(refs)))
+        return [found.get(ref) for ref in refs]
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        """The newest in-memory results, oldest first"""
+        if limit <= 0:
+            return []
+        results = []
+        for stored in reversed(self._results.values()):
+            results.append(stored.result)
+            if len(results) == limit:
+                break
+        return results[::-1]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_memory": len(self._results),
+            "bytes": self.bytes,
+            "evicted": self.evicted,
+            "memory_hits": self.memory_hits,
+            "persist_failures": self.persist_failures
+        }
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Synthesis Sessions - Hyper-Swarm Phase-1
+Open incremental syntheses of the synthesizer cell.
+"""
+
+import asyncio
+import secrets
+import time
+from typing import Dict, List, Optional
+
+from synthesis import SynthesisAccumulator
+
+
+class SynthesisSession:
+    """An open synthesis that inputs are pushed to in chunks"""
+
+    def __init__(self, session_id: str, synthesis_type: str):
+        self.id = session_id
+        self.type = synthesis_type
+        self.accumulator = SynthesisAccumulator()
+        self.input_refs: List[str] = []
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        # Chunks are applied one at a time, in the order they arrive
+        self.lock = asyncio.Lock()
+
+
+class SessionRegistry:
+    """Open sessions by ID, bounded in number and closed after idle_ttl seconds"""
+
+    def __init__(self, max_sessions: int = 100, idle_ttl: float = 600.0):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._sessions: Dict[str, SynthesisSession] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def open(self, synthesis_type: str) -> Optional[SynthesisSession]:
+        """Open a session; None if the session limit is reached"""
+        if len(self._sessions) >= self.max_sessions:
+            return None
+        session = SynthesisSession(f"session_{secrets.token_hex(8)}", synthesis_type)
+        self._sessions[session.id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[SynthesisSession]:
+        return self._sessions.get(session_id)
+
+    def close(self, session_id: str) -> Optional[SynthesisSession]:
+        return self._sessions.pop(session_id, None)
+
+    def expire(self) -> int:
+        """Drop sessions idle for longer than idle_ttl; returns how many"""
+        cutoff = time.time() - self.idle_ttl
+        idle = [id for id, session in self._sessions.items() if session.updated_at < cutoff]
+        for id in idle:
+            del self._sessions[id]
+        return len(idle)
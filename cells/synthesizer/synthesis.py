@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Synthesis - Hyper-Swarm Phase-1
+Synthesis computation for the synthesizer cell, run in worker processes
+for one-shot syntheses and incrementally for synthesis sessions.
+"""
+
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, List, Set
+
+
+INPUT_REF_PREFIX = "synthesis_input:"
+
+
+def input_ref(item: Any) -> str:
+    """Content address of an input: equal inputs share one stored copy"""
+    canonical = json.dumps(item, sort_keys=True, separators=(",", ":"), default=str)
+    return INPUT_REF_PREFIX + hashlib.sha1(canonical.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class SynthesisAccumulator:
+    """
+    Running aggregates of a synthesis, updated one input at a time.
+
+    Every output field is kept as a running value (count, set of sources,
+    a CRC of the inputs' text), so adding an input costs time proportional
+    to that input only, and result() matches build_synthesis over the same
+    inputs in the same order.
+    """
+
+    def __init__(self):
+        self.input_count = 0
+        self.sources: Set[Any] = set()
+        # CRC of str(inputs) without its closing bracket
+        self._crc = zlib.crc32(b"[")
+
+    def add(self, item: Any):
+        text = repr(item) if not self.input_count else ", " + repr(item)
+        self._crc = zlib.crc32(text.encode("utf-8", "surrogatepass"), self._crc)
+        self.sources.add(item.get("source", ""))
+        self.input_count += 1
+
+    def add_many(self, items: List[Any]) -> List[str]:
+        """Add inputs in order; returns their input refs"""
+        for item in items:
+            self.add(item)
+        return [input_ref(item) for item in items]
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Output and metadata for the inputs added so far.
+
+        Returns:
+            Dict with "output" and "metadata"
+        """
+        count = self.input_count
+        return {
+            "output": {
+                "summary": f"Synthesized from {count} sources",
+                "key_points": [f"Point {i+1}" for i in range(min(3, count))],
+                "confidence": min(0.9, count * 0.2),
+                "recommendations": ["Action A", "Action B", "Action C"]
+            },
+            "metadata": {
+                "processing_time": 0.5,
+                # crc32 rather than hash(): the same inputs score the same in
+                # every worker process
+                "quality_score": zlib.crc32(b"]", self._crc) % 100,
+                "source_diversity": len(self.sources)
+            }
+        }
+
+
+def build_synthesis(inputs: List[Any]) -> Dict[str, Any]:
+    """
+    Compute the output and metadata of a synthesis from its inputs.
+
+    Returns:
+        Dict with "output", "metadata" and the "input_refs" of the inputs
+    """
+    accumulator = SynthesisAccumulator()
+    refs = accumulator.add_many(inputs)
+    return {**accumulator.result(), "input_refs": refs}
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Alert Stream - Hyper-Swarm Phase-1
+Fan-out of new observations to push subscribers of the watcher cell.
+"""
+
+import asyncio
+from typing import Iterable, Optional, Set
+
+from observation_store import Observation
+
+
+class AlertSubscriber:
+    """
+    One stream consumer with its server-side filters.
+
+    Deliveries go through a bounded queue; when a slow consumer falls
+    behind, its oldest pending alerts are dropped (and counted) instead of
+    letting the queue grow or blocking the publisher.
+    """
+
+    def __init__(self, severities: Iterable[str], sources: Optional[Iterable[str]] = None,
+                 event_types: Optional[Iterable[str]] = None, queue_size: int = 256):
+        self.severities = set(severities)
+        self.sources = set(sources) if sources else None
+        self.event_types = set(event_types) if event_types else None
+        self.queue: "asyncio.Queue[Observation]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def matches(self, observation: Observation) -> bool:
+        return (observation.severity in self.severities
+                and (self.sources is None or observation.source in self.sources)
+                and (self.event_types is None or observation.event_type in self.event_types))
+
+    def offer(self, observation: Observation):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(observation)
+
+
+class AlertBroadcaster:
+    """Delivers published observations to every matching subscriber"""
+
+    def __init__(self, max_subscribers: int = 100):
+        self.max_subscribers = max_subscribers
+        self.subscribers: Set[AlertSubscriber] = set()
+
+    def subscribe(self, subscriber: AlertSubscriber) -> bool:
+        """Register a subscriber; False if the subscriber limit is reached"""
+        if len(self.subscribers) >= self.max_subscribers:
+            return False
+        self.subscribers.add(subscriber)
+        return True
+
+    def unsubscribe(self, subscriber: AlertSubscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, observation: Observation):
+        """Queue an observation for matching subscribers without blocking"""
+        for subscriber in self.subscribers:
+            if subscriber.matches(observation):
+                subscriber.offer(observation)
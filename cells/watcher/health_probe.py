@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Health Probe - Hyper-Swarm Phase-1
+Concurrent health probing of sibling cells for the watcher cell.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+
+
+def target_url(target: str) -> str:
+    """Base URL of a cell: <TARGET>_URL if set, else the compose service name"""
+    return os.getenv(f"{target.upper()}_URL", f"http://{target}:8000").rstrip("/")
+
+
+class TargetHealth:
+    """Latest probe outcome and recent response times for one cell"""
+
+    def __init__(self, target: str, url: str, history: int):
+        self.target = target
+        self.url = url
+        self.status = "unknown"
+        self.last_checked: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.cell_status: Optional[str] = None
+        self.consecutive_failures = 0
+        self.response_times: Deque[float] = deque(maxlen=history)
+
+    def to_dict(self) -> Dict[str, Any]:
+        times = self.response_times
+        return {
+            "url": self.url,
+            "status": self.status,
+            "cell_status": self.cell_status,
+            "last_checked": self.last_checked,
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+            "last_response_time": times[-1] if times else None,
+            "avg_response_time": sum(times) / len(times) if times else None,
+            "max_response_time": max(times) if times else None
+        }
+
+
+class HealthProber:
+    """
+    Polls /health and /status of every target concurrently.
+
+    All probes share one keep-alive connection pool, so a scan reuses open
+    connections instead of paying a TCP handshake per request. Each target
+    is bounded by its own timeout and probed in its own task, so a slow or
+    hung cell only costs its own probe and never delays the others.
+    """
+
+    def __init__(self, targets: List[str], timeout: float = 2.0, history: int = 30):
+        self.timeout = timeout
+        self.targets = {target: TargetHealth(target, target_url(target), history)
+                        for target in targets}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(max_connections=2 * len(self.targets),
+                                max_keepalive_connections=2 * len(self.targets))
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _probe(self, health: TargetHealth) -> Dict[str, Any]:
+        started = time.perf_counter()
+        health_response, status_response = await asyncio.gather(
+            self._client.get(f"{health.url}/health"),
+            self._client.get(f"{health.url}/status")
+        )
+        response_time = time.perf_counter() - started
+        health_response.raise_for_status()
+        cell_status = None
+        if status_response.status_code == 200:
+            cell_status = status_response.json().get("status")
+        return {"response_time": response_time, "cell_status": cell_status}
+
+    async def probe(self, target: str) -> Dict[str, Any]:
+        """
+        Probe one target and update its health record.
+
+        Returns:
+            Dict with the target, its previous and current status, the
+            measured response time and any error
+        """
+        health = self.targets[target]
+        previous = health.status
+        try:
+            result = await asyncio.wait_for(self._probe(health), self.timeout)
+            health.status = "healthy"
+            health.cell_status = result["cell_status"]
+            health.last_error = None
+            health.consecutive_failures = 0
+            health.response_times.append(round(result["response_time"], 6))
+            response_time = result["response_time"]
+        except Exception as e:
+            health.status = "unhealthy"
+            health.last_error = str(e) or type(e).__name__
+            health.consecutive_failures += 1
+            response_time = None
+        health.last_checked = time.time()
+
+        return {
+            "target": target,
+            "previous_status": previous,
+            "status": health.status,
+            "response_time": response_time,
+            "error": health.last_error
+        }
+
+    async def probe_all(self) -> List[Dict[str, Any]]:
+        """Probe every target concurrently"""
+        if self._client is None:
+            await self.start()
+        return await asyncio.gather(*(self.probe(target) for target in self.targets))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {target: health.to_dict() for target, health in self.targets.items()}
@@ -5,23 +5,43 @@ Monitoring and observation role for the swarm system.
 """
 
 import os
+import math
+import json
+import random
 import asyncio
-from typing import Dict, Any, List
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from typing import Dict, Any, List, Optional
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 
+from alert_stream import AlertBroadcaster, AlertSubscriber
+from health_probe import HealthProber
+from metrics import MetricsEngine
+from observation_store import ObservationRing
+
 app = FastAPI(title="Watcher Cell", version="0.1.0")
 
+ALERT_SEVERITIES = ("high", "critical")
+
 # Global state for the watcher
 watcher_state = {
     "status": "active",
-    "observations": [],
+    "observations": ObservationRing(int(os.getenv("WATCHER_OBSERVATION_CAPACITY", 1000))),
     "monitoring_targets": ["planner", "curator", "archivist", "synthesizer"],
     "alert_count": 0,
     "last_scan": None
 }
 
+SCAN_INTERVAL = float(os.getenv("WATCHER_SCAN_INTERVAL", 4))
+SCAN_JITTER = float(os.getenv("WATCHER_SCAN_JITTER", 0.2))
+MAX_BATCH_OBSERVATIONS = int(os.getenv("WATCHER_MAX_BATCH", 5000))
+MAX_BATCH_BYTES = int(os.getenv("WATCHER_MAX_BATCH_BYTES", 8 * 1024 * 1024))
+STREAM_KEEPALIVE = 15.0
+alerts = AlertBroadcaster(max_subscribers=int(os.getenv("WATCHER_MAX_SUBSCRIBERS", 100)))
+metrics = MetricsEngine(max_series=int(os.getenv("WATCHER_MAX_SERIES", 512)))
+prober = HealthProber(watcher_state["monitoring_targets"],
+                      timeout=float(os.getenv("WATCHER_PROBE_TIMEOUT", 2.0)))
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -38,69 +58,238 @@ async def get_status():
     return {
         "status": watcher_state["status"],
         "observations_count": len(watcher_state["observations"]),
+        "observations_capacity": watcher_state["observations"].capacity,
         "monitoring_targets": watcher_state["monitoring_targets"],
         "alert_count": watcher_state["alert_count"],
-        "last_scan": watcher_state["last_scan"]
+        "last_scan": watcher_state["last_scan"],
+        "metric_series": metrics.series_count(),
+        "alert_subscribers": len(alerts.subscribers)
     }
 
-@app.post("/observe")
-async def record_observation(request: Dict[str, Any]):
-    """Record a new observation"""
-    observation = {
-        "id": f"obs_{len(watcher_state['observations'])}",
-        "timestamp": asyncio.get_event_loop().time(),
+def observed_latency(data: Any) -> Optional[float]:
+    """Latency in seconds reported by an observation, if any (never inf or nan)"""
+    if isinstance(data, dict):
+        for key in ("response_time", "latency"):
+            value = data.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+                return float(value)
+    return None
+
+def store_observation(source: str, event_type: str, data: Any, severity: str):
+    """Append an observation, count alerts and push it to stream subscribers"""
+    observation = watcher_state["observations"].append(
+        timestamp=asyncio.get_event_loop().time(),
+        source=source,
+        event_type=event_type,
+        data=data,
+        severity=severity
+    )
+    
+    # Check for alert conditions
+    if observation.severity in ALERT_SEVERITIES:
+        watcher_state["alert_count"] += 1
+    
+    alerts.publish(observation)
+    return observation
+
+def ingest_observation(request: Dict[str, Any]):
+    """
+    Store a reported observation and count it in the metrics
+    
+    Raises:
+        ValueError: if source, event_type or severity is not a string
+    """
+    fields = {
         "source": request.get("source", "unknown"),
         "event_type": request.get("event_type", "info"),
-        "data": request.get("data", {}),
         "severity": request.get("severity", "low")
     }
+    for name, value in fields.items():
+        if not isinstance(value, str):
+            raise ValueError(f"{name} must be a string")
+    observation = store_observation(data=request.get("data", {}), **fields)
+    metrics.record(observation.source, observation.event_type, observed_latency(observation.data))
+    return observation
+
+@app.post("/observe")
+async def record_observation(request: Dict[str, Any]):
+    """Record a new observation"""
+    try:
+        observation = ingest_observation(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    watcher_state["observations"].append(observation)
+    return JSONResponse({
+        "status": "observation_recorded",
+        "observation_id": observation.id,
+        "severity": observation.severity
+    })
+
+@app.post("/observe/batch")
+async def record_observation_batch(request: Request):
+    """
+    Record many observations in one request
     
-    # Check for alert conditions
-    if observation["severity"] in ["high", "critical"]:
-        watcher_state["alert_count"] += 1
+    The body is either a JSON array of observations or NDJSON with one
+    observation per line (Content-Type: application/x-ndjson). Bodies
+    over WATCHER_MAX_BATCH_BYTES are refused with 413 without reading them
+    whole; observations that cannot be recorded are reported in "rejected".
+    """
+    too_large = HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_BYTES} bytes")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > MAX_BATCH_BYTES:
+        raise too_large
+    received = bytearray()
+    async for chunk in request.stream():
+        received += chunk
+        if len(received) > MAX_BATCH_BYTES:
+            raise too_large
+    body = bytes(received)
+    if "ndjson" in request.headers.get("content-type", "") or not body.lstrip().startswith(b"["):
+        lines = [line for line in body.split(b"\n") if line.strip()]
+        items = []
+        for line in lines:
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(e)
+    else:
+        try:
+            items = json.loads(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON array: {e}")
+    
+    if len(items) > MAX_BATCH_OBSERVATIONS:
+        raise HTTPException(status_code=413,
+                            detail=f"Batch exceeds {MAX_BATCH_OBSERVATIONS} observations")
+    
+    recorded = []
+    rejected = []
+    for index, item in enumerate(items):
+        if isinstance(item, ValueError):
+            rejected.append({"index": index, "error": f"invalid JSON: {item}"})
+        elif not isinstance(item, dict):
+            rejected.append({"index": index, "error": "observation is not a JSON object"})
+        else:
+            try:
+                recorded.append(ingest_observation(item).id)
+            except ValueError as e:
+                rejected.append({"index": index, "error": str(e)})
     
     return JSONResponse({
-        "status": "observation_recorded",
-        "observation_id": observation["id"],
-        "severity": observation["severity"]
+        "status": "observations_recorded",
+        "recorded": len(recorded),
+        "rejected": rejected,
+        "first_observation_id": recorded[0] if recorded else None,
+        "last_observation_id": recorded[-1] if recorded else None
     })
 
 @app.get("/observations")
 async def get_observations(limit: int = 50, severity: str = None):
     """Get recent observations"""
     observations = watcher_state["observations"]
-    
-    if severity:
-        observations = [obs for obs in observations if obs["severity"] == severity]
-    
-    # Return most recent observations
-    recent_observations = observations[-limit:] if len(observations) > limit else observations
+    recent_observations = observations.recent(limit, [severity] if severity else None)
     
     return {
-        "observations": recent_observations,
-        "total_count": len(watcher_state["observations"]),
-        "filtered_count": len(observations)
+        "observations": [obs.to_dict() for obs in recent_observations],
+        "total_count": len(observations),
+        "filtered_count": observations.count(severity or None)
     }
 
 @app.get("/alerts")
 async def get_alerts():
     """Get current alert summary"""
-    high_severity_obs = [
-        obs for obs in watcher_state["observations"] 
-        if obs["severity"] in ["high", "critical"]
-    ]
+    observations = watcher_state["observations"]
     
     return {
         "alert_count": watcher_state["alert_count"],
-        "recent_alerts": high_severity_obs[-10:],
+        "recent_alerts": [obs.to_dict() for obs in observations.recent(10, ALERT_SEVERITIES)],
         "alert_summary": {
-            "critical": len([obs for obs in high_severity_obs if obs["severity"] == "critical"]),
-            "high": len([obs for obs in high_severity_obs if obs["severity"] == "high"])
+            "critical": observations.count("critical"),
+            "high": observations.count("high")
         }
     }
 
+@app.get("/alerts/stream")
+async def stream_alerts(request: Request, severity: List[str] = Query(list(ALERT_SEVERITIES)),
+                        source: List[str] = Query([]), event_type: List[str] = Query([])):
+    """
+    Push matching observations as server-sent events as they arrive
+    
+    Defaults to high and critical observations; repeat severity, source or
+    event_type to filter on the server. A consumer that falls behind loses
+    its oldest undelivered alerts and is told how many in a "dropped" event.
+    """
+    subscriber = AlertSubscriber(severity, source, event_type)
+    if not alerts.subscribe(subscriber):
+        raise HTTPException(status_code=503, detail="Too many alert stream subscribers")
+    
+    async def events():
+        reported_drops = 0
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    observation = await asyncio.wait_for(subscriber.queue.get(), STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if subscriber.dropped != reported_drops:
+                    yield f"event: dropped\ndata: {json.dumps({'dropped': subscriber.dropped - reported_drops})}\n\n"
+                    reported_drops = subscriber.dropped
+                yield (f"id: {observation.id}\nevent: alert\n"
+                       f"data: {json.dumps(observation.to_dict())}\n\n")
+        finally:
+            alerts.unsubscribe(subscriber)
+    
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/metrics/query")
+async def query_metrics(source: Optional[str] = None, event_type: Optional[str] = None,
+                        resolution: Optional[str] = None, start: Optional[float] = None,
+                        end: Optional[float] = None, percentiles: str = "50,90,99"):
+    """
+    Query event rates and latency percentiles per source and event type
+    
+    Data is kept at 1s resolution for 2 minutes, 1m for 2 hours and 1h for
+    7 days; without an explicit resolution the finest one covering start is
+    used. start/end are epoch seconds.
+    """
+    try:
+        requested = [float(p) for p in percentiles.split(",") if p.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid percentiles: {percentiles}")
+    if any(not 0 <= p <= 100 for p in requested):
+        raise HTTPException(status_code=400, detail="Percentiles must be between 0 and 100")
+    
+    try:
+        return metrics.query(source, event_type, resolution, start, end, requested)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/targets")
+async def get_targets():
+    """Get the latest probe result and response times of each monitored cell"""
+    return {"targets": prober.snapshot()}
+
+def record_probe(result: Dict[str, Any]):
+    """Record a health check observation when a target changes state"""
+    if result["status"] == result["previous_status"]:
+        return
+    
+    store_observation(
+        source=f"{result['target']}-cell",
+        event_type="health_check",
+        data={
+            "status": result["status"],
+            "previous_status": result["previous_status"],
+            "response_time": result["response_time"],
+            "error": result["error"]
+        },
+        severity="info" if result["status"] == "healthy" else "high"
+    )
+
 async def watcher_loop():
     """Main async loop for watcher operations"""
     while True:
@@ -109,29 +298,29 @@ async def watcher_loop():
         
         print(f"[Watcher] Scanning... {len(watcher_state['observations'])} observations recorded")
         
-        # Simulate periodic health checks of other cells
-        for target in watcher_state["monitoring_targets"]:
-            # Record simulated health check
-            health_obs = {
-                "source": f"{target}-cell",
-                "event_type": "health_check",
-                "data": {"status": "healthy", "response_time": 0.1},
-                "severity": "info"
-            }
-            # This would normally be an HTTP call to other cells
+        # Probe all other cells concurrently; each is bounded by its own timeout
+        try:
+            for result in await prober.probe_all():
+                record_probe(result)
+                metrics.record(f"{result['target']}-cell", "health_check", result["response_time"])
+        except Exception as e:
+            print(f"[Watcher] Error probing cells: {e}")
         
-        # Clean up old observations (keep last 1000)
-        if len(watcher_state["observations"]) > 1000:
-            watcher_state["observations"] = watcher_state["observations"][-500:]
-        
-        await asyncio.sleep(4)
+        # Jitter the interval so replicas do not probe in lockstep
+        await asyncio.sleep(SCAN_INTERVAL * random.uniform(1 - SCAN_JITTER, 1 + SCAN_JITTER))
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize watcher on startup"""
     print("[Watcher] Starting watcher cell...")
+    await prober.start()
     asyncio.create_task(watcher_loop())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the probe connection pool"""
+    await prober.close()
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
     uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Metrics Engine - Hyper-Swarm Phase-1
+Rolling event rates and latency percentiles for the watcher cell.
+"""
+
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+# (name, bucket width in seconds, buckets kept): 2 minutes of 1s buckets,
+# 2 hours of 1m buckets and 7 days of 1h buckets
+RESOLUTIONS = (
+    ("1s", 1, 120),
+    ("1m", 60, 120),
+    ("1h", 3600, 168)
+)
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+class LogHistogram:
+    """
+    Streaming histogram with logarithmically sized buckets.
+
+    A positive value v lands in bucket ceil(log_gamma(v)); every value in a
+    bucket is within relative_accuracy of the bucket's representative value,
+    so percentiles carry a bounded relative error while memory grows only
+    with the spread of the values, not their number. Histograms with the
+    same accuracy merge by adding bucket counts.
+    """
+
+    __slots__ = ("gamma", "_log_gamma", "buckets", "zero_count", "count", "total", "min", "max")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        if value > 0:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LogHistogram"):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentiles(self, percentiles: Iterable[float]) -> Dict[str, Optional[float]]:
+        """Estimate several percentiles (0-100) in one pass over the buckets"""
+        if not self.count:
+            return {_percentile_name(p): None for p in percentiles}
+
+        result: Dict[str, Optional[float]] = {}
+        buckets = sorted(self.buckets.items())
+        position = 0
+        below = self.zero_count
+        for p in sorted(percentiles):
+            rank = p / 100 * (self.count - 1)
+            if rank < self.zero_count:
+                value = 0.0
+            else:
+                while position < len(buckets) and below + buckets[position][1] <= rank:
+                    below += buckets[position][1]
+                    position += 1
+                if position == len(buckets):
+                    value = self.max
+                else:
+                    value = 2 * self.gamma ** buckets[position][0] / (self.gamma + 1)
+            result[_percentile_name(p)] = min(max(value, self.min), self.max)
+        return result
+
+
+def _percentile_name(p: float) -> str:
+    return f"p{p:g}"
+
+
+class MetricBucket:
+    """Event count and latency histogram for one time bucket"""
+
+    __slots__ = ("start", "events", "latency")
+
+    def __init__(self, start: int, relative_accuracy: float):
+        self.start = start
+        self.events = 0
+        self.latency = LogHistogram(relative_accuracy)
+
+
+class MetricSeries:
+    """
+    Multi-resolution rolling windows for one (source, event_type) pair.
+
+    Every event is added to the current bucket of each resolution; each
+    resolution keeps a fixed number of buckets, so older data survives only
+    in coarser form (1s -> 1m -> 1h) and the series has a fixed upper bound
+    on buckets.
+    """
+
+    def __init__(self, relative_accuracy: float):
+        self.relative_accuracy = relative_accuracy
+        self.windows: Dict[str, Deque[MetricBucket]] = {
+            name: deque(maxlen=kept) for name, _, kept in RESOLUTIONS
+        }
+
+    def record(self, timestamp: float, latency: Optional[float]):
+        for name, width, _ in RESOLUTIONS:
+            window = self.windows[name]
+            start = int(timestamp // width) * width
+            bucket = self._bucket_for(window, start)
+            if bucket is None:
+                continue
+            bucket.events += 1
+            if latency is not None:
+                bucket.latency.add(latency)
+
+    def _bucket_for(self, window: Deque[MetricBucket], start: int) -> Optional[MetricBucket]:
+        if window and window[-1].start == start:
+            return window[-1]
+        if window and window[-1].start > start:
+            # Late event: credit its bucket if one is still retained
+            for bucket in reversed(window):
+                if bucket.start <= start:
+                    return bucket if bucket.start == start else None
+            return None
+        bucket = MetricBucket(start, self.relative_accuracy)
+        window.append(bucket)
+        return bucket
+
+    def buckets(self, resolution: str, start: float, end: float) -> List[MetricBucket]:
+        return [b for b in self.windows[resolution] if start <= b.start < end]
+
+
+class MetricsEngine:
+    """
+    Per-(source, event_type) event rates and latency percentiles.
+
+    Series are kept in least-recently-updated order and the oldest is
+    dropped once max_series is reached, so memory stays bounded whatever
+    sources report.
+    """
+
+    def __init__(self, max_series: int = 512, relative_accuracy: float = 0.01):
+        self.max_series = max_series
+        self.relative_accuracy = relative_accuracy
+        self._series: "OrderedDict[Tuple[str, str], MetricSeries]" = OrderedDict()
+
+    def record(self, source: str, event_type: str, latency: Optional[float] = None,
+               timestamp: Optional[float] = None):
+        """Count one event and, if given, its latency in seconds"""
+        # Coerced, so a caller passing unhashable values cannot break the series map
+        key = (str(source), str(event_type))
+        series = self._series.get(key)
+        if series is None:
+            if len(self._series) >= self.max_series:
+                self._series.popitem(last=False)
+            series = self._series[key] = MetricSeries(self.relative_accuracy)
+        else:
+            self._series.move_to_end(key)
+        series.record(time.time() if timestamp is None else timestamp, latency)
+
+    def series_count(self) -> int:
+        return len(self._series)
+
+    def query(self, source: Optional[str] = None, event_type: Optional[str] = None,
+              resolution: Optional[str] = None, start: Optional[float] = None,
+              end: Optional[float] = None,
+              percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+        """
+        Query the rolling windows of matching series.
+
+        Args:
+            source: Only this source; None matches all
+            event_type: Only this event type; None matches all
+            resolution: "1s", "1m" or "1h"; None picks the finest one that
+                still covers start
+            start: Range start (epoch seconds); defaults to the full
+                retention of the resolution
+            end: Range end (epoch seconds, exclusive); defaults to now
+            percentiles: Latency percentiles (0-100) to report
+
+        Returns:
+            Dict with the resolution, range and, per series, its points and
+            a summary over the whole range
+        """
+        now = time.time()
+        end = now if end is None else end
+        widths = {name: (width, kept) for name, width, kept in RESOLUTIONS}
+        if resolution is None:
+            # Finest resolution that still retains data back to start
+            resolution = "1m"
+            if start is not None:
+                resolution = next((name for name, width, kept in RESOLUTIONS
+                                   if start >= now - width * kept), RESOLUTIONS[-1][0])
+        if resolution not in widths:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        width, kept = widths[resolution]
+        if start is None:
+            start = now - width * kept
+        # Include the bucket that contains start
+        bucket_start = int(start // width) * width
+        percentiles = list(percentiles)
+
+        series_results = []
+        for (series_source, series_event_type), series in self._series.items():
+            if source is not None and series_source != source:
+                continue
+            if event_type is not None and series_event_type != event_type:
+                continue
+            buckets = series.buckets(resolution, bucket_start, end)
+            if not buckets:
+                continue
+
+            total = LogHistogram(self.relative_accuracy)
+            points = []
+            events = 0
+            for bucket in buckets:
+                total.merge(bucket.latency)
+                events += bucket.events
+                points.append({
+                    "t": bucket.start,
+                    "events": bucket.events,
+                    "rate": bucket.events / width,
+                    **_latency_summary(bucket.latency, percentiles)
+                })
+
+            span = max(min(end, now) - bucket_start, width)
+            series_results.append({
+                "source": series_source,
+                "event_type": series_event_type,
+                "points": points,
+                "summary": {
+                    "events": events,
+                    "rate": events / span,
+                    **_latency_summary(total, percentiles)
+                }
+            })
+
+        return {
+            "resolution": resolution,
+            "start": bucket_start,
+            "end": end,
+            "series": series_results
+        }
+
+
+def _latency_summary(histogram: LogHistogram, percentiles: List[float]) -> Dict[str, Any]:
+    if not histogram.count:
+        return {"latency_samples": 0}
+    return {
+        "latency_samples": histogram.count,
+        "latency_mean": histogram.total / histogram.count,
+        "latency_min": histogram.min,
+        "latency_max": histogram.max,
+        **{f"latency_{name}": value
+           for name, value in histogram.percentiles(percentiles).items()}
+    }
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Observation Store - Hyper-Swarm Phase-1
+Fixed-capacity ring buffer of observations for the watcher cell.
+"""
+
+import heapq
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+
+class Observation:
+    """A single observation; slotted to keep per-record overhead small"""
+
+    __slots__ = ("seq", "timestamp", "source", "event_type", "data", "severity")
+
+    def __init__(self, seq: int, timestamp: float, source: str, event_type: str,
+                 data: Any, severity: str):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.source = source
+        self.event_type = event_type
+        self.data = data
+        self.severity = severity
+
+    @property
+    def id(self) -> str:
+        return f"obs_{self.seq}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "source": self.source,
+            "event_type": self.event_type,
+            "data": self.data,
+            "severity": self.severity
+        }
+
+
+class ObservationRing:
+    """
+    Ring buffer holding the most recent `capacity` observations.
+
+    Each record lives in slot seq % capacity, so appending overwrites the
+    oldest record once the buffer is full and memory never grows past
+    capacity. Every severity keeps a deque of the sequence numbers it
+    holds; because records leave in arrival order, an overwritten record is
+    always at the left end of its deque. Severity counts are therefore the
+    deque lengths, and reading the k most recent records of a severity
+    walks only those k records.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._slots: List[Optional[Observation]] = [None] * capacity
+        self._next_seq = 0
+        self._by_severity: Dict[str, Deque[int]] = {}
+
+    def __len__(self) -> int:
+        return min(self._next_seq, self.capacity)
+
+    @property
+    def total_recorded(self) -> int:
+        """Number of observations ever appended, including overwritten ones"""
+        return self._next_seq
+
+    def append(self, timestamp: float, source: str, event_type: str,
+               data: Any, severity: str) -> Observation:
+        """Record an observation, evicting the oldest one when full"""
+        seq = self._next_seq
+        slot = seq % self.capacity
+        evicted = self._slots[slot]
+        if evicted is not None:
+            seqs = self._by_severity[evicted.severity]
+            seqs.popleft()
+            if not seqs:
+                del self._by_severity[evicted.severity]
+
+        observation = Observation(seq, timestamp, source, event_type, data, severity)
+        self._slots[slot] = observation
+        self._by_severity.setdefault(severity, deque()).append(seq)
+        self._next_seq += 1
+        return observation
+
+    def count(self, severity: Optional[str] = None) -> int:
+        """Number of buffered observations, optionally of one severity"""
+        if severity is None:
+            return len(self)
+        seqs = self._by_severity.get(severity)
+        return len(seqs) if seqs else 0
+
+    def counts(self) -> Dict[str, int]:
+        """Buffered observation count per severity"""
+        return {severity: len(seqs) for severity, seqs in self._by_severity.items()}
+
+    def recent(self, limit: int, severities: Optional[Iterable[str]] = None) -> List[Observation]:
+        """
+        Return up to limit of the newest observations, oldest first.
+
+        Args:
+            limit: Maximum number of observations
+            severities: Only include these severities; None includes all
+
+        Returns:
+            List of observations in arrival order
+        """
+        if limit <= 0:
+            return []
+        if severities is None:
+            start = max(self._next_seq - min(limit, len(self)), 0)
+            return [self._slots[seq % self.capacity] for seq in range(start, self._next_seq)]
+
+        # Merge the newest-first tails of each severity index
+        tails = [reversed(self._by_severity[s]) for s in set(severities) if s in self._by_severity]
+        if len(tails) == 1:
+            newest = list(islice(tails[0], limit))
+        else:
+            newest = list(islice(heapq.merge(*tails, reverse=True), limit))
+        return [self._slots[seq % self.capacity] for seq in reversed(newest)]
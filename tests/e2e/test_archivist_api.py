@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+E2E tests for the Archivist API
+Tests the archive endpoints via docker compose archivist-cell
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import pytest
+import time
+
+
+class TestArchivistAPI:
+    """E2E tests for the archive API via archivist-cell"""
+
+    BASE_URL = "http://localhost:8003"  # archivist-cell port from docker-compose
+
+    @classmethod
+    def setup_class(cls):
+        """Wait for services to be ready"""
+        max_retries = 30
+        retry_count = 0
+
+        while retry_count < max_retries:
+            try:
+                response = requests.get(f"{cls.BASE_URL}/health", timeout=5)
+                if response.status_code == 200:
+                    print(f"[Test] Archivist service is ready")
+                    break
+            except requests.exceptions.RequestException:
+                pass
+
+            retry_count += 1
+            time.sleep(2)
+
+        if retry_count >= max_retries:
+            pytest.fail("Archivist service did not become ready in time")
+
+    def test_archive_and_retrieve(self):
+        """Test archiving data and retrieving it by ID"""
+        entry = {
+            "id": "archive_test_001",
+            "content": {"summary": "Swarm cycle report", "cycle": 1},
+            "metadata": {"source": "e2e_test", "kind": "report"}
+        }
+
+        archive_response = requests.post(f"{self.BASE_URL}/archive", json=entry)
+        assert archive_response.status_code == 200
+        assert archive_response.json()["status"] == "archived"
+
+        retrieve_response = requests.get(f"{self.BASE_URL}/retrieve/{entry['id']}")
+        assert retrieve_response.status_code == 200
+        retrieved = retrieve_response.json()
+        assert retrieved["content"] == entry["content"]
+        assert retrieved["metadata"] == entry["metadata"]
+        assert retrieved["archived_at"] > 0
+
+    def test_archive_overwrite_keeps_item_count(self):
+        """Test that re-archiving an ID replaces it instead of adding an item"""
+        entry = {"id": "archive_overwrite_test", "content": {"version": 1}}
+        requests.post(f"{self.BASE_URL}/archive", json=entry)
+        before = requests.get(f"{self.BASE_URL}/status").json()["storage_stats"]
+
+        entry["content"] = {"version": 2}
+        requests.post(f"{self.BASE_URL}/archive", json=entry)
+        after = requests.get(f"{self.BASE_URL}/status").json()["storage_stats"]
+
+        assert after["total_items"] == before["total_items"]
+        retrieved = requests.get(f"{self.BASE_URL}/retrieve/{entry['id']}").json()
+        assert retrieved["content"] == {"version": 2}
+
+    def test_concurrent_archives_get_distinct_ids(self):
+        """Test that entries archived without an id concurrently never share one"""
+        def archive(n):
+            response = requests.post(f"{self.BASE_URL}/archive", json={"content": {"concurrent": n}})
+            assert response.status_code == 200
+            return response.json()["data_id"]
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            ids = list(pool.map(archive, range(40)))
+        assert len(set(ids)) == 40
+        for n, data_id in enumerate(ids):
+            assert requests.get(f"{self.BASE_URL}/retrieve/{data_id}").json()["content"] == {"concurrent": n}
+
+    def test_retrieve_not_found(self):
+        """Test retrieving a non-existent archive ID"""
+        response = requests.get(f"{self.BASE_URL}/retrieve/non_existent_archive_id")
+        assert response.status_code == 404
+
+    def test_search_terms_phrases_and_filters(self):
+        """Test ranked full-text search with phrases, prefixes and metadata filters"""
+        entries = [
+            {"id": "search_test_1", "content": {"text": "Swarm coordination protocol draft"},
+             "metadata": {"source": "planner"}},
+            {"id": "search_test_2", "content": {"text": "Coordination of curator filters"},
+             "metadata": {"source": "curator", "cell-role": "scorer", "ctx": {"w[0]": "x"}}},
+            {"id": "search_test_3", "content": {"text": "Unrelated maintenance note"},
+             "metadata": {"source": "planner"}}
+        ]
+        for entry in entries:
+            assert requests.post(f"{self.BASE_URL}/archive", json=entry).status_code == 200
+
+        def search_ids(**params):
+            response = requests.get(f"{self.BASE_URL}/search", params=params)
+            assert response.status_code == 200
+            return {r["id"] for r in response.json()["results"]}
+
+        assert {"search_test_1", "search_test_2"} <= search_ids(query="coordination")
+        assert "search_test_1" in search_ids(query='"swarm coordination"')
+        assert "search_test_2" not in search_ids(query='"swarm coordination"')
+        assert "search_test_1" in search_ids(query="coordinat*")
+
+        filtered = search_ids(query="coordination", filter="source:curator")
+        assert "search_test_2" in filtered
+        assert "search_test_1" not in filtered
+        assert "search_test_2" in search_ids(filter=["cell-role:scorer", "ctx.w[0]:x"])
+        for key in ['a"b', "a..b", "a."]:
+            response = requests.get(f"{self.BASE_URL}/search", params={"filter": f"{key}:x"})
+            assert response.status_code == 400
+
+        # Re-archiving replaces the indexed text
+        replaced = {**entries[2], "content": {"text": "Rewritten maintenance memo"}}
+        assert requests.post(f"{self.BASE_URL}/archive", json=replaced).status_code == 200
+        assert "search_test_3" in search_ids(query="memo")
+        assert "search_test_3" not in search_ids(query="note")
+
+    def test_search_pagination(self):
+        """Test limit/offset pagination of search results"""
+        for i in range(5):
+            requests.post(f"{self.BASE_URL}/archive", json={
+                "id": f"page_test_{i}",
+                "content": {"text": f"paginationmarker entry {i}"}
+            })
+
+        first = requests.get(f"{self.BASE_URL}/search",
+                             params={"query": "paginationmarker", "limit": 3}).json()
+        second = requests.get(f"{self.BASE_URL}/search",
+                              params={"query": "paginationmarker", "limit": 3, "offset": 3}).json()
+
+        assert first["has_more"] is True
+        first_ids = {r["id"] for r in first["results"]}
+        second_ids = {r["id"] for r in second["results"]}
+        assert not first_ids & second_ids
+        assert len(first_ids | second_ids) >= 5
+
+    def test_deduplicated_storage_and_checksums(self):
+        """Test that identical content is stored once with a stable checksum"""
+        content = {"report": "Identical payload " * 50, "cycle": 7}
+        run_id = time.time_ns()
+        before = requests.get(f"{self.BASE_URL}/status").json()["storage_stats"]
+
+        first = requests.post(f"{self.BASE_URL}/archive",
+                              json={"id": f"dedup_test_a_{run_id}", "content": content}).json()
+        second = requests.post(f"{self.BASE_URL}/archive",
+                               json={"id": f"dedup_test_b_{run_id}",
+                                     "content": dict(reversed(list(content.items())))}).json()
+
+        assert first["checksum"].startswith("sha256:")
+        assert first["checksum"] == second["checksum"]
+        assert second["deduplicated"] is True
+
+        after = requests.get(f"{self.BASE_URL}/status").json()["storage_stats"]
+        assert after["logical_size"] - before["logical_size"] == first["size"] + second["size"]
+        assert after["physical_size"] - before["physical_size"] < first["size"]
+        assert requests.get(f"{self.BASE_URL}/retrieve/dedup_test_b_{run_id}").json()["content"] == content
+
+    def test_bulk_archive_ndjson(self):
+        """Test streaming NDJSON bulk ingest with per-line rejects"""
+        run_id = time.time_ns()
+        lines = [json.dumps({"id": f"bulk_test_{run_id}_{i}", "speaker": "user",
+                             "text": f"bulk record {i}"}) for i in range(25)]
+        lines.insert(3, "{not json")
+        lines.insert(7, json.dumps({"speaker": "user"}))
+        lines.append(json.dumps({"id": f"bulk_test_{run_id}_wrapped",
+                                 "content": {"text": "wrapped"}, "metadata": {"kind": "note"}}))
+
+        def body():
+            for line in lines:
+                yield (line + "\n").encode("utf-8")
+
+        response = requests.post(f"{self.BASE_URL}/archive/bulk", data=body(),
+                                 params={"batch_size": 10, "source": "bulk_e2e"},
+                                 headers={"Content-Type": "application/x-ndjson"})
+        assert response.status_code == 200
+        result = response.json()
+        assert result["accepted"] == 26
+        assert result["rejected"] == 2
+        assert [r["line"] for r in result["rejected_records"]] == [4, 8]
+        assert result["batches"] == 3
+
+        raw = requests.get(f"{self.BASE_URL}/retrieve/bulk_test_{run_id}_0").json()
+        assert raw["content"]["text"] == "bulk record 0"
+        assert raw["metadata"] == {"source": "bulk_e2e"}
+        wrapped = requests.get(f"{self.BASE_URL}/retrieve/bulk_test_{run_id}_wrapped").json()
+        assert wrapped["content"] == {"text": "wrapped"}
+        assert wrapped["metadata"] == {"kind": "note", "source": "bulk_e2e"}
+
+    def test_export_ndjson_with_cursor_resume(self):
+        """Test streaming NDJSON export with time-range filters and cursor resume"""
+        start = time.time()
+        ids = [f"export_test_{time.time_ns()}_{i}" for i in range(5)]
+        for entry_id in ids:
+            requests.post(f"{self.BASE_URL}/archive", json={"id": entry_id, "content": {"n": entry_id}})
+        end = time.time() + 1
+
+        def export(**params):
+            response = requests.get(f"{self.BASE_URL}/export", params=params, stream=True)
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            return [json.loads(line) for line in response.iter_lines() if line]
+
+        everything = export(start=start, end=end)
+        assert [e["id"] for e in everything] == ids
+        assert everything[0]["content"] == {"n": ids[0]}
+
+        first_page = export(start=start, end=end, limit=2)
+        rest = export(start=start, end=end, cursor=first_page[-1]["cursor"])
+        assert [e["id"] for e in first_page + rest] == ids
+
+        assert export(start=end) == []
+        assert requests.get(f"{self.BASE_URL}/export", params={"cursor": "%%%"}).status_code == 400
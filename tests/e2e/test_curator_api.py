@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+E2E tests for the Curator API
+Tests the curation endpoints via docker compose curator-cell
+"""
+
+import requests
+import pytest
+import time
+import random
+import uuid
+
+
+class TestCuratorAPI:
+    """E2E tests for the curation API via curator-cell"""
+
+    BASE_URL = "http://localhost:8002"  # curator-cell port from docker-compose
+    # Keeps texts distinct between runs, since the curator rejects repeats
+    RUN_ID = uuid.uuid4().hex
+
+    @classmethod
+    def setup_class(cls):
+        """Wait for services to be ready"""
+        max_retries = 30
+        retry_count = 0
+
+        while retry_count < max_retries:
+            try:
+                response = requests.get(f"{cls.BASE_URL}/health", timeout=5)
+                if response.status_code == 200:
+                    print(f"[Test] Curator service is ready")
+                    break
+            except requests.exceptions.RequestException:
+                pass
+
+            retry_count += 1
+            time.sleep(2)
+
+        if retry_count >= max_retries:
+            pytest.fail("Curator service did not become ready in time")
+
+    def curate(self, items, **extra):
+        response = requests.post(f"{self.BASE_URL}/curate", json={"items": items, **extra})
+        assert response.status_code == 200
+        return response.json()
+
+    def test_curate_scores_and_filters_items(self):
+        """Test that substantive items pass while empty and unsafe ones are rejected"""
+        good = {"text": f"The planner published a detailed swarm coordination report for review {self.RUN_ID}"}
+        result = self.curate([
+            good,
+            "",
+            {"text": "config dump: password = hunter2 and api_key=abc123 for the swarm"}
+        ])
+
+        assert result["processed"] == 3
+        assert result["curated"] == 1
+        [curated] = result["results"]
+        assert curated["original"] == good
+        assert set(curated["scores"]) == {"quality", "safety"}
+        assert 30 < curated["score"] <= 100
+
+    def test_curate_is_deterministic(self):
+        """Test that the same item gets the same score on every call"""
+        item = {"id": "determinism", "text": f"Archive snapshot of curator decisions for cycle {self.RUN_ID}"}
+        first = self.curate([item])["results"][0]["score"]
+        # The repeat is rejected as a duplicate but still reports its score
+        duplicates = self.curate([{"other": "item"}, item])["duplicates"]
+        [duplicate] = [d for d in duplicates if d["index"] == 1]
+        assert duplicate["score"] == first
+
+    def test_curate_relevance_query(self):
+        """Test that a query adds relevance scoring and ranks matching items higher"""
+        result = self.curate([
+            f"Memory cache invalidation across planner replicas was verified {self.RUN_ID}",
+            f"Weekly maintenance window notes for the build registry host machine {self.RUN_ID}"
+        ], query="memory planner")
+
+        scores = [r["scores"]["relevance"] for r in result["results"]]
+        assert scores[0] == 100.0
+        assert scores[1] == 0.0
+
+    def test_update_filters_rejects_unknown_rules(self):
+        """Test that only known scorers can be configured as filter rules"""
+        response = requests.put(f"{self.BASE_URL}/filters", json=["quality", "sparkle"])
+        assert response.status_code == 400
+
+        response = requests.put(f"{self.BASE_URL}/filters", json=["quality", "relevance", "safety"])
+        assert response.status_code == 200
+
+    def test_near_duplicates_rejected_or_clustered(self):
+        """Test that near-duplicates of curated items are rejected, or clustered when configured"""
+        text = (f"Run {self.RUN_ID}: the synthesizer merged archivist snapshots from every "
+                "planner cycle and published a consolidated swarm health digest for operators")
+        result = self.curate([text, text.replace("operators", "operators.")])
+        assert result["curated"] == 1
+        [original] = result["results"]
+        [duplicate] = result["duplicates"]
+        assert duplicate["index"] == 1
+        assert duplicate["duplicate_of"] == original["id"]
+        assert duplicate["similarity"] >= 0.8
+
+        # Later batches are matched against the index
+        result = self.curate([text.upper().lower() + " again"])
+        assert result["curated"] == 0
+        assert result["duplicates"][0]["duplicate_of"] == original["id"]
+
+        response = requests.put(f"{self.BASE_URL}/dedup", json={"mode": "cluster"})
+        assert response.status_code == 200
+        try:
+            [clustered] = self.curate([text])["results"]
+            assert "near_duplicate" in clustered["tags"]
+            assert clustered["cluster_id"] == original["id"]
+        finally:
+            requests.put(f"{self.BASE_URL}/dedup", json={"mode": "reject"})
+
+        assert requests.put(f"{self.BASE_URL}/dedup", json={"threshold": 1.5}).status_code == 400
+        assert requests.put(f"{self.BASE_URL}/dedup", json={"mode": "merge"}).status_code == 400
+        status = requests.get(f"{self.BASE_URL}/status").json()
+        assert status["dedup"] == {"mode": "reject", "threshold": 0.8}
+        assert status["dedup_index"]["entries"] >= 1
+
+    def test_curation_runs_in_executor(self):
+        """Test that scoring goes through the worker pool and is reported in status"""
+        before = requests.get(f"{self.BASE_URL}/status").json()["executor"]
+        self.curate([f"Executor bookkeeping check for run {self.RUN_ID}"])
+        after = requests.get(f"{self.BASE_URL}/status").json()["executor"]
+        assert after["completed"] == before["completed"] + 1
+        assert after["in_flight"] == 0
+
+    def test_curated_listing_pages_through_retention(self):
+        """Test cursor paging of curated items across the in-memory and overflow tiers"""
+        rng = random.Random(self.RUN_ID)
+        vocabulary = [f"{word}{n}" for word in ("signal", "plan", "cache", "quorum", "digest") for n in range(40)]
+        texts = [f"Run {self.RUN_ID} entry {i}: " + " ".join(rng.choice(vocabulary) for _ in range(25))
+                 for i in range(1200)]
+        result = self.curate(texts)
+        assert result["curated"] == 1200
+        ids = [r["id"] for r in result["results"]]
+        status = requests.get(f"{self.BASE_URL}/status").json()["curated_store"]
+        assert status["in_memory"] <= status["capacity"]
+
+        listed = {}
+        cursor = None
+        while True:
+            params = {"limit": 500, "include_original": "false"}
+            if cursor:
+                params["cursor"] = cursor
+            response = requests.get(f"{self.BASE_URL}/curated", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            for item in page["items"]:
+                assert "original" not in item
+                listed[item["id"]] = item
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        # The oldest of this batch were spilled to Memory but are still listed, in order
+        assert [id for id in listed if id in set(ids)] == ids
+
+        instance, _, first_seq = ids[0].rpartition("_")
+        before_first = f"{instance}_{int(first_seq) - 1}"
+        page = requests.get(f"{self.BASE_URL}/curated", params={
+            "cursor": before_first, "limit": 5, "min_score": 101
+        }).json()
+        assert page["items"] == []
+        page = requests.get(f"{self.BASE_URL}/curated", params={
+            "cursor": before_first, "limit": 5, "tag": "approved"
+        }).json()
+        assert [item["id"] for item in page["items"]] == ids[:5]
+        assert page["items"][0]["original"] == texts[0]
+
+        assert requests.get(f"{self.BASE_URL}/curated", params={"cursor": "bogus"}).status_code == 400
+        assert requests.get(f"{self.BASE_URL}/curated", params={"cursor": "cur_xyz_1"}).status_code == 400
+        # Cursors of other curator instances (earlier runs, replicas) are ordered with this one's
+        earlier = requests.get(f"{self.BASE_URL}/curated", params={"cursor": "cur_0000_1", "limit": 1})
+        assert earlier.status_code == 200
+        assert earlier.json()["next_cursor"] is not None
+        later = requests.get(f"{self.BASE_URL}/curated", params={"cursor": "cur_ffffffffffffffff_1"})
+        assert later.status_code == 200
+        assert later.json() == {"items": [], "next_cursor": None, "total_count": later.json()["total_count"]}
@@ -112,18 +112,50 @@ class TestMemoryAPI:
             response = requests.post(f"{self.BASE_URL}/memory", json=entry)
             assert response.status_code == 200
         
-        # List all IDs
-        list_response = requests.get(f"{self.BASE_URL}/memory")
-        assert list_response.status_code == 200
-        
-        result = list_response.json()
-        assert "ids" in result
+        # List all IDs, following the cursor across pages
+        stored_ids = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            list_response = requests.get(f"{self.BASE_URL}/memory", params=params)
+            assert list_response.status_code == 200
+            
+            result = list_response.json()
+            assert "ids" in result
+            stored_ids.extend(result["ids"])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
         
         # Check that our test IDs are in the list
-        stored_ids = result["ids"]
         for entry in test_entries:
             assert entry["id"] in stored_ids
     
+    def test_memory_list_ids_by_prefix(self):
+        """Test paginated listing of IDs under a namespace prefix"""
+        entries = {f"prefix_test:{i:03d}": {"value": i} for i in range(25)}
+        response = requests.post(
+            f"{self.BASE_URL}/memory/batch",
+            json={"items": [{"id": id, "data": data} for id, data in entries.items()]}
+        )
+        assert response.status_code == 200
+        
+        listed = []
+        cursor = None
+        while True:
+            params = {"prefix": "prefix_test:", "limit": 10}
+            if cursor:
+                params["cursor"] = cursor
+            result = requests.get(f"{self.BASE_URL}/memory", params=params).json()
+            listed.extend(result["ids"])
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+        
+        assert sorted(set(listed)) == sorted(entries)
+    
     def test_memory_not_found(self):
         """Test retrieving non-existent memory ID"""
         non_existent_id = "non_existent_id_12345"
@@ -203,4 +235,37 @@ class TestMemoryAPI:
             assert response.status_code == 200
             data = response.json()["data"]
             assert data == initial_data
-            time.sleep(0.1)  # Small delay between requests
\ No newline at end of file
+            time.sleep(0.1)  # Small delay between requests
+    
+    def test_memory_batch_store_and_get(self):
+        """Test storing and retrieving many entries in single requests"""
+        batch_items = [
+            {"id": f"batch_test_{i}", "data": {"index": i, "content": f"message {i}"}}
+            for i in range(50)
+        ]
+        
+        store_response = requests.post(
+            f"{self.BASE_URL}/memory/batch",
+            json={"items": batch_items}
+        )
+        assert store_response.status_code == 200
+        store_result = store_response.json()
+        assert store_result["status"] == "batch_stored"
+        assert store_result["stored"] == len(batch_items)
+        assert all(r["status"] == "stored" for r in store_result["results"])
+        
+        requested_ids = [item["id"] for item in batch_items] + ["batch_test_missing"]
+        get_response = requests.post(
+            f"{self.BASE_URL}/memory/batch-get",
+            json={"ids": requested_ids}
+        )
+        assert get_response.status_code == 200
+        get_result = get_response.json()
+        assert get_result["found"] == len(batch_items)
+        assert get_result["missing"] == 1
+        
+        results_by_id = {r["id"]: r for r in get_result["results"]}
+        for item in batch_items:
+            assert results_by_id[item["id"]]["status"] == "found"
+            assert results_by_id[item["id"]]["data"] == item["data"]
+        assert results_by_id["batch_test_missing"]["status"] == "not_found"
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+E2E tests for the Planner API
+Tests plan scheduling via docker compose planner-cell
+"""
+
+import requests
+import pytest
+import time
+
+
+class TestPlannerAPI:
+    """E2E tests for plan scheduling via planner-cell"""
+
+    BASE_URL = "http://localhost:8001"  # planner-cell port from docker-compose
+
+    @classmethod
+    def setup_class(cls):
+        """Wait for services to be ready"""
+        max_retries = 30
+        retry_count = 0
+
+        while retry_count < max_retries:
+            try:
+                response = requests.get(f"{cls.BASE_URL}/health", timeout=5)
+                if response.status_code == 200:
+                    print(f"[Test] Planner service is ready")
+                    break
+            except requests.exceptions.RequestException:
+                pass
+
+            retry_count += 1
+            time.sleep(2)
+
+        if retry_count >= max_retries:
+            pytest.fail("Planner service did not become ready in time")
+
+    def require_shared_queues(self):
+        status = requests.get(f"{self.BASE_URL}/status").json()
+        if status["completions"]["backend"] != "redis":
+            pytest.skip("cross-cell dispatch needs the Redis work queue backend")
+
+    def wait_for_plan(self, plan_id, timeout=30):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            current = requests.get(f"{self.BASE_URL}/current-plan").json()
+            assert current["plan_id"] == plan_id
+            if current["progress"]["status"] != "running":
+                return current
+            time.sleep(0.5)
+        pytest.fail(f"Plan {plan_id} did not finish in time")
+
+    def test_plan_dependencies_run_in_order(self):
+        """Test that dependent tasks start after their dependencies and independent ones in parallel"""
+        self.require_shared_queues()
+        run_id = time.time_ns()
+        synthesize = {"cell": "synthesizer", "action": "synthesize",
+                      "payload": {"inputs": [{"source": "plan", "data": {"run": run_id}}]}}
+        tasks = [
+            {"id": "curate", "cell": "curator", "action": "curate",
+             "payload": {"items": [{"content": f"scheduled content {run_id}", "source": "plan"}]},
+             "resources": {"duration": 2}},
+            {"id": "archive", "cell": "archivist", "action": "archive", "depends_on": ["curate"],
+             "payload": {"id": f"scheduled_{run_id}", "content": {"run": run_id}}},
+            {**synthesize, "id": "synthesize", "depends_on": ["curate"]},
+            {**synthesize, "id": "report", "depends_on": ["archive", "synthesize"]},
+            {"id": "note", "depends_on": ["report"]}
+        ]
+        response = requests.post(f"{self.BASE_URL}/plan", json={"tasks": tasks, "priority": "high"})
+        assert response.status_code == 200
+        plan = response.json()["plan"]
+        assert plan["progress"]["critical_path"]["estimated"] == ["curate", "archive", "report", "note"]
+        assert plan["progress"]["critical_path"]["estimated_time"] == 4
+
+        current = self.wait_for_plan(plan["plan_id"])
+        assert current["progress"]["status"] == "completed"
+        dispatch = {id.split(":", 1)[1]: task for id, task in current["dispatch"].items()}
+        assert [dispatch[id]["status"] for id in ("curate", "archive", "synthesize", "report")] == ["completed"] * 4
+        assert dispatch["note"]["status"] == "recorded"
+        for id in ("archive", "synthesize"):
+            assert dispatch[id]["dispatched_at"] >= dispatch["curate"]["completed_at"]
+        assert dispatch["report"]["dispatched_at"] >= max(dispatch["archive"]["completed_at"],
+                                                          dispatch["synthesize"]["completed_at"])
+        observed = current["progress"]["critical_path"]["observed"]
+        assert observed[0] == "curate" and observed[-2:] == ["report", "note"]
+
+    def test_failed_task_skips_dependents(self):
+        """Test that tasks depending on a failed task are skipped"""
+        self.require_shared_queues()
+        tasks = [
+            {"id": "bad", "cell": "curator", "action": "no_such_action"},
+            {"id": "after", "cell": "archivist", "action": "archive", "depends_on": ["bad"]}
+        ]
+        response = requests.post(f"{self.BASE_URL}/plan", json={"tasks": tasks})
+        assert response.status_code == 200
+        plan_id = response.json()["plan"]["plan_id"]
+
+        current = self.wait_for_plan(plan_id)
+        assert current["progress"]["status"] == "failed"
+        assert current["dispatch"][f"{plan_id}:bad"]["status"] == "failed"
+        assert current["dispatch"][f"{plan_id}:after"]["status"] == "skipped"
+
+    def test_invalid_plan_graphs_rejected(self):
+        """Test that cycles and unknown dependencies are rejected"""
+        cycle = [
+            {"id": "a", "cell": "curator", "action": "curate", "depends_on": ["b"]},
+            {"id": "b", "cell": "curator", "action": "curate", "depends_on": ["a"]}
+        ]
+        response = requests.post(f"{self.BASE_URL}/plan", json={"tasks": cycle})
+        assert response.status_code == 400
+        assert "cycle" in response.json()["detail"]
+
+        unknown = [{"id": "a", "cell": "curator", "action": "curate", "depends_on": ["missing"]}]
+        response = requests.post(f"{self.BASE_URL}/plan", json={"tasks": unknown})
+        assert response.status_code == 400
+
+        response = requests.post(f"{self.BASE_URL}/plan", json={"tasks": [], "priority": "urgent"})
+        assert response.status_code == 400
+
+        for resources in ([1], "fast", {"slots": 0}):
+            task = {"id": "a", "cell": "curator", "action": "curate", "resources": resources}
+            response = requests.post(f"{self.BASE_URL}/plan", json={"tasks": [task]})
+            assert response.status_code == 400
+
+    def test_status_reports_cell_concurrency(self):
+        """Test that the scheduler's per-cell limits are reported"""
+        response = requests.get(f"{self.BASE_URL}/status")
+        assert response.status_code == 200
+        scheduler = response.json()["scheduler"]
+        assert set(scheduler["limits"]) == {"curator", "archivist", "synthesizer"}
+        assert all(limit >= 1 for limit in scheduler["limits"].values())
+
+    def test_plan_history_versions_and_diffs(self):
+        """Test that earlier plans stay retrievable, listable and diffable"""
+        run_id = time.time_ns()
+        tasks = [f"history_task_{run_id}_{i}" for i in range(20)]
+        created = []
+        for change in range(3):
+            tasks = tasks[:-1] + [f"history_task_{run_id}_changed_{change}"]
+            response = requests.post(f"{self.BASE_URL}/plan", json={"tasks": tasks})
+            assert response.status_code == 200
+            result = response.json()
+            assert isinstance(result["version"], int)
+            created.append((result["version"], result["plan"]["plan_id"], list(tasks)))
+
+        for version, plan_id, plan_tasks in created:
+            response = requests.get(f"{self.BASE_URL}/plans/{plan_id}")
+            assert response.status_code == 200
+            assert response.json()["version"] == version
+            assert response.json()["plan"]["tasks"] == plan_tasks
+
+        # Only the changed task (and the plan's id and timestamp) differ
+        response = requests.get(f"{self.BASE_URL}/plans/{created[2][1]}/diff")
+        assert response.status_code == 200
+        result = response.json()
+        assert result["from"] == {"version": created[1][0], "plan_id": created[1][1]}
+        changed = [op for op in result["ops"] if op[1][0] == "tasks"]
+        assert changed == [["set", ["tasks", 19], f"history_task_{run_id}_changed_2"]]
+
+        response = requests.get(f"{self.BASE_URL}/plans/{created[2][1]}/diff",
+                                params={"against": created[0][1]})
+        assert response.status_code == 200
+        assert response.json()["from"]["version"] == created[0][0]
+
+        listed = []
+        start = created[0][0]
+        while start is not None:
+            response = requests.get(f"{self.BASE_URL}/plans",
+                                    params={"start": start, "end": created[2][0], "limit": 2})
+            assert response.status_code == 200
+            result = response.json()
+            listed.extend(result["plans"])
+            start = result["next_start"]
+        assert [(p["version"], p["plan_id"]) for p in listed] == [(v, p) for v, p, _ in created]
+        assert all(p["task_count"] == 20 for p in listed)
+
+        response = requests.get(f"{self.BASE_URL}/plans/no_such_plan_{run_id}")
+        assert response.status_code == 404
+
+        # History records are internal: hidden from /memory and not writable there
+        listed_ids = requests.get(f"{self.BASE_URL}/memory", params={"limit": 10000}).json()["ids"]
+        assert not any("plan_history" in id for id in listed_ids)
+        response = requests.post(f"{self.BASE_URL}/memory",
+                                 json={"id": "__plan_history:head", "data": {"latest": 0}})
+        assert response.status_code == 400
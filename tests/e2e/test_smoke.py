@@ -145,6 +145,52 @@ def test_cell_status_endpoints():
         assert "status" in data
         print(f"[{cell_name}] Status: {data}")
 
+
+def test_plan_tasks_dispatched_to_cells():
+    """Test that plan tasks for worker cells run through their work queues"""
+    status = requests.get(f"{CELL_ENDPOINTS['planner']}/status", timeout=5).json()
+    if status["completions"]["backend"] != "redis":
+        pytest.skip("cross-cell dispatch needs the Redis work queue backend")
+    archive_id = f"dispatched_{time.time_ns()}"
+    plan_response = requests.post(
+        f"{CELL_ENDPOINTS['planner']}/plan",
+        json={
+            "tasks": [
+                {"cell": "curator", "action": "curate",
+                 "payload": {"items": [{"content": f"dispatched content {archive_id}", "source": "plan"}]}},
+                {"cell": "archivist", "action": "archive",
+                 "payload": {"id": archive_id, "content": {"test": "data"}}},
+                {"cell": "synthesizer", "action": "synthesize",
+                 "payload": {"inputs": [{"source": "plan", "data": {"key": "value"}}]}},
+                "not_dispatched"
+            ]
+        },
+        timeout=5
+    )
+    assert plan_response.status_code == 200
+    plan = plan_response.json()["plan"]
+    assert set(plan["dispatch"]) == {f"{plan['plan_id']}:{index}" for index in range(4)}
+    assert plan["dispatch"][f"{plan['plan_id']}:3"]["status"] == "recorded"
+    
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        current = requests.get(f"{CELL_ENDPOINTS['planner']}/current-plan", timeout=5).json()
+        assert current["plan_id"] == plan["plan_id"]
+        if current["progress"]["status"] != "running":
+            break
+        time.sleep(0.5)
+    
+    dispatch = current["dispatch"]
+    assert current["progress"]["status"] == "completed"
+    assert [dispatch[f"{plan['plan_id']}:{index}"]["status"] for index in range(3)] == ["completed"] * 3
+    assert dispatch[f"{plan['plan_id']}:0"]["result"]["processed"] == 1
+    assert dispatch[f"{plan['plan_id']}:1"]["result"]["data_id"] == archive_id
+    assert dispatch[f"{plan['plan_id']}:2"]["result"]["synthesis_id"].startswith("synthesis_")
+    
+    retrieved = requests.get(f"{CELL_ENDPOINTS['archivist']}/retrieve/{archive_id}", timeout=5)
+    assert retrieved.status_code == 200
+
+
 if __name__ == "__main__":
     # Run basic smoke test
     print("Running Hyper-Swarm Phase-0 Smoke Test...")
@@ -176,4 +222,4 @@ if __name__ == "__main__":
         
     except Exception as e:
         print(f"\n❌ Smoke test failed: {e}")
-        exit(1)
\ No newline at end of file
+        exit(1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+E2E tests for the Synthesizer API
+Tests the synthesis endpoints via docker compose synthesizer-cell
+"""
+
+import requests
+import pytest
+import time
+
+
+class TestSynthesizerAPI:
+    """E2E tests for the synthesis API via synthesizer-cell"""
+
+    BASE_URL = "http://localhost:8005"  # synthesizer-cell port from docker-compose
+
+    @classmethod
+    def setup_class(cls):
+        """Wait for services to be ready"""
+        max_retries = 30
+        retry_count = 0
+
+        while retry_count < max_retries:
+            try:
+                response = requests.get(f"{cls.BASE_URL}/health", timeout=5)
+                if response.status_code == 200:
+                    print(f"[Test] Synthesizer service is ready")
+                    break
+            except requests.exceptions.RequestException:
+                pass
+
+            retry_count += 1
+            time.sleep(2)
+
+        if retry_count >= max_retries:
+            pytest.fail("Synthesizer service did not become ready in time")
+
+    def synthesize(self, inputs):
+        response = requests.post(f"{self.BASE_URL}/synthesize", json={"inputs": inputs})
+        assert response.status_code == 200
+        return response.json()["synthesis_id"]
+
+    def test_result_lookup_after_eviction(self):
+        """Test that results evicted from memory are still served by ID"""
+        first = self.synthesize([{"source": "planner", "data": "first"}])
+        response = requests.get(f"{self.BASE_URL}/result/{first}", params={"expand_inputs": "true"})
+        assert response.status_code == 200
+        assert response.json()["inputs"] == [{"source": "planner", "data": "first"}]
+
+        # Push the first result past the default count retention
+        ids = [self.synthesize([{"source": "curator", "data": i}]) for i in range(110)]
+        assert len(set(ids)) == 110
+        recent = requests.get(f"{self.BASE_URL}/results", params={"limit": 5}).json()
+        assert [r["id"] for r in recent["results"]] == ids[-5:]
+        assert first not in [r["id"] for r in requests.get(
+            f"{self.BASE_URL}/results", params={"limit": 1000}).json()["results"]]
+
+        before = requests.get(f"{self.BASE_URL}/status").json()["result_store"]
+        response = requests.get(f"{self.BASE_URL}/result/{first}")
+        assert response.status_code == 200
+        assert response.json()["id"] == first
+        after = requests.get(f"{self.BASE_URL}/status").json()["result_store"]
+        assert after["memory_hits"] == before["memory_hits"] + 1
+        assert after["in_memory"] <= 100
+
+    def test_unknown_result_is_404(self):
+        """Test that IDs never issued return 404"""
+        response = requests.get(f"{self.BASE_URL}/result/synthesis_unknown_0")
+        assert response.status_code == 404
+
+    def test_aggregate_pulls_from_sibling_cells(self):
+        """Test pull-mode aggregation from every input source, then from the snapshot cache"""
+        sources = requests.get(f"{self.BASE_URL}/status").json()["input_sources"]
+        response = requests.post(f"{self.BASE_URL}/aggregate", json={"deadline": 3.0, "max_age": 0})
+        assert response.status_code == 200
+        result = response.json()
+        assert set(result["sources"]) == set(sources)
+        assert all(s["status"] == "ok" for s in result["sources"].values())
+        assert result["partial"] is False
+        assert result["collection_time"] < 3.0
+
+        cached = requests.post(f"{self.BASE_URL}/aggregate", json={"max_age": 60}).json()
+        assert all(s["status"] == "cached" for s in cached["sources"].values())
+
+        subset = requests.post(f"{self.BASE_URL}/aggregate", json={"sources": ["planner"]}).json()
+        assert set(subset["sources"]) == {"planner"}
+
+        # Only input_sources are pulled; other names never become URLs
+        for source in ["no-such-cell", "169.254.169.254", "evil.example/x?"]:
+            response = requests.post(f"{self.BASE_URL}/aggregate", json={
+                "sources": ["planner", source], "deadline": 1.0
+            })
+            assert response.status_code == 400
+
+    def test_incremental_session_matches_one_shot(self):
+        """Test that a session fed in chunks ends with the same output as /synthesize"""
+        inputs = [{"source": source, "data": i} for i, source in
+                  enumerate(["planner", "curator", "planner", "watcher", "archivist"])]
+        response = requests.post(f"{self.BASE_URL}/synthesize", json={"inputs": inputs})
+        one_shot = response.json()
+
+        session_id = requests.post(f"{self.BASE_URL}/sessions", json={}).json()["session_id"]
+        first = requests.post(f"{self.BASE_URL}/sessions/{session_id}/inputs", json={"inputs": inputs[:2]})
+        assert first.status_code == 200
+        assert first.json()["input_count"] == 2
+        assert first.json()["metadata"]["source_diversity"] == 2
+        requests.post(f"{self.BASE_URL}/sessions/{session_id}/inputs", json={"inputs": inputs[2:]})
+
+        current = requests.get(f"{self.BASE_URL}/sessions/{session_id}").json()
+        assert current["output"] == one_shot["output"]
+        assert current["metadata"] == one_shot["metadata"]
+
+        closed = requests.post(f"{self.BASE_URL}/sessions/{session_id}/close").json()
+        assert closed["output"] == one_shot["output"]
+        result = requests.get(f"{self.BASE_URL}/result/{closed['synthesis_id']}").json()
+        assert "inputs" not in result
+        # Both results refer to the same stored inputs
+        one_shot_result = requests.get(f"{self.BASE_URL}/result/{one_shot['synthesis_id']}").json()
+        assert result["input_refs"] == one_shot_result["input_refs"]
+
+        assert requests.get(f"{self.BASE_URL}/sessions/{session_id}").status_code == 404
+        bad = requests.post(f"{self.BASE_URL}/sessions", json={}).json()["session_id"]
+        response = requests.post(f"{self.BASE_URL}/sessions/{bad}/inputs", json={"inputs": ["text"]})
+        assert response.status_code == 400
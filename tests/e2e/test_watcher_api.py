@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+E2E tests for the Watcher API
+Tests the observation endpoints via docker compose watcher-cell
+"""
+
+import json
+import threading
+import requests
+import pytest
+import time
+
+
+class TestWatcherAPI:
+    """E2E tests for the observation API via watcher-cell"""
+
+    BASE_URL = "http://localhost:8004"  # watcher-cell port from docker-compose
+
+    @classmethod
+    def setup_class(cls):
+        """Wait for services to be ready"""
+        max_retries = 30
+        retry_count = 0
+
+        while retry_count < max_retries:
+            try:
+                response = requests.get(f"{cls.BASE_URL}/health", timeout=5)
+                if response.status_code == 200:
+                    print(f"[Test] Watcher service is ready")
+                    break
+            except requests.exceptions.RequestException:
+                pass
+
+            retry_count += 1
+            time.sleep(2)
+
+        if retry_count >= max_retries:
+            pytest.fail("Watcher service did not become ready in time")
+
+    def observe(self, **observation):
+        response = requests.post(f"{self.BASE_URL}/observe", json=observation)
+        assert response.status_code == 200
+        return response.json()
+
+    def test_observations_filtered_by_severity(self):
+        """Test that severity filters return the newest matching observations in order"""
+        marker = f"severity_test_{time.time_ns()}"
+        for i in range(6):
+            self.observe(source=marker, severity="medium" if i % 2 else "low", data={"i": i})
+
+        response = requests.get(f"{self.BASE_URL}/observations",
+                                params={"severity": "medium", "limit": 2})
+        assert response.status_code == 200
+        result = response.json()
+        assert [obs["data"]["i"] for obs in result["observations"]] == [3, 5]
+        assert all(obs["severity"] == "medium" for obs in result["observations"])
+        assert result["filtered_count"] >= 3
+
+    def test_alerts_summary(self):
+        """Test that high and critical observations are counted and listed as alerts"""
+        before = requests.get(f"{self.BASE_URL}/alerts").json()
+
+        self.observe(source="alert_test", severity="high")
+        critical = self.observe(source="alert_test", severity="critical")
+        self.observe(source="alert_test", severity="low")
+
+        after = requests.get(f"{self.BASE_URL}/alerts").json()
+        assert after["alert_count"] == before["alert_count"] + 2
+        assert after["recent_alerts"][-1]["id"] == critical["observation_id"]
+        assert [a["severity"] for a in after["recent_alerts"][-2:]] == ["high", "critical"]
+        assert after["alert_summary"]["critical"] >= 1
+        assert after["alert_summary"]["high"] >= 1
+
+    def test_observation_buffer_is_bounded(self):
+        """Test that bursty traffic never grows the buffer past its capacity"""
+        capacity = requests.get(f"{self.BASE_URL}/status").json()["observations_capacity"]
+        with requests.Session() as session:
+            for i in range(capacity + 25):
+                session.post(f"{self.BASE_URL}/observe", json={"source": "burst_test", "data": {"i": i}})
+
+        status = requests.get(f"{self.BASE_URL}/status").json()
+        assert status["observations_count"] == capacity
+
+        newest = requests.get(f"{self.BASE_URL}/observations", params={"limit": 1}).json()
+        assert newest["observations"][0]["data"] == {"i": capacity + 24}
+        assert newest["total_count"] == capacity
+
+    def test_targets_are_probed(self):
+        """Test that every monitored cell is probed and its outcome recorded"""
+        deadline = time.time() + 15
+        while True:
+            targets = requests.get(f"{self.BASE_URL}/targets").json()["targets"]
+            if all(t["last_checked"] for t in targets.values()) or time.time() > deadline:
+                break
+            time.sleep(0.5)
+
+        assert set(targets) == {"planner", "curator", "archivist", "synthesizer"}
+        for health in targets.values():
+            assert health["last_checked"] is not None
+            assert health["status"] in ("healthy", "unhealthy")
+            if health["status"] == "healthy":
+                assert health["last_response_time"] > 0
+            else:
+                assert health["last_error"]
+
+    def test_metrics_query_rates_and_percentiles(self):
+        """Test that observed latencies are aggregated into rates and percentiles"""
+        source = f"metrics_test_{time.time_ns()}"
+        with requests.Session() as session:
+            for i in range(100):
+                session.post(f"{self.BASE_URL}/observe", json={
+                    "source": source, "event_type": "request",
+                    "data": {"response_time": (i + 1) / 1000}
+                })
+
+        response = requests.get(f"{self.BASE_URL}/metrics/query", params={
+            "source": source, "resolution": "1m", "percentiles": "50,99"
+        })
+        assert response.status_code == 200
+        result = response.json()
+        assert result["resolution"] == "1m"
+        [series] = result["series"]
+        assert series["event_type"] == "request"
+
+        summary = series["summary"]
+        assert summary["events"] == 100
+        assert summary["latency_samples"] == 100
+        assert summary["latency_p50"] == pytest.approx(0.050, rel=0.03)
+        assert summary["latency_p99"] == pytest.approx(0.099, rel=0.03)
+        assert summary["latency_max"] == pytest.approx(0.100)
+        assert sum(point["events"] for point in series["points"]) == 100
+
+        assert requests.get(f"{self.BASE_URL}/metrics/query",
+                            params={"resolution": "5m"}).status_code == 400
+        assert requests.get(f"{self.BASE_URL}/metrics/query",
+                            params={"percentiles": "150"}).status_code == 400
+
+    def test_observe_rejects_non_string_fields(self):
+        """Test that source, event_type and severity must be strings"""
+        for field, value in [("severity", ["high"]), ("source", {"a": 1}), ("event_type", 3)]:
+            response = requests.post(f"{self.BASE_URL}/observe", json={field: value})
+            assert response.status_code == 400
+            assert field in response.json()["detail"]
+
+    def test_non_finite_latency_is_not_sampled(self):
+        """Test that inf and nan latencies are recorded as events without samples"""
+        source = f"non_finite_test_{time.time_ns()}"
+        single = requests.post(
+            f"{self.BASE_URL}/observe",
+            data=f'{{"source": "{source}", "data": {{"response_time": Infinity}}}}',
+            headers={"Content-Type": "application/json"}
+        )
+        assert single.status_code == 200
+
+        batch = requests.post(
+            f"{self.BASE_URL}/observe/batch",
+            data="\n".join(f'{{"source": "{source}", "data": {{"latency": {value}}}}}'
+                           for value in ("NaN", "-Infinity", "0.01")),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        assert batch.status_code == 200
+        assert batch.json()["recorded"] == 3
+
+        [series] = requests.get(f"{self.BASE_URL}/metrics/query",
+                                params={"source": source}).json()["series"]
+        assert series["summary"]["events"] == 4
+        assert series["summary"]["latency_samples"] == 1
+
+    def test_observe_batch_array_and_ndjson(self):
+        """Test batch ingestion of JSON arrays and NDJSON with per-item rejects"""
+        source = f"batch_test_{time.time_ns()}"
+        array = requests.post(f"{self.BASE_URL}/observe/batch", json=[
+            {"source": source, "severity": "low"},
+            "not an observation",
+            {"source": source, "severity": "medium"}
+        ]).json()
+        assert array["recorded"] == 2
+        assert array["rejected"] == [{"index": 1, "error": "observation is not a JSON object"}]
+
+        typed = requests.post(f"{self.BASE_URL}/observe/batch", json=[
+            {"source": source, "severity": "low"},
+            {"source": source, "severity": ["high"]},
+            {"source": source, "severity": "low"}
+        ])
+        assert typed.status_code == 200
+        assert typed.json()["recorded"] == 2
+        assert typed.json()["rejected"] == [{"index": 1, "error": "severity must be a string"}]
+
+        # Oversized bodies are refused, with or without a Content-Length
+        oversized = b"\n" * (9 * 1024 * 1024)
+        assert requests.post(f"{self.BASE_URL}/observe/batch", data=oversized).status_code == 413
+        chunks = (oversized[i:i + 65536] for i in range(0, len(oversized), 65536))
+        assert requests.post(f"{self.BASE_URL}/observe/batch", data=chunks).status_code == 413
+
+        ndjson = "\n".join([
+            json.dumps({"source": source, "severity": "medium"}),
+            "{broken",
+            json.dumps({"source": source, "severity": "medium"})
+        ])
+        result = requests.post(f"{self.BASE_URL}/observe/batch", data=ndjson,
+                               headers={"Content-Type": "application/x-ndjson"}).json()
+        assert result["recorded"] == 2
+        assert [r["index"] for r in result["rejected"]] == [1]
+
+        recent = requests.get(f"{self.BASE_URL}/observations",
+                              params={"severity": "medium", "limit": 3}).json()["observations"]
+        assert [obs["source"] for obs in recent] == [source] * 3
+        assert recent[-1]["id"] == result["last_observation_id"]
+
+    def test_alert_stream_pushes_filtered_alerts(self):
+        """Test that the SSE stream pushes only matching high/critical observations"""
+        source = f"stream_test_{time.time_ns()}"
+        received = []
+        connected = threading.Event()
+
+        def consume():
+            with requests.get(f"{self.BASE_URL}/alerts/stream", params={"source": source},
+                              stream=True, timeout=10) as response:
+                assert response.headers["content-type"].startswith("text/event-stream")
+                for line in response.iter_lines(decode_unicode=True):
+                    if line == ": connected":
+                        connected.set()
+                    elif line.startswith("data: "):
+                        received.append(json.loads(line[len("data: "):]))
+                        if len(received) == 2:
+                            return
+
+        consumer = threading.Thread(target=consume, daemon=True)
+        consumer.start()
+        assert connected.wait(5)
+
+        requests.post(f"{self.BASE_URL}/observe/batch", json=[
+            {"source": source, "severity": "low"},
+            {"source": "other_source", "severity": "critical"},
+            {"source": source, "severity": "high", "data": {"n": 1}},
+            {"source": source, "severity": "critical", "data": {"n": 2}}
+        ])
+        consumer.join(5)
+
+        assert [(a["severity"], a["data"]) for a in received] == [("high", {"n": 1}), ("critical", {"n": 2})]